@@ -0,0 +1,101 @@
+"""Compare parsing whole pages with parsing only the part each scraper reads.
+
+Run from the backend directory:
+
+    uv run python benchmarks/bench_scoped_parsing.py
+"""
+
+import argparse
+import importlib.util
+import time
+import tracemalloc
+
+from synthetic import review_grades_page, roster_page
+
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    SUBMISSION_LINKS_STRAINER,
+    SUBMISSIONS_TABLE_STRAINER,
+    get_submission_id_for_email,
+    get_submission_ids,
+)
+from gradescopeapi.classes._helpers._course_helpers import (
+    COURSE_MEMBERS_STRAINER,
+    get_course_members,
+)
+from gradescopeapi.classes._helpers._parser_helpers import PARSER_BACKENDS, make_soup
+
+SCRAPERS = {
+    "get_course_members": (
+        roster_page,
+        COURSE_MEMBERS_STRAINER,
+        lambda soup, n: get_course_members(soup, "753413"),
+    ),
+    "get_submission_ids": (
+        review_grades_page,
+        SUBMISSION_LINKS_STRAINER,
+        lambda soup, n: get_submission_ids(soup),
+    ),
+    "get_submission_id_for_email": (
+        review_grades_page,
+        SUBMISSIONS_TABLE_STRAINER,
+        lambda soup, n: get_submission_id_for_email(
+            soup, f"student{n - 1}@example.edu"
+        ),
+    ),
+}
+
+
+def measure(func, repeat: int) -> tuple[float, int]:
+    """Return the best wall time in seconds and the peak traced memory in bytes."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    backends = [
+        backend
+        for backend in PARSER_BACKENDS
+        if backend == "html.parser" or importlib.util.find_spec(backend)
+    ]
+
+    print(
+        f"{'scraper':<28} {'backend':<11} {'rows':>6} "
+        f"{'full ms':>9} {'scoped ms':>9} {'full MiB':>9} {'scoped MiB':>10}"
+    )
+    for name, (make_page, strainer, scrape) in SCRAPERS.items():
+        for rows in args.rows:
+            markup = make_page(rows)
+            for backend in backends:
+
+                def full():
+                    return scrape(make_soup(markup, backend), rows)
+
+                def scoped():
+                    return scrape(make_soup(markup, backend, parse_only=strainer), rows)
+
+                assert full() == scoped()
+                full_time, full_peak = measure(full, args.repeat)
+                scoped_time, scoped_peak = measure(scoped, args.repeat)
+                print(
+                    f"{name:<28} {backend:<11} {rows:>6} "
+                    f"{full_time * 1000:>9.1f} {scoped_time * 1000:>9.1f} "
+                    f"{full_peak / 2**20:>9.1f} {scoped_peak / 2**20:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compare two runs of the benchmark suite and flag the benchmarks that got slower or bigger.
+
+Run from the backend directory. Without arguments, compares the last two runs
+saved with `pytest benchmarks --benchmark-autosave`:
+
+    uv run -- python benchmarks/compare.py
+    uv run -- python benchmarks/compare.py old.json new.json --threshold 5
+
+Exits with status 1 if any benchmark regressed.
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+
+STORAGE = pathlib.Path(".benchmarks")
+DEFAULT_THRESHOLD = 10.0  # percent
+
+
+def load(path: pathlib.Path) -> dict[str, dict]:
+    """Map the name of every benchmark of a run to its min time and peak memory."""
+    run = json.loads(path.read_text())
+    return {
+        benchmark["fullname"]: {
+            "time": benchmark["stats"]["min"],
+            "memory": benchmark["extra_info"].get("peak_memory"),
+        }
+        for benchmark in run["benchmarks"]
+    }
+
+
+def latest_runs(storage: pathlib.Path) -> list[pathlib.Path]:
+    # autosaved runs are numbered, e.g. .benchmarks/Linux-CPython-3.12-64bit/0002_<commit>.json
+    return sorted(storage.glob("*/*.json"), key=lambda path: path.name)[-2:]
+
+
+def change(old: float | None, new: float | None) -> float | None:
+    if not old or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+def compare(old: dict[str, dict], new: dict[str, dict], threshold: float) -> list[str]:
+    """Print a row per benchmark of both runs, and return the names of the ones that regressed."""
+    regressions = []
+    print(
+        f"{'benchmark':<60} {'old ms':>9} {'new ms':>9} {'time':>8} "
+        f"{'old MiB':>8} {'new MiB':>8} {'memory':>8}"
+    )
+    for name in sorted(old.keys() & new.keys()):
+        time_change = change(old[name]["time"], new[name]["time"])
+        memory_change = change(old[name]["memory"], new[name]["memory"])
+        regressed = any(
+            value is not None and value > threshold
+            for value in (time_change, memory_change)
+        )
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name.split('::')[-1]:<60} "
+            f"{old[name]['time'] * 1000:>9.2f} {new[name]['time'] * 1000:>9.2f} "
+            f"{_percent(time_change):>8} "
+            f"{_mebibytes(old[name]['memory']):>8} {_mebibytes(new[name]['memory']):>8} "
+            f"{_percent(memory_change):>8}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    for name in sorted(old.keys() - new.keys()):
+        print(f"{name.split('::')[-1]:<60} missing from the new run")
+    return regressions
+
+
+def _percent(value: float | None) -> str:
+    return "-" if value is None else f"{value:+.1f}%"
+
+
+def _mebibytes(value: int | None) -> str:
+    return "-" if value is None else f"{value / 2**20:.2f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("old", nargs="?", type=pathlib.Path, help="JSON of the old run")
+    parser.add_argument("new", nargs="?", type=pathlib.Path, help="JSON of the new run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Percent of slowdown or memory growth flagged as a regression.",
+    )
+    args = parser.parse_args()
+
+    if args.old is None or args.new is None:
+        runs = latest_runs(STORAGE)
+        if len(runs) < 2:
+            parser.error(f"need two runs saved in {STORAGE}, or two JSON files")
+        args.old, args.new = runs
+    print(f"{args.old} -> {args.new}\n")
+
+    regressions = compare(load(args.old), load(args.new), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regressed by more than {args.threshold}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import tracemalloc
+
+import pytest
+
+from gradescopeapi import DEFAULT_PARSER_BACKEND
+
+SIZES = [10, 100, 1_000, 10_000]
+# fewer rounds for bigger pages, which take seconds to parse
+ROUNDS = {10: 20, 100: 10, 1_000: 5, 10_000: 3}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("gradescopeapi benchmarks")
+    group.addoption(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=SIZES,
+        help="Number of rows of the synthetic pages. Defaults to 10 100 1000 10000.",
+    )
+    group.addoption(
+        "--parser-backend",
+        default=DEFAULT_PARSER_BACKEND,
+        help="HTML parser the scrapers use.",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "rows" in metafunc.fixturenames:
+        metafunc.parametrize("rows", metafunc.config.getoption("rows"))
+
+
+@pytest.fixture
+def parser_backend(request):
+    backend = request.config.getoption("parser_backend")
+    if backend != "html.parser":
+        pytest.importorskip(backend)
+    return backend
+
+
+@pytest.fixture
+def measure(benchmark, rows, parser_backend):
+    """Time a scrape with pytest-benchmark, then record its peak memory in the results."""
+
+    def measure(scrape):
+        result = benchmark.pedantic(
+            scrape, rounds=ROUNDS.get(rows, 3), iterations=1, warmup_rounds=1
+        )
+        # traced separately, tracing slows the timed rounds down
+        tracemalloc.start()
+        try:
+            scrape()
+            benchmark.extra_info["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["rows"] = rows
+        benchmark.extra_info["parser_backend"] = parser_backend
+        return result
+
+    return measure
@@ -0,0 +1,213 @@
+"""Time the imports of the package against a budget.
+
+Imports each module in a fresh interpreter with `python -X importtime`,
+reports the median time over several runs and the slowest imports it pulls
+in, and checks that the module stays within its budget:
+
+- its median import time, in milliseconds, and
+- the dependencies that must only be imported on first use, e.g. bs4, which
+  only parsing a page needs.
+
+Run from the backend directory:
+
+    uv run -- python -m benchmarks.import_time
+    uv run -- python -m benchmarks.import_time gradescopeapi.api.api --runs 20 --top 15
+
+Exits with status 1 if any module is over its budget. The times depend on
+the machine; on a slower one, `--scale 2` doubles every time budget.
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+SRC = pathlib.Path(__file__).resolve().parents[1] / "src"
+# imported when a page is parsed or the user logs in, never by the connections themselves
+LAZY = (
+    "bs4",
+    "dateutil",
+    "requests_toolbelt",
+    "lxml",
+    "selectolax",
+    "gradescopeapi.classes.account",
+    "gradescopeapi.classes.async_account",
+)
+
+
+@dataclass
+class Budget:
+    # median import time
+    milliseconds: float
+    # modules the import must not load
+    lazy: tuple[str, ...] = LAZY
+
+
+# only the async connection needs httpx and asyncio
+SYNC_LAZY = (*LAZY, "httpx", "asyncio")
+
+BUDGETS = {
+    "gradescopeapi.classes.connection": Budget(250, lazy=SYNC_LAZY),
+    # the helpers with async versions leave httpx to the async callers
+    "gradescopeapi.classes.assignments": Budget(250, lazy=SYNC_LAZY),
+    "gradescopeapi.classes.extensions": Budget(250, lazy=SYNC_LAZY),
+    "gradescopeapi.classes.upload": Budget(250, lazy=SYNC_LAZY),
+    "gradescopeapi.classes.async_connection": Budget(250),
+    # mostly FastAPI and pydantic
+    "gradescopeapi.api.api": Budget(800),
+}
+
+
+@dataclass
+class Import:
+    name: str
+    # microseconds, without and with the imports it triggered
+    self_time: int
+    cumulative: int
+    # 0 for the imports of the measured statement, 1 for theirs, ...
+    depth: int
+
+
+@dataclass
+class Measurement:
+    module: str
+    # milliseconds of every run
+    times: list[float]
+    # the imports of the median run
+    imports: list[Import] = field(default_factory=list)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    def loaded(self, modules: tuple[str, ...]) -> list[str]:
+        """Which of `modules`, or of their submodules, the import loaded."""
+        names = {record.name for record in self.imports}
+        return [
+            module
+            for module in modules
+            if any(name == module or name.startswith(module + ".") for name in names)
+        ]
+
+    def slowest(self, count: int) -> list[Import]:
+        """The slowest imports the module triggered directly."""
+        direct = [record for record in self.imports if record.depth == 1]
+        return sorted(direct, key=lambda record: record.cumulative, reverse=True)[
+            :count
+        ]
+
+
+def parse_importtime(output: str) -> list[Import]:
+    """Read the "import time: self [us] | cumulative | imported package" lines of -X importtime."""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, cumulative, name = line[len("import time:") :].split("|")
+        if not self_time.strip().isdigit():
+            continue  # the header
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        imports.append(Import(stripped, int(self_time), int(cumulative.strip()), depth))
+    return imports
+
+
+def import_once(module: str) -> list[Import]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure(module: str, runs: int = 5) -> Measurement:
+    """Import `module` in `runs` fresh interpreters."""
+    results = []
+    for _ in range(runs):
+        imports = import_once(module)
+        (top,) = [
+            record for record in imports if record.depth == 0 and record.name == module
+        ]
+        results.append((top.cumulative / 1000, imports))
+    results.sort(key=lambda result: result[0])
+    return Measurement(
+        module,
+        [milliseconds for milliseconds, _ in results],
+        results[len(results) // 2][1],
+    )
+
+
+def check(measurement: Measurement, budget: Budget, scale: float = 1.0) -> list[str]:
+    """Why the measurement is over its budget, if it is."""
+    problems = []
+    if measurement.median > budget.milliseconds * scale:
+        problems.append(
+            f"{measurement.median:.0f} ms is over the budget of "
+            f"{budget.milliseconds * scale:.0f} ms"
+        )
+    for module in measurement.loaded(budget.lazy):
+        problems.append(f"imports {module}, which should be imported on first use")
+    return problems
+
+
+def main(args: argparse.Namespace) -> int:
+    modules = args.modules or list(BUDGETS)
+    failed = False
+    report = []
+    for module in modules:
+        budget = BUDGETS.get(module, Budget(float("inf")))
+        measurement = measure(module, args.runs)
+        problems = check(measurement, budget, args.scale)
+        failed = failed or bool(problems)
+        print(
+            f"{module}: median {measurement.median:.0f} ms "
+            f"(min {measurement.times[0]:.0f}, max {measurement.times[-1]:.0f}), "
+            f"budget {budget.milliseconds * args.scale:.0f} ms"
+        )
+        for record in measurement.slowest(args.top):
+            print(f"  {record.cumulative / 1000:>8.1f} ms  {record.name}")
+        for problem in problems:
+            print(f"  OVER BUDGET: {problem}")
+        report.append(
+            {
+                "module": module,
+                "times": measurement.times,
+                "budget": budget.milliseconds * args.scale,
+                "problems": problems,
+            }
+        )
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+    return 1 if failed else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        help="Modules to time. Defaults to every module with a budget.",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Imports of each module.")
+    parser.add_argument(
+        "--top", type=int, default=8, help="Slowest imports to list for each module."
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiply every time budget by this."
+    )
+    parser.add_argument("--json", help="Save the results to this JSON file.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
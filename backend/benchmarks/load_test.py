@@ -0,0 +1,365 @@
+"""Load test of the API server with a fake Gradescope behind it.
+
+Simulates dashboard users who log in and then, with some think time between
+requests, load courses, assignments, rosters and extensions. Each stage runs
+more users at once and reports the latency percentiles, throughput and error
+rate of their requests, and how busy the threadpool and event loop of the
+server were. Run from the backend directory:
+
+    uv run -- python -m benchmarks.load_test
+    uv run -- python -m benchmarks.load_test --users 10 100 500 --students 1000 --per-endpoint
+
+By default the API app and the fake Gradescope run in this process, which
+shares its CPU with the simulated users: compare the results of two runs,
+not with production. To load a real server, serve the fake Gradescope and
+point the server and the load test at them:
+
+    python -m tests.fake_gradescope --latency 0.05 --port 8025
+    GRADESCOPE_BASE_URL=http://127.0.0.1:8025 uvicorn gradescopeapi.api.api:app --workers 4
+    uv run -- python -m benchmarks.load_test --url http://127.0.0.1:8000
+
+The threadpool and event loop of a server in another process can't be
+measured, so those columns are left empty.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+import anyio.to_thread
+import httpx
+
+from tests.fake_gradescope import (
+    SCALES,
+    FakeGradescope,
+    FakeGradescopeServer,
+    generate_dataset,
+)
+
+# share of requests of each endpoint, once logged in
+MIX = {
+    "login": 5,
+    "courses": 25,
+    "assignments": 30,
+    "course_users": 20,
+    "extensions": 20,
+}
+SAMPLE_INTERVAL = 0.01  # seconds between samples of the threadpool and event loop
+TIMEOUT = 60
+
+
+@dataclass
+class StageResult:
+    users: int
+    duration: float
+    # endpoint -> latency in seconds of every request
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    # endpoint -> number of requests that failed
+    errors: Counter = field(default_factory=Counter)
+    threads_total: int | None = None
+    # busy threads of the threadpool at every sample
+    threads_busy: list[int] = field(default_factory=list)
+    # seconds the event loop was late to wake up at every sample
+    loop_lag: list[float] = field(default_factory=list)
+
+    def record(self, endpoint: str, latency: float, ok: bool) -> None:
+        self.latencies[endpoint].append(latency)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def summary(self, endpoint: str | None = None) -> dict:
+        if endpoint is None:
+            latencies = [
+                value for values in self.latencies.values() for value in values
+            ]
+            errors = sum(self.errors.values())
+        else:
+            latencies, errors = self.latencies[endpoint], self.errors[endpoint]
+        summary = {
+            "requests": len(latencies),
+            "throughput": len(latencies) / self.duration,
+            "error_rate": errors / len(latencies) if latencies else 0.0,
+            **dict(zip(("p50", "p95", "p99"), _percentiles(latencies))),
+        }
+        if endpoint is None and self.threads_busy:
+            summary["threads_peak"] = max(self.threads_busy)
+            summary["threads_saturated"] = self.threads_busy.count(
+                self.threads_total
+            ) / len(self.threads_busy)
+            summary["loop_lag_p99"] = _percentiles(self.loop_lag)[2]
+        return summary
+
+
+def _percentiles(values: list[float]) -> tuple[float, float, float]:
+    if len(values) < 2:
+        return (values[0],) * 3 if values else (0.0, 0.0, 0.0)
+    quantiles = statistics.quantiles(values, n=100, method="inclusive")
+    return quantiles[49], quantiles[94], quantiles[98]
+
+
+class VirtualUser:
+    """A dashboard user, logged in with its own alias of the instructor's email."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        email: str,
+        password: str,
+        targets: list[tuple[str, str]],
+        result: StageResult,
+        think_time: float,
+        seed: int,
+    ):
+        self.client = client
+        self.email = email
+        self.password = password
+        self.targets = targets
+        self.result = result
+        self.think_time = think_time
+        self.rng = random.Random(seed)
+        self.headers = {}
+
+    async def run(self, deadline: float) -> None:
+        await self.think()
+        await self.request("login")
+        while time.perf_counter() < deadline:
+            await self.think()
+            if not self.headers:
+                await self.request("login")
+            else:
+                await self.request(self.rng.choices(list(MIX), list(MIX.values()))[0])
+        if self.headers:
+            await self.client.post("/api/logout", headers=self.headers)
+
+    async def think(self) -> None:
+        if self.think_time:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think_time))
+
+    async def request(self, endpoint: str) -> None:
+        course_id, assignment_id = self.rng.choice(self.targets)
+        if endpoint == "login":
+            path, params = "/api/login", {}
+        elif endpoint == "courses":
+            path, params = "/api/courses", {}
+        elif endpoint == "assignments":
+            path, params = "/api/assignments", {"course_id": course_id}
+        elif endpoint == "course_users":
+            path, params = "/api/course_users", {"course_id": course_id}
+        else:
+            path = "/api/assignments/extensions"
+            params = {"course_id": course_id, "assignment_id": assignment_id}
+
+        start = time.perf_counter()
+        try:
+            if endpoint == "login":
+                response = await self.client.post(
+                    path, json={"email": self.email, "password": self.password}
+                )
+            else:
+                response = await self.client.post(
+                    path, params=params, headers=self.headers
+                )
+            ok = response.is_success
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.result.record(endpoint, time.perf_counter() - start, ok)
+
+        if endpoint == "login" and ok:
+            self.headers = {"session-token": response.json()["session_token"]}
+        elif response is not None and response.status_code == 401:
+            self.headers = {}
+
+
+async def discover_targets(
+    client: httpx.AsyncClient, email: str, password: str
+) -> list[tuple[str, str]]:
+    """Find the (course ID, assignment ID) of every assignment the instructor can see."""
+    response = await client.post(
+        "/api/login", json={"email": email, "password": password}
+    )
+    response.raise_for_status()
+    headers = {"session-token": response.json()["session_token"]}
+    courses = (await client.post("/api/courses", headers=headers)).json()
+    targets = []
+    for course_id in courses["instructor"]:
+        assignments = await client.post(
+            "/api/assignments", params={"course_id": course_id}, headers=headers
+        )
+        for assignment in assignments.json():
+            targets.append((course_id, assignment["assignment_id"]))
+    await client.post("/api/logout", headers=headers)
+    if not targets:
+        raise RuntimeError(f"{email} has no assignments to load")
+    return targets
+
+
+async def sample(result: StageResult, stop: asyncio.Event) -> None:
+    """Sample the threadpool FastAPI runs sync code in, and the lag of the event loop."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    result.threads_total = int(limiter.total_tokens)
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(SAMPLE_INTERVAL)
+        result.loop_lag.append(max(0.0, loop.time() - start - SAMPLE_INTERVAL))
+        result.threads_busy.append(limiter.borrowed_tokens)
+
+
+async def run_stage(
+    client: httpx.AsyncClient,
+    args: argparse.Namespace,
+    users: int,
+    email: str,
+    password: str,
+    targets: list[tuple[str, str]],
+    in_process: bool,
+) -> StageResult:
+    result = StageResult(users, args.duration)
+    local, _, domain = email.partition("@")
+    virtual_users = [
+        VirtualUser(
+            client,
+            f"{local}+user{index}@{domain}",
+            password,
+            targets,
+            result,
+            args.think_time,
+            seed=args.seed * 1_000_003 + index,
+        )
+        for index in range(users)
+    ]
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample(result, stop)) if in_process else None
+    start = time.perf_counter()
+    await asyncio.gather(*(user.run(start + args.duration) for user in virtual_users))
+    # requests still in progress at the deadline finish after it
+    result.duration = time.perf_counter() - start
+    stop.set()
+    if sampler is not None:
+        await sampler
+    return result
+
+
+def print_header() -> None:
+    print(
+        f"{'users':>6} {'endpoint':<13} {'requests':>8} {'req/s':>8} {'errors':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'threads':>9} {'saturated':>9} "
+        f"{'lag p99 ms':>10}"
+    )
+
+
+def print_row(users: int, endpoint: str, summary: dict, threads_total: int | None):
+    threads = saturated = lag = "-"
+    if "threads_peak" in summary:
+        threads = f"{summary['threads_peak']}/{threads_total}"
+        saturated = f"{summary['threads_saturated']:.0%}"
+        lag = f"{summary['loop_lag_p99'] * 1000:.1f}"
+    print(
+        f"{users:>6} {endpoint:<13} {summary['requests']:>8} "
+        f"{summary['throughput']:>8.1f} {summary['error_rate']:>7.1%} "
+        f"{summary['p50'] * 1000:>8.1f} {summary['p95'] * 1000:>8.1f} "
+        f"{summary['p99'] * 1000:>8.1f} {threads:>9} {saturated:>9} {lag:>10}"
+    )
+
+
+async def main(args: argparse.Namespace) -> list[dict]:
+    dataset = generate_dataset(
+        students=args.students,
+        courses=args.courses,
+        assignments=args.assignments,
+        seed=args.seed,
+    )
+    server = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=TIMEOUT)
+    else:
+        server = FakeGradescopeServer(FakeGradescope(dataset, args.latency)).start()
+        from gradescopeapi.api import api
+
+        api.gradescope_base_url = server.base_url
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=api.app),
+            base_url="http://api",
+            timeout=TIMEOUT,
+        )
+
+    results = []
+    try:
+        async with client:
+            targets = await discover_targets(client, dataset.email, dataset.password)
+            print_header()
+            for users in args.users:
+                result = await run_stage(
+                    client,
+                    args,
+                    users,
+                    dataset.email,
+                    dataset.password,
+                    targets,
+                    in_process=server is not None,
+                )
+                summary = result.summary()
+                print_row(users, "all", summary, result.threads_total)
+                endpoints = {}
+                for endpoint in MIX:
+                    endpoints[endpoint] = result.summary(endpoint)
+                    if args.per_endpoint:
+                        print_row(users, endpoint, endpoints[endpoint], None)
+                results.append({"users": users, **summary, "endpoints": endpoints})
+    finally:
+        if server is not None:
+            server.close()
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--users",
+        type=int,
+        nargs="+",
+        default=[1, 5, 10, 25, 50],
+        help="Number of users at once, for each stage.",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10, help="Seconds of each stage."
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.5,
+        help="Mean seconds a user waits between two requests.",
+    )
+    parser.add_argument(
+        "--url", help="Load the API server at this URL instead of one in this process."
+    )
+    parser.add_argument("--students", type=int, default=SCALES["small"])
+    parser.add_argument("--courses", type=int, default=1)
+    parser.add_argument("--assignments", type=int, default=5)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Seconds the fake Gradescope takes to respond.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--per-endpoint",
+        action="store_true",
+        help="Also report each endpoint of the mix.",
+    )
+    parser.add_argument("--json", help="Save the results to this JSON file.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = asyncio.run(main(args))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"arguments": vars(args), "stages": results}, file, indent=2)
@@ -0,0 +1,227 @@
+"""Synthetic Gradescope pages of any size, shaped like the pages in tests/html_fixtures."""
+
+import html
+import json
+
+COURSE_ID = "753413"
+ASSIGNMENT_ID = "4330410"
+
+# page chrome around the tables, so that scoped parsing has something to skip
+PAGE_CHROME = "".join(
+    f'<li class="sidebar--menuItem"><a class="sidebar--menuLink" href="/courses/{COURSE_ID}/page{i}">'
+    f'<span class="sidebar--icon"></span><span class="sidebar--title">Page {i}</span></a></li>'
+    for i in range(200)
+)
+
+
+def page(title: str, content: str) -> str:
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta name="csrf-token" content="synthetic-csrf-token">
+  <title>{title} | Gradescope</title>
+</head>
+<body class="l-app">
+<nav class="sidebar"><ul>{PAGE_CHROME}</ul></nav>
+<div class="l-content">
+{content}
+</div>
+<footer class="footer"><ul>{PAGE_CHROME}</ul></footer>
+</body>
+</html>
+"""
+
+
+def student(i: int) -> dict:
+    return {
+        "full_name": f"Student {i}",
+        "first_name": "Student",
+        "last_name": str(i),
+        "sid": f"N{i:08d}",
+        "email": f"student{i}@example.edu",
+    }
+
+
+def roster_page(num_students: int) -> str:
+    """The memberships page of a course with `num_students` students."""
+    rows = []
+    for i in range(num_students):
+        member = student(i)
+        data_cm = {
+            key: member[key] for key in ("full_name", "first_name", "last_name", "sid")
+        }
+        rows.append(
+            f"""      <tr class="rosterRow">
+        <td class="sorting_1"><button class="js-rosterName rosterCell--editIcon" type="button" data-cm="{html.escape(json.dumps(data_cm))}" data-email="{member["email"]}" data-id="{100000 + i}" data-role="0" data-sections="">{member["full_name"]}</button></td>
+        <td>{member["email"]}</td>
+        <td><select class="form--select js-rosterRoleSelect"><option value="0" selected>Student</option><option value="2">TA</option></select></td>
+        <td class="table--cell-right">{i % 5}</td>
+        <td><a href="#" class="js-editUser">Edit</a></td>
+        <td><button class="js-removeUser">Remove</button></td>
+      </tr>
+"""
+        )
+    return page(
+        "Roster",
+        f"""  <table class="table js-rosterTable">
+    <thead><tr><th>Name</th><th>Email</th><th>Role</th><th>Submissions</th><th></th><th></th></tr></thead>
+    <tbody>
+{"".join(rows)}    </tbody>
+  </table>""",
+    )
+
+
+def review_grades_page(num_students: int) -> str:
+    """The review_grades page of an assignment that every one of `num_students` submitted."""
+    rows = []
+    for i in range(num_students):
+        member = student(i)
+        rows.append(
+            f"""      <tr>
+        <td class="table--primaryLink"><a href="/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/submissions/{200000 + i}">{member["full_name"]}</a></td>
+        <td>{member["email"]}</td>
+        <td class="table--cell-right">{i % 11}.0</td>
+        <td><i class="fa fa-check" aria-label="graded"></i></td>
+      </tr>
+"""
+        )
+    return page(
+        "Review Grades",
+        f"""  <table class="js-reviewGradesTable table">
+    <thead><tr><th>Name</th><th>Email</th><th>Score</th><th>Graded</th></tr></thead>
+    <tbody>
+{"".join(rows)}    </tbody>
+  </table>""",
+    )
+
+
+def account_page(num_courses: int) -> str:
+    """The account page of an instructor of `num_courses` courses, ten per term."""
+    terms = []
+    for term in range(0, num_courses, 10):
+        boxes = "".join(
+            f"""
+      <a class="courseBox" href="/courses/{100000 + i}">
+        <h3 class="courseBox--shortname">CS {1000 + i}</h3>
+        <div class="courseBox--name">Course {i}</div>
+        <div class="courseBox--noGradesPublised">{i % 7} grades published</div>
+        <div class="courseBox--assignments courseBox--assignments-unpublished">{i % 12} assignments</div>
+      </a>"""
+            for i in range(term, min(term + 10, num_courses))
+        )
+        season = "Spring" if term // 10 % 2 else "Fall"
+        terms.append(
+            f"""    <div class="courseList--term pageSubheading">{season} {2024 - term // 20}</div>
+    <div class="courseList--coursesForTerm">{boxes}
+    </div>
+"""
+        )
+    return page(
+        "Your Courses",
+        f"""  <h1 class="pageHeading">Your Courses</h1>
+  <button class="btnv7 btnv7-secondary" type="button"> Create a new course</button>
+  <div class="courseList">
+{"".join(terms)}  </div>""",
+    )
+
+
+def course_instructor_page(num_assignments: int) -> str:
+    """The course page of an instructor, whose assignments are listed in the AssignmentsTable props."""
+    table_data = [{"type": "section", "title": "Homework"}]
+    for i in range(num_assignments):
+        table_data.append(
+            {
+                "type": "assignment",
+                "id": f"assignment_{4000000 + i}",
+                "url": f"/courses/{COURSE_ID}/assignments/{4000000 + i}",
+                "title": f"Homework {i}",
+                "total_points": "10.0",
+                "submission_window": {
+                    "release_date": "2024-01-22T09:00:00.000-05:00",
+                    "due_date": "2024-01-29T23:59:00.000-05:00",
+                    "hard_due_date": (
+                        "2024-01-31T23:59:00.000-05:00" if i % 2 else None
+                    ),
+                },
+            }
+        )
+    props = {"table_data": table_data, "course_id": int(COURSE_ID)}
+    return page(
+        "Dashboard",
+        f'  <div data-react-class="AssignmentsTable" data-react-props="{html.escape(json.dumps(props))}"></div>',
+    )
+
+
+def course_student_page(num_assignments: int) -> str:
+    """The course page of a student, a table with a row per assignment: submitted, open or closed."""
+    rows = []
+    for i in range(num_assignments):
+        assignment_id = 5000000 + i
+        if i % 3 == 0:
+            name = f'<a aria-label="View Homework {i}" href="/courses/{COURSE_ID}/assignments/{assignment_id}/submissions/{31000000 + i}">Homework {i}</a>'
+            status = '<div class="submissionStatus--score">9.5 / 10.0</div>'
+        elif i % 3 == 1:
+            name = f'<button class="js-submitAssignment" data-assignment-id="{assignment_id}" type="button">Homework {i}</button>'
+            status = '<div class="submissionStatus--text">No Submission</div>'
+        else:
+            name = f"Homework {i}"
+            status = '<div class="submissionStatus--text">Submitted</div>'
+        rows.append(
+            f"""      <tr role="row">
+        <th class="table--primaryLink" role="rowheader" scope="row">{name}</th>
+        <td class="submissionStatus">{status}</td>
+        <td class="sub-row-dates"><span class="submissionTimeChart">
+          <time class="submissionTimeChart--releaseDate" datetime="2024-01-22 09:00:00 -0500">Jan 22</time>
+          <time class="submissionTimeChart--dueDate" datetime="2024-01-29 23:59:00 -0500">Due Date: Jan 29 at 11:59PM</time>
+        </span></td>
+      </tr>
+"""
+        )
+    return page(
+        "Dashboard",
+        f"""  <table class="table" id="assignments-student-table" role="grid">
+    <thead><tr role="row"><th>Name</th><th>Status</th><th>Released</th></tr></thead>
+    <tbody>
+{"".join(rows)}      <tr role="row" class="dropzonePreview--fileNameHeader"><td>Uploaded files</td></tr>
+    </tbody>
+  </table>""",
+    )
+
+
+def extensions_page(num_extensions: int) -> str:
+    """The extensions page of an assignment with an extension for each of `num_extensions` students."""
+    rows = []
+    for i in range(num_extensions):
+        props = {
+            "override": {
+                "id": 6000000 + i,
+                "user_id": 100000 + i,
+                "settings": {
+                    "due_date": {"type": "absolute", "value": "2024-04-16T23:59:00"},
+                    "hard_due_date": {
+                        "type": "absolute",
+                        "value": "2024-04-18T23:59:00",
+                    },
+                },
+            },
+            "timezone": {"identifier": "America/New_York"},
+            "deletePath": f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/extensions/{6000000 + i}",
+            "studentName": student(i)["full_name"],
+        }
+        rows.append(
+            f"""      <tr>
+        <td>{props["studentName"]}</td>
+        <td>2024-04-16T23:59:00</td>
+        <td class="table--cell-right"><div data-react-class="EditExtension" data-react-props="{html.escape(json.dumps(props))}"></div></td>
+      </tr>
+"""
+        )
+    return page(
+        "Extensions",
+        f"""  <table class="table js-overridesTable">
+    <thead><tr><th>Name</th><th>Due Date</th><th></th></tr></thead>
+    <tbody>
+{"".join(rows)}    </tbody>
+  </table>""",
+    )
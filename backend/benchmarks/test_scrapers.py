@@ -0,0 +1,87 @@
+"""Time and peak memory of every scraper, from the page markup to the scraped objects.
+
+Run from the backend directory, and compare with the previous run:
+
+    uv run -- pytest benchmarks --benchmark-autosave
+    uv run -- python benchmarks/compare.py
+"""
+
+from synthetic import (
+    account_page,
+    course_instructor_page,
+    course_student_page,
+    extensions_page,
+    review_grades_page,
+    roster_page,
+)
+
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    SUBMISSION_LINKS_STRAINER,
+    get_assignments_instructor_view,
+    get_assignments_student_view,
+    get_submission_ids,
+)
+from gradescopeapi.classes._helpers._course_helpers import (
+    COURSE_MEMBERS_STRAINER,
+    get_course_members,
+    get_courses_info,
+)
+from gradescopeapi.classes._helpers._parser_helpers import make_soup
+from gradescopeapi.classes.extensions import _parse_extensions
+
+
+def test_get_courses_info(measure, rows, parser_backend):
+    markup = account_page(rows)
+
+    courses, is_instructor = measure(
+        lambda: get_courses_info(make_soup(markup, parser_backend), "Your Courses")
+    )
+
+    assert is_instructor
+    assert len(courses) == rows
+
+
+def test_get_course_members(measure, rows, parser_backend):
+    markup = roster_page(rows)
+
+    def scrape():
+        soup = make_soup(markup, parser_backend, parse_only=COURSE_MEMBERS_STRAINER)
+        return get_course_members(soup, "753413")
+
+    assert len(measure(scrape)) == rows
+
+
+def test_get_assignments_instructor_view(measure, rows, parser_backend):
+    markup = course_instructor_page(rows)
+
+    assignments = measure(
+        lambda: get_assignments_instructor_view(make_soup(markup, parser_backend))
+    )
+
+    assert len(assignments) == rows
+
+
+def test_get_assignments_student_view(measure, rows, parser_backend):
+    markup = course_student_page(rows)
+
+    assignments = measure(
+        lambda: get_assignments_student_view(make_soup(markup, parser_backend))
+    )
+
+    assert len(assignments) == rows
+
+
+def test_parse_extensions(measure, rows, parser_backend):
+    markup = extensions_page(rows)
+
+    assert len(measure(lambda: _parse_extensions(markup, parser_backend))) == rows
+
+
+def test_get_submission_ids(measure, rows, parser_backend):
+    markup = review_grades_page(rows)
+
+    def scrape():
+        soup = make_soup(markup, parser_backend, parse_only=SUBMISSION_LINKS_STRAINER)
+        return get_submission_ids(soup)
+
+    assert len(measure(scrape)) == rows
@@ -1 +1,2 @@
 DEFAULT_GRADESCOPE_BASE_URL = "https://www.gradescope.com"
+DEFAULT_PARSER_BACKEND = "html.parser"
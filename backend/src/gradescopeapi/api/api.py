@@ -1,22 +1,36 @@
 from datetime import datetime
 import asyncio
 import uuid
-from fastapi import Depends, FastAPI, HTTPException, status, Header
+from fastapi import Depends, FastAPI, File, HTTPException, status, Header, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi.routing import Mount
+import anyio.to_thread
 import os
 import sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from gradescopeapi._config.config import FileUploadModel, LoginRequestModel
-from gradescopeapi.classes.account import Account
-from gradescopeapi.classes.assignments import Assignment, update_assignment_date
-from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi._config.config import LoginRequestModel
+from gradescopeapi.api.constants import BASE_URL, LAST_ACTIVE_RESOLUTION, MAX_SESSIONS, SESSION_TIMEOUT
+from gradescopeapi.api.metrics import CONTENT_TYPE, Metrics, MetricsMiddleware, sample
+from gradescopeapi.api.session_store import (
+    MemorySessionStore,
+    SessionState,
+    SQLiteSessionStore,
+)
+from gradescopeapi.classes._helpers._concurrency_helpers import SingleFlight
+from gradescopeapi.classes.assignments import Assignment, update_assignment_date_async
+from gradescopeapi.classes.async_connection import AsyncGSConnection
 from gradescopeapi.classes.courses import Course
-from gradescopeapi.classes.extensions import get_extensions, update_student_extension
+from gradescopeapi.classes.extensions import (
+    get_extensions_async,
+    update_student_extension_async,
+)
+from gradescopeapi.classes.http_cache import CacheStats
 from gradescopeapi.classes.member import Member
-from gradescopeapi.classes.upload import upload_assignment
+from gradescopeapi.classes.transport_policy import TransportPolicy
+from gradescopeapi.classes.upload import upload_assignment_async
 
 # Create app FIRST - before using it
 app = FastAPI()
@@ -40,27 +54,45 @@ app.add_middleware(
     max_age=3600
 )
 
+# Requests served per route and sent to Gradescope per endpoint, scraped at /api/metrics
+metrics = Metrics()
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+
 # Get the absolute path to the current directory
 current_dir = os.path.dirname(os.path.abspath(__file__))
 static_dir = os.path.join(current_dir, "static")
 
-# Create static directory if it doesn't exist
-os.makedirs(static_dir, exist_ok=True)
+# Mount static files with absolute path - ONLY ONCE. The directory ships with the package and is
+# checked on the first request instead of at import, to keep cold starts off the filesystem
+app.mount("/static", StaticFiles(directory=static_dir, check_dir=False), name="static")
+
+# User sessions storage - replaces the global connection and account. Set GRADESCOPE_SESSION_STORE
+# to the path of a SQLite file to share the sessions between several workers. Its methods block,
+# so they are called in a worker thread to keep the event loop free
+session_store_path = os.environ.get("GRADESCOPE_SESSION_STORE")
+user_sessions = (
+    SQLiteSessionStore(session_store_path, max_sessions=MAX_SESSIONS)
+    if session_store_path
+    else MemorySessionStore(max_sessions=MAX_SESSIONS)
+)
+
+# Gradescope the users log in to. Set GRADESCOPE_BASE_URL to serve another one, e.g. a fake for load tests
+gradescope_base_url = os.environ.get("GRADESCOPE_BASE_URL", BASE_URL)
 
-# Mount static files with absolute path - ONLY ONCE
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+# Connections of this worker, rebuilt from user_sessions on demand, with the state they were built from
+live_connections = {}
+# hits are requests that reused the live connection of their session, misses rebuilt it
+live_connection_stats = CacheStats()
 
-# User sessions storage - replaces the global connection and account
-user_sessions = {}
+# Identical reads that are in progress, shared between the requests that ask for them
+single_flight = SingleFlight()
+# shared by every user so that Gradescope sees one rate limit and one circuit
+transport_policy = TransportPolicy()
 
 # Get path to React build directory
 project_root = os.path.abspath(os.path.join(current_dir, ".."))
 frontend_build_dir = os.path.join(project_root, "frontend", "build")
 
-# Mount React build directory if it exists
-if os.path.exists(frontend_build_dir):
-   app.mount("/assets", StaticFiles(directory=os.path.join(frontend_build_dir, "assets")), name="react_assets")
-
 # Root route to serve our HTML file - ONLY ONCE
 @app.get("/")
 def read_root():
@@ -69,23 +101,43 @@ def read_root():
 # Session cleanup background task
 @app.on_event("startup")
 async def startup_event():
+    mount_frontend_assets()
     asyncio.create_task(cleanup_expired_sessions())
 
+# Mount the React build directory if it exists, checked at startup instead of at import
+def mount_frontend_assets():
+    if not os.path.exists(frontend_build_dir):
+        return
+    if any(getattr(route, "name", None) == "react_assets" for route in app.router.routes):
+        return
+    assets = StaticFiles(directory=os.path.join(frontend_build_dir, "assets"), check_dir=False)
+    # ahead of the catch-all route of the React app, which was added after the app was created
+    app.router.routes.insert(0, Mount("/assets", app=assets, name="react_assets"))
+
 async def cleanup_expired_sessions():
     while True:
-        now = datetime.now()
-        # Remove sessions inactive for more than 30 minutes
-        expired = [token for token, data in user_sessions.items() 
-                  if (now - data["last_active"]).seconds > 1800]
+        # Remove sessions inactive for more than SESSION_TIMEOUT
+        await anyio.to_thread.run_sync(user_sessions.delete_inactive, datetime.now() - SESSION_TIMEOUT)
         
-        for token in expired:
-            del user_sessions[token]
+        # Close the connections of sessions that are gone, including those removed by other workers
+        for token in list(live_connections):
+            if await anyio.to_thread.run_sync(user_sessions.get, token) is None:
+                await close_live_connection(token)
         
         # Check every minute
         await asyncio.sleep(60)
 
+async def close_live_connection(token: str):
+    live = live_connections.pop(token, None)
+    if live is not None:
+        await live[0].aclose()
+
+async def close_live_connections(tokens: list[str]):
+    for token in tokens:
+        await close_live_connection(token)
+
 # Dependency to get the current user's data
-def get_current_user_data(
+async def get_current_user_data(
     session_token: str = Header(None, description="Session token from login"),
     authorization: str = Header(None, description="Bearer token")
 ):
@@ -102,12 +154,42 @@ def get_current_user_data(
     if not token:
         raise HTTPException(status_code=401, detail="Invalid or missing session token")
     
-    if token not in user_sessions:
+    state = await anyio.to_thread.run_sync(user_sessions.get, token)
+    if state is None:
+        # logged out or expired, possibly by another worker
+        await close_live_connection(token)
         raise HTTPException(status_code=401, detail="Invalid or expired session")
     
-    # Update last active timestamp
-    user_sessions[token]["last_active"] = datetime.now()
-    return user_sessions[token]
+    # Rebuild the connection if this worker has none, or another worker changed the cookies
+    connection, live_state = live_connections.get(token, (None, None))
+    if connection is None or not live_state.same_credentials(state):
+        await close_live_connection(token)
+        connection = state.to_connection(transport_policy=transport_policy, tracer=metrics.tracer)
+        live_connections[token] = (connection, state)
+        live_connection_stats.record(misses=1)
+    else:
+        live_connection_stats.record(hits=1)
+    
+    # Update last active timestamp, writing it to the store at most once per LAST_ACTIVE_RESOLUTION
+    now = datetime.now()
+    if now - state.last_active >= LAST_ACTIVE_RESOLUTION:
+        state.last_active = now
+        await close_live_connections(await anyio.to_thread.run_sync(user_sessions.set, token, state))
+    try:
+        yield {
+            "connection": connection,
+            "account": connection.account,
+            "last_active": state.last_active,
+            "email": state.email,
+            "token": token,
+        }
+    finally:
+        # Share cookies Gradescope changed during the request with the other workers
+        new_state = SessionState.from_connection(connection, state.email)
+        if token in live_connections and not new_state.same_credentials(state):
+            new_state.last_active = state.last_active
+            await close_live_connections(await anyio.to_thread.run_sync(user_sessions.set, token, new_state))
+            live_connections[token] = (connection, new_state)
 
 # Helper to get connection from user data
 def get_connection_from_user_data(user_data: dict):
@@ -117,8 +199,13 @@ def get_connection_from_user_data(user_data: dict):
 def get_account_from_user_data(user_data: dict):
     return user_data["account"]
 
+# Helper to share a read with identical requests of the same Gradescope user that are in progress
+async def coalesced(user_data: dict, endpoint: str, read, **params):
+    key = (user_data["email"], endpoint, tuple(sorted(params.items())))
+    return await single_flight.do_async(key, read)
+
 @app.post(f"{API_PREFIX}/login", name="login")
-def login(
+async def login(
    login_data: LoginRequestModel,
 ):
    """Login to Gradescope, with correct credentials
@@ -137,19 +224,19 @@ def login(
 
    try:
        # Create a new connection for this login
-       user_connection = GSConnection()
-       user_connection.login(user_email, password, two_factor_code)
+       user_connection = AsyncGSConnection(
+           gradescope_base_url, transport_policy=transport_policy, tracer=metrics.tracer
+       )
+       await user_connection.login(user_email, password, two_factor_code)
        
        # Generate a unique session token
        session_token = str(uuid.uuid4())
        
-       # Store the connection in the sessions dictionary
-       user_sessions[session_token] = {
-           "connection": user_connection,
-           "account": user_connection.account,
-           "last_active": datetime.now(),
-           "email": user_email
-       }
+       # Store the session, and keep its connection for the next requests to this worker
+       state = SessionState.from_connection(user_connection, user_email)
+       live_connections[session_token] = (user_connection, state)
+       # Log out the least recently active sessions beyond MAX_SESSIONS
+       await close_live_connections(await anyio.to_thread.run_sync(user_sessions.set, session_token, state))
        
        return {
            "message": "Login successful", 
@@ -161,7 +248,7 @@ def login(
 
 
 @app.post(f"{API_PREFIX}/logout")
-def logout(user_data: dict = Depends(get_current_user_data)):
+async def logout(user_data: dict = Depends(get_current_user_data)):
     """Logout from Gradescope
 
     Removes the user's session from the server
@@ -169,10 +256,8 @@ def logout(user_data: dict = Depends(get_current_user_data)):
     Returns:
         dict: Message indicating success
     """
-    # Get the session token from headers
-    session_token = next((k for k, v in user_sessions.items() if v == user_data), None)
-    if session_token:
-        del user_sessions[session_token]
+    await anyio.to_thread.run_sync(user_sessions.delete, user_data["token"])
+    await close_live_connection(user_data["token"])
     
     return {
         "message": "Logout successful",
@@ -181,7 +266,7 @@ def logout(user_data: dict = Depends(get_current_user_data)):
 
 
 @app.post(f"{API_PREFIX}/courses", response_model=dict[str, dict[str, Course]])
-def get_courses(user_data: dict = Depends(get_current_user_data)):
+async def get_courses(user_data: dict = Depends(get_current_user_data)):
    """Get all courses for the user
 
    Args:
@@ -195,14 +280,14 @@ def get_courses(user_data: dict = Depends(get_current_user_data)):
    """
    try:
        account = get_account_from_user_data(user_data)
-       course_list = account.get_courses()
+       course_list = await coalesced(user_data, "courses", account.get_courses)
        return course_list
    except RuntimeError as e:
        raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post(f"{API_PREFIX}/course_users", response_model=list[Member])
-def get_course_users(course_id: str, user_data: dict = Depends(get_current_user_data)):
+async def get_course_users(course_id: str, user_data: dict = Depends(get_current_user_data)):
    """Get all users for a course. ONLY FOR INSTRUCTORS.
 
    Args:
@@ -216,15 +301,19 @@ def get_course_users(course_id: str, user_data: dict = Depends(get_current_user_
    """
    try:
        account = get_account_from_user_data(user_data)
-       course_list = account.get_course_users(course_id)
-       print(course_list)
+       course_list = await coalesced(
+           user_data,
+           "course_users",
+           lambda: account.get_course_users(course_id),
+           course_id=course_id,
+       )
        return course_list
    except RuntimeError as e:
        raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post(f"{API_PREFIX}/assignments", response_model=list[Assignment])
-def get_assignments(course_id: str = None, user_data: dict = Depends(get_current_user_data)):
+async def get_assignments(course_id: str = None, user_data: dict = Depends(get_current_user_data)):
    """Get all assignments for a course.
    
    Args:
@@ -246,7 +335,12 @@ def get_assignments(course_id: str = None, user_data: dict = Depends(get_current
    
    try:
        account = get_account_from_user_data(user_data)
-       assignments = account.get_assignments(course_id)
+       assignments = await coalesced(
+           user_data,
+           "assignments",
+           lambda: account.get_assignments(course_id),
+           course_id=course_id,
+       )
        return assignments
    except RuntimeError as e:
        raise HTTPException(
@@ -255,7 +349,7 @@ def get_assignments(course_id: str = None, user_data: dict = Depends(get_current
 
 
 @app.post(f"{API_PREFIX}/assignment_submissions", response_model=dict[str, list[str]])
-def get_assignment_submissions(
+async def get_assignment_submissions(
    course_id: str,
    assignment_id: str,
    user_data: dict = Depends(get_current_user_data)
@@ -274,8 +368,14 @@ def get_assignment_submissions(
    """
    try:
        account = get_account_from_user_data(user_data)
-       assignment_list = account.get_assignment_submissions(
-           course_id=course_id, assignment_id=assignment_id
+       assignment_list = await coalesced(
+           user_data,
+           "assignment_submissions",
+           lambda: account.get_assignment_submissions(
+               course_id=course_id, assignment_id=assignment_id
+           ),
+           course_id=course_id,
+           assignment_id=assignment_id,
        )
        return assignment_list
    except RuntimeError as e:
@@ -285,7 +385,7 @@ def get_assignment_submissions(
 
 
 @app.post(f"{API_PREFIX}/single_assignment_submission", response_model=list[str])
-def get_student_assignment_submission(
+async def get_student_assignment_submission(
    student_email: str, course_id: str, assignment_id: str,
    user_data: dict = Depends(get_current_user_data)
 ):
@@ -304,7 +404,14 @@ def get_student_assignment_submission(
    """
    try:
        account = get_account_from_user_data(user_data)
-       assignment_submissions = account.get_assignment_submission(
+       assignment_submissions = await coalesced(
+           user_data,
+           "single_assignment_submission",
+           lambda: account.get_assignment_submission(
+               student_email=student_email,
+               course_id=course_id,
+               assignment_id=assignment_id,
+           ),
            student_email=student_email,
            course_id=course_id,
            assignment_id=assignment_id,
@@ -317,7 +424,7 @@ def get_student_assignment_submission(
 
 
 @app.post(f"{API_PREFIX}/assignments/update_dates")
-def update_assignment_dates(
+async def update_assignment_dates(
    course_id: str,
    assignment_id: str,
    release_date: datetime,
@@ -346,15 +453,16 @@ def update_assignment_dates(
        HTTPException: If the assignment dates update fails, with a 400 Bad Request status code and the error message "Failed to update assignment dates".
    """
    try:
-       print(f"late due date {late_due_date}")
        connection = get_connection_from_user_data(user_data)
-       success = update_assignment_date(
-           session=connection.session,
+       success = await update_assignment_date_async(
+           client=connection.client,
            course_id=course_id,
            assignment_id=assignment_id,
            release_date=release_date,
            due_date=due_date,
            late_due_date=late_due_date,
+           gradescope_base_url=connection.gradescope_base_url,
+           parser_backend=connection.parser_backend,
        )
        if success:
            return {
@@ -370,7 +478,7 @@ def update_assignment_dates(
 
 
 @app.post(f"{API_PREFIX}/assignments/extensions", response_model=dict)
-def get_assignment_extensions(
+async def get_assignment_extensions(
     course_id: str, 
     assignment_id: str,
     user_data: dict = Depends(get_current_user_data)
@@ -390,8 +498,16 @@ def get_assignment_extensions(
    """
    try:
        connection = get_connection_from_user_data(user_data)
-       extensions = get_extensions(
-           session=connection.session,
+       extensions = await coalesced(
+           user_data,
+           "assignments/extensions",
+           lambda: get_extensions_async(
+               client=connection.client,
+               course_id=course_id,
+               assignment_id=assignment_id,
+               gradescope_base_url=connection.gradescope_base_url,
+               parser_backend=connection.parser_backend,
+           ),
            course_id=course_id,
            assignment_id=assignment_id,
        )
@@ -401,7 +517,7 @@ def get_assignment_extensions(
 
 
 @app.post(f"{API_PREFIX}/assignments/extensions/update")
-def update_extension(
+async def update_extension(
    course_id: str,
    assignment_id: str,
    user_id: str,
@@ -431,14 +547,16 @@ def update_extension(
    """
    try:
        connection = get_connection_from_user_data(user_data)
-       success = update_student_extension(
-           session=connection.session,
+       success = await update_student_extension_async(
+           client=connection.client,
            course_id=course_id,
            assignment_id=assignment_id,
            user_id=user_id,
            release_date=release_date,
            due_date=due_date,
            late_due_date=late_due_date,
+           gradescope_base_url=connection.gradescope_base_url,
+           parser_backend=connection.parser_backend,
        )
        if success:
            return {
@@ -454,26 +572,26 @@ def update_extension(
 
 
 @app.post(f"{API_PREFIX}/assignments/upload")
-def upload_assignment_files(
+async def upload_assignment_files(
    course_id: str, 
    assignment_id: str, 
-   leaderboard_name: str, 
-   file: FileUploadModel,
+   files: list[UploadFile] = File(...),
+   leaderboard_name: str | None = None,
    user_data: dict = Depends(get_current_user_data)
 ):
    """
    Upload files for an assignment.
 
-   NOTE: This function within FastAPI is currently nonfunctional, as we did not
-   find the datatype for file, which would allow us to upload a file via
-   Postman. However, this functionality works correctly if a user
-   runs this as a Python package.
+   The files are sent as multipart/form-data, one "files" field per file.
+   Starlette spools each upload to a temporary file beyond 1 MB, and the
+   upload streams them on to Gradescope in chunks, so no upload is held in
+   memory whole.
 
    Args:
        course_id (str): The ID of the course on Gradescope.
        assignment_id (str): The ID of the assignment on Gradescope.
-       leaderboard_name (str): The name of the leaderboard.
-       file (FileUploadModel): The file object to upload.
+       files (list[UploadFile]): The files to upload.
+       leaderboard_name (str | None): The name of the leaderboard. Defaults to None.
 
    Returns:
        dict: A dictionary containing the submission link for the uploaded files.
@@ -484,20 +602,54 @@ def upload_assignment_files(
    """
    try:
        connection = get_connection_from_user_data(user_data)
-       submission_link = upload_assignment(
-           session=connection.session,
-           course_id=course_id,
-           assignment_id=assignment_id,
-           files=file,
+       submission_link = await upload_assignment_async(
+           connection.client,
+           course_id,
+           assignment_id,
+           *[(upload.filename, upload.file) for upload in files],
            leaderboard_name=leaderboard_name,
+           gradescope_base_url=connection.gradescope_base_url,
        )
        if submission_link:
            return {"submission_link": submission_link}
        else:
            raise HTTPException(status_code=400, detail="Upload unsuccessful")
+   except HTTPException:
+       raise
    except Exception as e:
        raise HTTPException(status_code=500, detail=str(e))
 
+@app.get(f"{API_PREFIX}/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+   """Metrics of this worker in the Prometheus text format"""
+   limiter = anyio.to_thread.current_default_thread_limiter()
+   sessions = await anyio.to_thread.run_sync(len, user_sessions)
+   lines = [
+       *metrics.collect(),
+       *sample("gradescope_api_sessions", "gauge", "Logged in sessions in the session store.", sessions),
+       *sample("gradescope_api_live_connections", "gauge", "Connections of this worker to Gradescope.", len(live_connections)),
+       *sample("gradescope_api_sessions_expired_total", "counter", "Sessions removed after SESSION_TIMEOUT.", user_sessions.stats.expired),
+       *sample("gradescope_api_sessions_evicted_total", "counter", "Sessions logged out to stay under MAX_SESSIONS.", user_sessions.stats.evicted),
+       *sample("gradescope_api_live_connection_hits_total", "counter", "Requests that reused the live connection of their session.", live_connection_stats.hits),
+       *sample("gradescope_api_live_connection_misses_total", "counter", "Requests that rebuilt the connection of their session.", live_connection_stats.misses),
+       *sample("gradescope_api_live_connection_hit_ratio", "gauge", "Share of requests that reused a live connection.", live_connection_stats.hit_ratio),
+       *sample("gradescope_api_single_flight_calls_total", "counter", "Reads from Gradescope that were run.", single_flight.calls),
+       *sample("gradescope_api_single_flight_shared_total", "counter", "Reads answered by an identical read in progress.", single_flight.shared),
+       *sample(
+           "gradescope_api_single_flight_hit_ratio",
+           "gauge",
+           "Share of reads answered by an identical read in progress.",
+           single_flight.shared / (single_flight.calls + single_flight.shared) if single_flight.calls else 0,
+       ),
+       *sample("gradescope_upstream_retries_total", "counter", "Requests to Gradescope that were retried.", transport_policy.stats.retries),
+       *sample("gradescope_upstream_throttled_total", "counter", "Requests to Gradescope delayed by the rate limit.", transport_policy.stats.throttled),
+       *sample("gradescope_upstream_rejected_total", "counter", "Requests to Gradescope rejected by the open circuit.", transport_policy.stats.rejected),
+       *sample("gradescope_api_threadpool_threads", "gauge", "Threads of the threadpool sync code runs in.", limiter.total_tokens),
+       *sample("gradescope_api_threadpool_busy_threads", "gauge", "Threads of the threadpool running sync code.", limiter.borrowed_tokens),
+       *sample("gradescope_api_threadpool_queue_depth", "gauge", "Calls waiting for a thread of the threadpool.", limiter.statistics().tasks_waiting),
+   ]
+   return PlainTextResponse("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
+
 # This catch-all route should be at the very end
 @app.get("/{full_path:path}")
 async def serve_react(full_path: str):
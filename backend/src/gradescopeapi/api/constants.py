@@ -2,4 +2,15 @@
 Constants file for FastAPI. Specifies any variable or other object which should remain the same across all environments.
 """
 
+from datetime import timedelta
+
 BASE_URL = "https://www.gradescope.com"
+
+# Sessions inactive for longer are logged out
+SESSION_TIMEOUT = timedelta(minutes=30)
+
+# The last activity of a session is only written to the store once it is older than this
+LAST_ACTIVE_RESOLUTION = timedelta(minutes=1)
+
+# Most sessions kept at once, the least recently active are logged out beyond it
+MAX_SESSIONS = 10_000
@@ -0,0 +1,223 @@
+"""Prometheus metrics of the API server, served at /api/metrics.
+
+Requests are counted and timed per route by `MetricsMiddleware`, and the
+requests the server sends to Gradescope per endpoint template, from the
+spans of the `Tracer` of its connections (see `Metrics.tracer`). Gauges,
+e.g. of the sessions, are read when the metrics are scraped.
+
+Counters and histograms are sharded per thread: a thread only ever updates
+its own shard, so recording takes no lock and can't become a contention
+point. Scraping adds up the shards.
+"""
+
+import bisect
+import math
+import threading
+import time
+from collections.abc import Iterable
+
+from gradescopeapi.classes.tracing import Span, Tracer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# seconds, the same as the Prometheus client libraries
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, math.inf)
+
+
+class _Sharded:
+    """Per-thread dicts of label values -> values, added up when collected."""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            # first record of this thread, the only time a lock is taken
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def _items(self) -> Iterable[tuple[tuple[str, ...], list[float]]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # copied in one step, while the thread that owns the shard may add to it
+            yield from list(shard.items())
+
+    def _labels(self, values: tuple[str, ...], **extra: str) -> str:
+        labels = [
+            f'{name}="{_escape(value)}"'
+            for name, value in [*zip(self.label_names, values), *extra.items()]
+        ]
+        return "{" + ",".join(labels) + "}" if labels else ""
+
+
+class Counter(_Sharded):
+    """Monotonic count per label values."""
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1) -> None:
+        shard = self._shard()
+        value = shard.get(labels)
+        if value is None:
+            shard[labels] = [amount]
+        else:
+            value[0] += amount
+
+    def collect(self) -> list[str]:
+        totals = {}
+        for labels, (value,) in self._items():
+            totals[labels] = totals.get(labels, 0) + value
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        for labels, value in sorted(totals.items()):
+            lines.append(f"{self.name}{self._labels(labels)} {_number(value)}")
+        return lines
+
+
+class Histogram(_Sharded):
+    """Distribution of observations per label values, e.g. of latencies in seconds."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = buckets if buckets[-1] == math.inf else (*buckets, math.inf)
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        shard = self._shard()
+        # the count of each bucket on its own, then the sum and count of all observations
+        values = shard.get(labels)
+        if values is None:
+            values = shard[labels] = [0] * (len(self.buckets) + 2)
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def collect(self) -> list[str]:
+        totals = {}
+        for labels, values in self._items():
+            total = totals.setdefault(labels, [0] * len(values))
+            for index, value in enumerate(values):
+                total[index] += value
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for labels, values in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else _number(bound)
+                lines.append(
+                    f"{self.name}_bucket{self._labels(labels, le=le)} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{self._labels(labels)} {values[-2]!r}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {values[-1]}")
+        return lines
+
+
+def sample(name: str, kind: str, documentation: str, value: float) -> list[str]:
+    """Lines of a metric with a single value, e.g. a gauge read when scraped."""
+    return [
+        f"# HELP {name} {documentation}",
+        f"# TYPE {name} {kind}",
+        f"{name} {_number(value)}",
+    ]
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+class Metrics:
+    """Requests served by the server and requests it sent to Gradescope."""
+
+    def __init__(self):
+        self.requests = Counter(
+            "gradescope_api_requests_total",
+            "Requests served, per route, method and status.",
+            ("route", "method", "status"),
+        )
+        self.request_duration = Histogram(
+            "gradescope_api_request_duration_seconds",
+            "Seconds taken to serve a request, per route and method.",
+            ("route", "method"),
+        )
+        self.upstream_requests = Counter(
+            "gradescope_upstream_requests_total",
+            "Requests sent to Gradescope, per endpoint template, method and status.",
+            ("endpoint", "method", "status"),
+        )
+        self.upstream_duration = Histogram(
+            "gradescope_upstream_request_duration_seconds",
+            "Seconds until Gradescope responded, per endpoint template and method.",
+            ("endpoint", "method"),
+        )
+        # pass it to the connections of the server
+        self.tracer = Tracer(on_span=self.record_span)
+
+    def record_span(self, span: Span) -> None:
+        if span.kind != "http":
+            return
+        endpoint = span.attributes["url_template"]
+        method = span.attributes["method"]
+        self.upstream_requests.inc((endpoint, method, str(span.attributes["status"])))
+        self.upstream_duration.observe((endpoint, method), span.duration)
+
+    def collect(self) -> list[str]:
+        return [
+            *self.requests.collect(),
+            *self.request_duration.collect(),
+            *self.upstream_requests.collect(),
+            *self.upstream_duration.collect(),
+        ]
+
+
+class MetricsMiddleware:
+    """ASGI middleware that counts and times the requests of an app, per route template."""
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # the route the router matched, so that every path of a route is counted together
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            self.metrics.requests.inc((route, method, str(status)))
+            self.metrics.request_duration.observe(
+                (route, method), time.perf_counter() - start
+            )
@@ -0,0 +1,283 @@
+"""Stores for the logged in Gradescope sessions of the API server.
+
+A session is kept as the state needed to talk to Gradescope as its user: the
+cookies, the CSRF header and the base URL. Any worker process can rebuild an
+`AsyncGSConnection` from that state, so with a store shared between processes
+(`SQLiteSessionStore`) the API can run with several uvicorn workers and no
+sticky routing.
+
+Both stores keep sessions ordered by their last activity, so expired sessions
+are found without scanning the others, and can be bounded to a maximum number
+of sessions by logging out the least recently active ones.
+
+Example:
+    store = SQLiteSessionStore("sessions.sqlite3", max_sessions=10_000)
+    store.set(token, SessionState.from_connection(connection, email))
+    connection = store.get(token).to_connection()
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+import httpx
+
+from gradescopeapi.classes._helpers._csrf_helpers import CSRF_HEADER
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.tracing import Tracer
+from gradescopeapi.classes.transport_policy import TransportPolicy
+
+
+@dataclass
+class SessionState:
+    email: str
+    gradescope_base_url: str
+    cookies: list[dict] = field(default_factory=list)
+    csrf_token: str | None = None
+    last_active: datetime = field(default_factory=datetime.now)
+
+    @classmethod
+    def from_connection(
+        cls, connection: AsyncGSConnection, email: str
+    ) -> "SessionState":
+        """Capture the state of a logged in connection."""
+        cookies = [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+            }
+            for cookie in connection.client.cookies.jar
+        ]
+        return cls(
+            email=email,
+            gradescope_base_url=connection.gradescope_base_url,
+            cookies=cookies,
+            csrf_token=connection.client.headers.get(CSRF_HEADER),
+        )
+
+    def to_connection(
+        self,
+        transport: httpx.AsyncBaseTransport | None = None,
+        transport_policy: TransportPolicy | None = None,
+        tracer: Tracer | None = None,
+    ) -> AsyncGSConnection:
+        """Build a logged in connection from the state. Must be called inside a running event loop.
+
+        Args:
+            transport (httpx.AsyncBaseTransport | None, optional): See `AsyncGSConnection`.
+            transport_policy (TransportPolicy | None, optional): See `AsyncGSConnection`.
+            tracer (Tracer | None, optional): See `AsyncGSConnection`.
+        """
+        connection = AsyncGSConnection(
+            self.gradescope_base_url,
+            transport=transport,
+            transport_policy=transport_policy,
+            tracer=tracer,
+        )
+        for cookie in self.cookies:
+            connection.client.cookies.set(**cookie)
+        if self.csrf_token is not None:
+            connection.client.headers[CSRF_HEADER] = self.csrf_token
+        connection._logged_in()
+        return connection
+
+    def same_credentials(self, other: "SessionState") -> bool:
+        """Whether both states log in the same way, ignoring when they were last used.
+
+        Every page carries a differently masked CSRF token, but all of them stay valid for as
+        long as the session cookie is unchanged, so only the cookies are compared.
+        """
+        return self.cookies == other.cookies
+
+    def to_json(self) -> str:
+        state = asdict(self)
+        state["last_active"] = self.last_active.isoformat()
+        return json.dumps(state)
+
+    @classmethod
+    def from_json(cls, data: str) -> "SessionState":
+        state = json.loads(data)
+        state["last_active"] = datetime.fromisoformat(state["last_active"])
+        return cls(**state)
+
+
+@dataclass
+class SessionStats:
+    """Counters of the sessions a store removed by itself (in this process)."""
+
+    expired: int = 0
+    evicted: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record(self, expired: int = 0, evicted: int = 0) -> None:
+        with self._lock:
+            self.expired += expired
+            self.evicted += evicted
+
+
+class MemorySessionStore:
+    """Sessions kept in the memory of one process.
+
+    Args:
+        max_sessions (int | None, optional): Maximum number of sessions. Setting a new session
+            beyond it removes the least recently active ones. Defaults to None (no limit).
+    """
+
+    def __init__(self, max_sessions: int | None = None):
+        self.max_sessions = max_sessions
+        self.stats = SessionStats()
+        # least recently active first, the order in which max_sessions evicts them
+        self._sessions: OrderedDict[str, SessionState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> SessionState | None:
+        with self._lock:
+            return self._sessions.get(token)
+
+    def set(self, token: str, state: SessionState) -> list[str]:
+        """Store a session, as the most recently active one if it is new or was active since.
+
+        Returns:
+            list: Tokens of the sessions removed to stay within max_sessions.
+        """
+        evicted = []
+        with self._lock:
+            previous = self._sessions.get(token)
+            self._sessions[token] = state
+            # e.g. new cookies with the same last_active keep the session where it is
+            if previous is None or state.last_active > previous.last_active:
+                self._sessions.move_to_end(token)
+            while (
+                self.max_sessions is not None
+                and len(self._sessions) > self.max_sessions
+            ):
+                evicted.append(self._sessions.popitem(last=False)[0])
+        self.stats.record(evicted=len(evicted))
+        return evicted
+
+    def delete_inactive(self, before: datetime) -> list[str]:
+        """Remove the sessions last active before a time, and return their tokens."""
+        with self._lock:
+            # a session set with an older last_active than others may be anywhere in the order
+            expired = [
+                token
+                for token, state in self._sessions.items()
+                if state.last_active < before
+            ]
+            for token in expired:
+                del self._sessions[token]
+        self.stats.record(expired=len(expired))
+        return expired
+
+    def delete(self, token: str) -> None:
+        with self._lock:
+            self._sessions.pop(token, None)
+
+    def items(self) -> list[tuple[str, SessionState]]:
+        with self._lock:
+            return list(self._sessions.items())
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class SQLiteSessionStore:
+    """Sessions kept in a SQLite database, shared by every process that opens it.
+
+    Args:
+        path (str): Path of the database file. Created if it doesn't exist.
+        max_sessions (int | None, optional): See `MemorySessionStore`. Defaults to None (no limit).
+    """
+
+    def __init__(self, path: str, max_sessions: int | None = None):
+        self.path = path
+        self.max_sessions = max_sessions
+        self.stats = SessionStats()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            # other workers write to the same file
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    token TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    last_active REAL NOT NULL
+                )
+                """
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS sessions_last_active ON sessions (last_active)"
+            )
+
+    def get(self, token: str) -> SessionState | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT state FROM sessions WHERE token = ?", (token,)
+            ).fetchone()
+        return SessionState.from_json(row[0]) if row is not None else None
+
+    def set(self, token: str, state: SessionState) -> list[str]:
+        """Store a session. See `MemorySessionStore.set`."""
+        evicted = []
+        with self._lock, self._db:
+            is_new = (
+                self._db.execute(
+                    "SELECT 1 FROM sessions WHERE token = ?", (token,)
+                ).fetchone()
+                is None
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                (token, state.to_json(), state.last_active.timestamp()),
+            )
+            # only new sessions can go over the limit, keep counting off the hot path
+            if is_new and self.max_sessions is not None:
+                (count,) = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()
+                evicted = self._delete(
+                    "SELECT token FROM sessions ORDER BY last_active LIMIT ?",
+                    (max(count - self.max_sessions, 0),),
+                )
+        self.stats.record(evicted=len(evicted))
+        return evicted
+
+    def delete_inactive(self, before: datetime) -> list[str]:
+        """Remove the sessions last active before a time, and return their tokens."""
+        with self._lock, self._db:
+            expired = self._delete(
+                "SELECT token FROM sessions WHERE last_active < ?",
+                (before.timestamp(),),
+            )
+        self.stats.record(expired=len(expired))
+        return expired
+
+    def _delete(self, select: str, parameters: tuple) -> list[str]:
+        tokens = [token for (token,) in self._db.execute(select, parameters)]
+        self._db.executemany(
+            "DELETE FROM sessions WHERE token = ?", [(token,) for token in tokens]
+        )
+        return tokens
+
+    def delete(self, token: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+    def items(self) -> list[tuple[str, SessionState]]:
+        with self._lock:
+            rows = self._db.execute("SELECT token, state FROM sessions").fetchall()
+        return [(token, SessionState.from_json(state)) for token, state in rows]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
@@ -1,10 +1,23 @@
 import json
 
-import dateutil.parser
 import requests
+from bs4 import SoupStrainer
 
-from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL, DEFAULT_PARSER_BACKEND
+from gradescopeapi.classes._helpers._parser_helpers import (
+    css_class_pattern,
+    get_react_props,
+    make_soup,
+    parse_date,
+)
 from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.tracing import build_phase, span
+
+# the parts of the review_grades page read by get_submission_ids and get_submission_id_for_email
+SUBMISSION_LINKS_STRAINER = SoupStrainer(
+    "td", class_=css_class_pattern("table--primaryLink")
+)
+SUBMISSIONS_TABLE_STRAINER = SoupStrainer("table")
 
 
 def check_page_auth(session, endpoint):
@@ -13,6 +26,14 @@ def check_page_auth(session, endpoint):
     Returns response if otherwise good
     """
     submissions_resp = session.get(endpoint)
+    return check_response_auth(submissions_resp)
+
+
+def check_response_auth(submissions_resp):
+    """
+    Same checks as `check_page_auth` for a response that has already been fetched,
+    so that synchronous and asynchronous clients share them
+    """
     # check if page is valid, raise exception if not
     if submissions_resp.status_code == requests.codes.unauthorized:
         # check error type
@@ -22,14 +43,48 @@ def check_page_auth(session, endpoint):
             raise Exception("You are not authorized to access this page.")
         elif error_msg == "You must be logged in to access this page.":
             raise Exception("You must be logged in to access this page.")
+        raise Exception(error_msg)
     elif submissions_resp.status_code == requests.codes.not_found:
         raise Exception("Page not Found")
     elif submissions_resp.status_code == requests.codes.ok:
         return submissions_resp
+    # e.g. a 429 or 5xx that is still failing after the retries of the transport policy
+    raise RuntimeError(
+        f"Failed to get {submissions_resp.url}. Status code: {submissions_resp.status_code}"
+    )
+
+
+def get_assignments_info(coursepage_soup):
+    """
+    Scrape all assignments from a course page, for either an instructor or a student
+    """
+    # two different helper functions to parse assignment info
+    # webpage html structure differs based on if user if instructor or student
+    assignment_info_list = get_assignments_instructor_view(coursepage_soup)
+    if not assignment_info_list:
+        assignment_info_list = get_assignments_student_view(coursepage_soup)
+
+    return assignment_info_list
+
+
+def get_assignments_info_from_page(
+    coursepage_html: str | bytes, parser_backend: str = DEFAULT_PARSER_BACKEND
+):
+    """
+    Same as `get_assignments_info`, for the unparsed course page.
+    The instructor view is read straight from the page's AssignmentsTable props; the page
+    is only parsed for the student view or if the props can't be read
+    """
+    assignments_props = get_react_props(coursepage_html, "AssignmentsTable")
+    if assignments_props:
+        assignment_info_list = get_assignments_from_props(assignments_props[0])
+        if assignment_info_list:
+            return assignment_info_list
+
+    return get_assignments_info(make_soup(coursepage_html, parser_backend))
 
 
 def get_assignments_instructor_view(coursepage_soup):
-    assignments_list = []
     element_with_props = coursepage_soup.find(
         "div", {"data-react-class": "AssignmentsTable"}
     )
@@ -37,49 +92,60 @@ def get_assignments_instructor_view(coursepage_soup):
         # Extract the value of the data-react-props attribute
         props_str = element_with_props["data-react-props"]
         # Parse the JSON data
-        assignment_json = json.loads(props_str)
-
-        # Extract information for each assignment
-        for assignment in assignment_json["table_data"]:
-            # Skip non-assignment data like sections
-            if assignment.get("type", "") != "assignment":
-                continue
-
-            assignment_obj = Assignment(
-                assignment_id=assignment["url"].split("/")[-1],
-                name=assignment["title"],
-                release_date=assignment["submission_window"]["release_date"],
-                due_date=assignment["submission_window"]["due_date"],
-                late_due_date=assignment["submission_window"].get("hard_due_date"),
-                submissions_status=None,
-                grade=None,
-                max_grade=str(float(assignment["total_points"])),
-            )
+        with span("parse", "json", react_class="AssignmentsTable"):
+            assignment_json = json.loads(props_str)
+        return get_assignments_from_props(assignment_json)
+    return []
 
-            # convert to datetime objects
-            assignment_obj.release_date = (
-                dateutil.parser.parse(assignment_obj.release_date)
-                if assignment_obj.release_date
-                else assignment_obj.release_date
-            )
 
-            assignment_obj.due_date = (
-                dateutil.parser.parse(assignment_obj.due_date)
-                if assignment_obj.due_date
-                else assignment_obj.due_date
-            )
+@build_phase("Assignment")
+def get_assignments_from_props(assignment_json):
+    """
+    Build Assignments from the props of the AssignmentsTable on an instructor's course page
+    """
+    assignments_list = []
+    # Extract information for each assignment
+    for assignment in assignment_json["table_data"]:
+        # Skip non-assignment data like sections
+        if assignment.get("type", "") != "assignment":
+            continue
 
-            assignment_obj.late_due_date = (
-                dateutil.parser.parse(assignment_obj.late_due_date)
-                if assignment_obj.late_due_date
-                else assignment_obj.late_due_date
-            )
+        assignment_obj = Assignment(
+            assignment_id=assignment["url"].split("/")[-1],
+            name=assignment["title"],
+            release_date=assignment["submission_window"]["release_date"],
+            due_date=assignment["submission_window"]["due_date"],
+            late_due_date=assignment["submission_window"].get("hard_due_date"),
+            submissions_status=None,
+            grade=None,
+            max_grade=str(float(assignment["total_points"])),
+        )
+
+        # convert to datetime objects
+        assignment_obj.release_date = (
+            parse_date(assignment_obj.release_date)
+            if assignment_obj.release_date
+            else assignment_obj.release_date
+        )
 
-            # Add the assignment dictionary to the list
-            assignments_list.append(assignment_obj)
+        assignment_obj.due_date = (
+            parse_date(assignment_obj.due_date)
+            if assignment_obj.due_date
+            else assignment_obj.due_date
+        )
+
+        assignment_obj.late_due_date = (
+            parse_date(assignment_obj.late_due_date)
+            if assignment_obj.late_due_date
+            else assignment_obj.late_due_date
+        )
+
+        # Add the assignment dictionary to the list
+        assignments_list.append(assignment_obj)
     return assignments_list
 
 
+@build_phase("Assignment")
 def get_assignments_student_view(coursepage_soup):
     # parse into list of lists: Assignments[row_elements[]]
     assignment_table = []
@@ -138,13 +204,9 @@ def get_assignments_student_view(coursepage_soup):
             pass
 
         # convert to datetime objects
-        release_date = (
-            dateutil.parser.parse(release_date) if release_date else release_date
-        )
-        due_date = dateutil.parser.parse(due_date) if due_date else due_date
-        late_due_date = (
-            dateutil.parser.parse(late_due_date) if late_due_date else late_due_date
-        )
+        release_date = parse_date(release_date) if release_date else release_date
+        due_date = parse_date(due_date) if due_date else due_date
+        late_due_date = parse_date(late_due_date) if late_due_date else late_due_date
 
         # Store the extracted information in a dictionary
         assignment_obj = Assignment(
@@ -171,19 +233,76 @@ def get_submission_files(
     submission_id,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
 ):
+    file_info_link = get_submission_files_endpoint(
+        course_id, assignment_id, submission_id, gradescope_base_url
+    )
+    file_info_resp = session.get(file_info_link)
+    return get_submission_files_from_response(file_info_resp)
+
+
+def get_submission_files_endpoint(
+    course_id,
+    assignment_id,
+    submission_id,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> str:
     ASSIGNMENT_ENDPOINT = (
         f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
     )
+    return f"{ASSIGNMENT_ENDPOINT}/submissions/{submission_id}.json?content=react&only_keys[]=text_files&only_keys[]=file_comments"
 
-    file_info_link = f"{ASSIGNMENT_ENDPOINT}/submissions/{submission_id}.json?content=react&only_keys[]=text_files&only_keys[]=file_comments"
-    file_info_resp = session.get(file_info_link)
-    if file_info_resp.status_code == requests.codes.ok:
-        file_info_json = json.loads(file_info_resp.text)
-        if file_info_json.get("text_files"):
-            aws_links = []
-            for file_data in file_info_json["text_files"]:
-                aws_links.append(file_data["file"]["url"])
-        else:
-            raise NotImplementedError("Image only submissions not yet supported")
-        # TODO add support for image questions
+
+def get_submission_files_from_response(file_info_resp) -> list[str]:
+    if file_info_resp.status_code != requests.codes.ok:
+        raise RuntimeError(
+            f"Failed to get {file_info_resp.url}. Status code: {file_info_resp.status_code}"
+        )
+    file_info_json = json.loads(file_info_resp.text)
+    if file_info_json.get("text_files"):
+        aws_links = []
+        for file_data in file_info_json["text_files"]:
+            aws_links.append(file_data["file"]["url"])
+    else:
+        raise NotImplementedError("Image only submissions not yet supported")
+    # TODO add support for image questions
     return aws_links
+
+
+def get_submission_ids(submissions_soup) -> list[str]:
+    """
+    Scrape the ids of all submissions from the review_grades page of an assignment
+    """
+    # select submissions (class of td.table--primaryLink a tag, submission id stored in href link)
+    submissions_a_tags = submissions_soup.select("td.table--primaryLink a")
+    return [a_tag.attrs.get("href").split("/")[-1] for a_tag in submissions_a_tags]
+
+
+def get_submission_id_for_email(submissions_soup, student_email) -> str:
+    """
+    Scrape the id of a student's most recent submission from the review_grades page of an assignment
+    Raises:
+        Exception: "No submission found" if the student has no submission
+    """
+    td_with_email = submissions_soup.find(
+        "td", string=lambda s: student_email in str(s)
+    )
+    if td_with_email:
+        # grab submission from previous td
+        submission_td = td_with_email.find_previous_sibling()
+        # submission_td will have an anchor element as a child if there is a submission
+        a_element = submission_td.find("a")
+        if a_element:
+            return a_element.get("href").split("/")[-1]
+    raise Exception("No submission found")
+
+
+def get_graders(submissions_soup) -> set[str]:
+    """
+    Scrape the names of all graders from the submissions page of a question
+    """
+    # select graders (class of td tag, grader name stored in text)
+    graders = submissions_soup.select("td")[2::3]
+    grader_names = set(
+        [grader.text for grader in graders if grader.text]
+    )  # get non-empty grader names
+    return grader_names
@@ -1,9 +1,16 @@
 import json
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
+from gradescopeapi.classes._helpers._parser_helpers import css_class_pattern
 from gradescopeapi.classes.courses import Course
 from gradescopeapi.classes.member import Member
+from gradescopeapi.classes.tracing import build_phase
+
+# the part of the memberships page read by get_course_members
+COURSE_MEMBERS_STRAINER = SoupStrainer(
+    "table", class_=css_class_pattern("js-rosterTable")
+)
 
 
 def get_courses_info(
@@ -116,12 +123,51 @@ def get_courses_info(
     return all_courses, is_instructor
 
 
+@build_phase("Course", count=lambda courses: sum(map(len, courses.values())))
+def get_all_courses_info(soup: BeautifulSoup) -> dict[str, dict[str, Course]]:
+    """
+    Scrape both instructor and student courses from the main page of Gradescope.
+
+    Args:
+        soup (BeautifulSoup): BeautifulSoup object with parsed HTML.
+
+    Returns:
+        dict: A dictionary with keys "instructor" and "student", each mapping course IDs to Course objects.
+    """
+
+    # see if user is solely a student or instructor
+    user_courses, is_instructor = get_courses_info(soup, "Your Courses")
+
+    # if the user is indeed solely a student or instructor
+    # return the appropriate set of courses
+    if user_courses:
+        if is_instructor:
+            return {"instructor": user_courses, "student": {}}
+        else:
+            return {"instructor": {}, "student": user_courses}
+
+    # if user is both a student and instructor, get both sets of courses
+    courses = {"instructor": {}, "student": {}}
+
+    # get instructor courses
+    instructor_courses, _ = get_courses_info(soup, "Instructor Courses")
+    courses["instructor"] = instructor_courses
+
+    # get student courses
+    student_courses, _ = get_courses_info(soup, "Student Courses")
+    courses["student"] = student_courses
+
+    return courses
+
+
+@build_phase("Member")
 def get_course_members(soup: BeautifulSoup, course_id: str) -> list[Member]:
     """
     Scrape all course members from the membership page of a Gradescope course.
 
     Args:
-        soup (BeautifulSoup): BeautifulSoup object with parsed HTML.
+        soup (BeautifulSoup): BeautifulSoup object with parsed HTML. Parsing only
+            COURSE_MEMBERS_STRAINER is enough.
         course_id (str): The course ID to which the members belong.
 
     Returns:
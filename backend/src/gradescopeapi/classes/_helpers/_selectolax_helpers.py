@@ -0,0 +1,84 @@
+"""bs4 tree builder for the "selectolax" parser backend of `make_soup`.
+
+Kept apart from `_parser_helpers` because subclassing bs4's builder imports
+bs4, which `make_soup` only does when a page is parsed.
+"""
+
+from bs4 import Comment, Doctype
+from bs4.builder import HTMLTreeBuilder
+
+
+class SelectolaxTreeBuilder(HTMLTreeBuilder):
+    """bs4 tree builder that parses markup with selectolax's Lexbor parser.
+
+    Lexbor builds its own tree much faster than bs4's builders can; this builder
+    then replays that tree into `BeautifulSoup` as start tag, data and end tag
+    events, the same way the other builders do.
+    """
+
+    NAME = "selectolax"
+    ALTERNATE_NAMES = []
+    features = [NAME]
+
+    def prepare_markup(
+        self,
+        markup,
+        user_specified_encoding=None,
+        document_declared_encoding=None,
+        exclude_encodings=None,
+    ):
+        # Lexbor detects the encoding of bytes itself
+        yield (markup, None, None, False)
+
+    def feed(self, markup) -> None:
+        from selectolax.lexbor import LexborHTMLParser
+
+        document = LexborHTMLParser(markup).root
+        if document is None:
+            return
+        if document.parent is not None:
+            document = document.parent
+
+        # walk the tree iteratively, pages can nest deeper than the recursion limit
+        node = document.child
+        while node is not None:
+            if self._handle_start(node) and node.child is not None:
+                node = node.child
+                continue
+            self._handle_end(node)
+            while node.next is None:
+                node = node.parent
+                if node is None or node is document:
+                    return
+                self._handle_end(node)
+            node = node.next
+
+    def _handle_start(self, node) -> bool:
+        """Send the opening event of a node. Returns whether the node is an element."""
+        tag = node.tag
+        if tag == "-text":
+            self.soup.handle_data(node.text_content)
+            return False
+        if tag == "-comment":
+            self._handle_special(node.html[len("<!--") : -len("-->")], Comment)
+            return False
+        if tag == "-doctype":
+            self._handle_special(node.html[len("<!DOCTYPE ") : -len(">")], Doctype)
+            return False
+
+        attrs = {
+            name: "" if value is None else value
+            for name, value in node.attributes.items()
+        }
+        self.soup.handle_starttag(tag, None, None, attrs)
+        return True
+
+    def _handle_end(self, node) -> None:
+        if not node.tag.startswith("-"):
+            self.soup.endData()
+            self.soup.handle_endtag(node.tag)
+
+    def _handle_special(self, data: str, container) -> None:
+        self.soup.endData()
+        self.soup.handle_data(data)
+        self.soup.endData(container)
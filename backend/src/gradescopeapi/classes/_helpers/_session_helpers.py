@@ -0,0 +1,139 @@
+"""Export and import of the authenticated state of a connection.
+
+Logging in takes a GET of the homepage, a POST to /login that follows
+redirects and sometimes a 2FA round trip. The state it produces (the cookies,
+the X-CSRF-Token header and the base URL) is exported as a compact string, so
+that a later process can import it and check it with a single request instead.
+
+The string is zlib-compressed JSON in URL-safe base64. Given a key, it is
+encrypted with Fernet, which requires `cryptography`. A key can be made with
+`cryptography.fernet.Fernet.generate_key()`.
+"""
+
+import base64
+import json
+import time
+import zlib
+from http.cookiejar import CookieJar
+from typing import TYPE_CHECKING
+
+import requests
+from requests.cookies import create_cookie
+
+if TYPE_CHECKING:
+    import httpx
+
+# prefixes of the plain and encrypted formats, bumped if the contents change
+PLAIN_PREFIX = "gs1."
+ENCRYPTED_PREFIX = "gs1e."
+
+
+def export_session_state(
+    cookies: CookieJar,
+    csrf_token: str | None,
+    gradescope_base_url: str,
+    key: bytes | str | None = None,
+) -> str:
+    """Serialize the authenticated state of a connection.
+
+    Args:
+        cookies (CookieJar): Cookie jar of the session or client. Expired cookies are left out.
+        csrf_token (str | None): Value of the X-CSRF-Token header.
+        gradescope_base_url (str): Base URL the state belongs to.
+        key (bytes | str | None, optional): Fernet key to encrypt the state with. Defaults to None.
+
+    Returns:
+        str: The exported state.
+    """
+    now = time.time()
+    state = {
+        "url": gradescope_base_url,
+        "csrf": csrf_token,
+        "cookies": [
+            [cookie.name, cookie.value, cookie.domain, cookie.path, cookie.expires]
+            for cookie in cookies
+            if cookie.expires is None or cookie.expires > now
+        ],
+    }
+    data = zlib.compress(json.dumps(state, separators=(",", ":")).encode())
+    if key is None:
+        return PLAIN_PREFIX + base64.urlsafe_b64encode(data).decode()
+    return ENCRYPTED_PREFIX + _fernet(key).encrypt(data).decode()
+
+
+def import_session_state(
+    exported: str,
+    cookies: CookieJar,
+    gradescope_base_url: str,
+    key: bytes | str | None = None,
+) -> str | None:
+    """Load the cookies of an exported state into a cookie jar.
+
+    Args:
+        exported (str): State returned by `export_session_state`.
+        cookies (CookieJar): Cookie jar of the session or client to load the cookies into.
+        gradescope_base_url (str): Base URL of the connection, which must match the exported one.
+        key (bytes | str | None, optional): Fernet key the state was encrypted with. Defaults to None.
+
+    Returns:
+        str | None: The value of the X-CSRF-Token header.
+
+    Raises:
+        ValueError: If the state is malformed, can't be decrypted with the key, or belongs to another base URL.
+    """
+    encrypted = exported.startswith(ENCRYPTED_PREFIX)
+    if encrypted and key is None:
+        raise ValueError("The session is encrypted, a key is required")
+    if not encrypted and not exported.startswith(PLAIN_PREFIX):
+        raise ValueError("Not an exported session")
+    try:
+        if encrypted:
+            data = _fernet(key).decrypt(exported.removeprefix(ENCRYPTED_PREFIX))
+        else:
+            data = base64.urlsafe_b64decode(exported.removeprefix(PLAIN_PREFIX))
+        state = json.loads(zlib.decompress(data))
+        url, csrf_token = state["url"], state["csrf"]
+        imported = [
+            create_cookie(name, value, domain=domain, path=path, expires=expires)
+            for name, value, domain, path, expires in state["cookies"]
+        ]
+    except Exception as e:
+        # cryptography.fernet.InvalidToken, zlib.error, binascii.Error, or a state of the wrong shape
+        raise ValueError(f"Invalid exported session: {e!r}") from e
+
+    if url != gradescope_base_url:
+        raise ValueError(f"The session belongs to {url}, not {gradescope_base_url}")
+    for cookie in imported:
+        cookies.set_cookie(cookie)
+    return csrf_token
+
+
+def _fernet(key: bytes | str):
+    from cryptography.fernet import Fernet
+
+    return Fernet(key)
+
+
+def check_session(
+    session: requests.Session,
+    gradescope_base_url: str,
+) -> bool:
+    """Check with one HEAD request that the session is still logged in.
+
+    The account page answers logged in users directly and redirects everyone else to the login page.
+    """
+    response = session.head(f"{gradescope_base_url}/account", allow_redirects=False)
+    return response.status_code == requests.codes.ok
+
+
+async def check_session_async(
+    client: "httpx.AsyncClient",
+    gradescope_base_url: str,
+) -> bool:
+    """Asynchronous version of `check_session`."""
+    import httpx
+
+    response = await client.head(
+        f"{gradescope_base_url}/account", follow_redirects=False
+    )
+    return response.status_code == httpx.codes.OK
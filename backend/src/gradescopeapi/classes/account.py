@@ -1,20 +1,37 @@
-import time
+from collections.abc import Iterator
 
-from bs4 import BeautifulSoup
-
-from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL, DEFAULT_PARSER_BACKEND
 from gradescopeapi.classes._helpers._assignment_helpers import (
+    SUBMISSION_LINKS_STRAINER,
+    SUBMISSIONS_TABLE_STRAINER,
     check_page_auth,
-    get_assignments_instructor_view,
-    get_assignments_student_view,
+    get_assignments_info_from_page,
+    get_graders,
     get_submission_files,
+    get_submission_id_for_email,
+    get_submission_ids,
+)
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    run_concurrently,
 )
 from gradescopeapi.classes._helpers._course_helpers import (
+    COURSE_MEMBERS_STRAINER,
+    get_all_courses_info,
     get_course_members,
-    get_courses_info,
 )
+from gradescopeapi.classes._helpers._parser_helpers import make_soup
 from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.http_cache import cached_parse
 from gradescopeapi.classes.member import Member
+from gradescopeapi.classes.result_cache import (
+    ResultCache,
+    memoized,
+    register_result_cache,
+)
+from gradescopeapi.classes.tracing import Tracer, traced
+from gradescopeapi.classes.transport_policy import bulk_rate_limiter
 
 
 class Account:
@@ -22,10 +39,20 @@ class Account:
         self,
         session,
         gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        result_cache: ResultCache | None = None,
+        tracer: Tracer | None = None,
     ):
         self.session = session
         self.gradescope_base_url = gradescope_base_url
+        self.parser_backend = parser_backend
+        self.result_cache = result_cache
+        self.tracer = tracer
+        if result_cache is not None:
+            register_result_cache(session, result_cache)
 
+    @traced
+    @memoized
     def get_courses(self) -> dict:
         """
         Get all courses for the user, including both instructor and student courses
@@ -57,35 +84,17 @@ class Account:
 
         if response.status_code != 200:
             raise RuntimeError(
-                "Failed to access account page on Gradescope. Status code: {response.status_code}"
+                f"Failed to access account page on Gradescope. Status code: {response.status_code}"
             )
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # see if user is solely a student or instructor
-        user_courses, is_instructor = get_courses_info(soup, "Your Courses")
-
-        # if the user is indeed solely a student or instructor
-        # return the appropriate set of courses
-        if user_courses:
-            if is_instructor:
-                return {"instructor": user_courses, "student": {}}
-            else:
-                return {"instructor": {}, "student": user_courses}
+        def parse():
+            soup = make_soup(response.text, self.parser_backend)
+            return get_all_courses_info(soup)
 
-        # if user is both a student and instructor, get both sets of courses
-        courses = {"instructor": {}, "student": {}}
-
-        # get instructor courses
-        instructor_courses, _ = get_courses_info(soup, "Instructor Courses")
-        courses["instructor"] = instructor_courses
-
-        # get student courses
-        student_courses, _ = get_courses_info(soup, "Student Courses")
-        courses["student"] = student_courses
-
-        return courses
+        return cached_parse(response, "courses", parse)
 
+    @traced
+    @memoized
     def get_course_users(self, course_id: str) -> list[Member]:
         """
         Get a list of all users in a course
@@ -107,18 +116,23 @@ class Account:
 
         session = self.session
 
-        try:
-            # scrape page
-            membership_resp = check_page_auth(session, membership_endpoint)
-            membership_soup = BeautifulSoup(membership_resp.text, "html.parser")
+        # scrape page
+        membership_resp = check_page_auth(session, membership_endpoint)
+
+        def parse():
+            membership_soup = make_soup(
+                membership_resp.text,
+                self.parser_backend,
+                parse_only=COURSE_MEMBERS_STRAINER,
+            )
 
             # get all users in the course
-            users = get_course_members(membership_soup, course_id)
+            return get_course_members(membership_soup, course_id)
 
-            return users
-        except Exception:
-            return None
+        return cached_parse(membership_resp, "course_members", parse)
 
+    @traced
+    @memoized
     def get_assignments(self, course_id: str) -> list[Assignment]:
         """
         Get a list of detailed assignment information for a course
@@ -137,21 +151,31 @@ class Account:
         session = self.session
         # scrape page
         coursepage_resp = check_page_auth(session, course_endpoint)
-        coursepage_soup = BeautifulSoup(coursepage_resp.text, "html.parser")
-
-        # two different helper functions to parse assignment info
-        # webpage html structure differs based on if user if instructor or student
-        assignment_info_list = get_assignments_instructor_view(coursepage_soup)
-        if not assignment_info_list:
-            assignment_info_list = get_assignments_student_view(coursepage_soup)
-
-        return assignment_info_list
+        return cached_parse(
+            coursepage_resp,
+            "assignments",
+            lambda: get_assignments_info_from_page(
+                coursepage_resp.content, self.parser_backend
+            ),
+        )
 
+    @traced
     def get_assignment_submissions(
-        self, course_id: str, assignment_id: str
+        self,
+        course_id: str,
+        assignment_id: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
     ) -> dict[str, list[str]]:
         """
         Get a list of dicts mapping AWS links for all submissions to each submission id
+        Args:
+            course_id (str): The ID of the course.
+            assignment_id (str): The ID of the assignment.
+            max_workers (int, optional): Number of submissions fetched at once. Defaults to DEFAULT_MAX_WORKERS.
+            requests_per_second (float | None, optional): Rate limit shared by all workers, used only when
+                the `TransportPolicy` of the session has none. None for no limit. Defaults to
+                DEFAULT_REQUESTS_PER_SECOND.
         Returns:
             dict: A dictionary of submissions, where the keys are the submission ids and the values are
             a list of aws links to the submission pdf
@@ -173,31 +197,94 @@ class Account:
                 "Image only submissions not yet supported": assignment is image submission only, which is not yet supported
         NOTE:
         1. Image submissions not supports, need to find an endpoint to retrieve image pdfs
-        2. Not recommended for use, since this makes a GET request for every submission -> very slow!
+        2. This makes a GET request for every submission, so it is slow for large assignments even
+           when run concurrently. Use `iter_assignment_submissions` to process submissions as they arrive.
         3. so far only accessible for teachers, not for students to get submissions to an assignment
         """
+        submission_ids = self._get_submission_ids(course_id, assignment_id)
+        submission_links = dict(
+            self._fetch_submission_files(
+                course_id,
+                assignment_id,
+                submission_ids,
+                max_workers,
+                requests_per_second,
+            )
+        )
+        # keep the order of the review_grades page
+        return {
+            submission_id: submission_links[submission_id]
+            for submission_id in submission_ids
+        }
+
+    def iter_assignment_submissions(
+        self,
+        course_id: str,
+        assignment_id: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+    ) -> Iterator[tuple[str, list[str]]]:
+        """
+        Stream the AWS links for all submissions to an assignment as each submission is fetched.
+        Takes the same arguments and raises the same exceptions as `get_assignment_submissions`.
+        Yields:
+            tuple: `(submission_id, aws_links)` pairs in the order the fetches finish.
+        NOTE: Stopping iteration early cancels the fetches that have not started yet.
+        """
+        submission_ids = self._get_submission_ids(course_id, assignment_id)
+        yield from self._fetch_submission_files(
+            course_id,
+            assignment_id,
+            submission_ids,
+            max_workers,
+            requests_per_second,
+        )
+
+    def _get_submission_ids(self, course_id: str, assignment_id: str) -> list[str]:
+        """Scrape the ids of all submissions from the review_grades page of an assignment."""
         ASSIGNMENT_ENDPOINT = f"{self.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
         ASSIGNMENT_SUBMISSIONS_ENDPOINT = f"{ASSIGNMENT_ENDPOINT}/review_grades"
         if not course_id or not assignment_id:
             raise Exception("One or more invalid parameters")
         session = self.session
         submissions_resp = check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
-        submissions_soup = BeautifulSoup(submissions_resp.text, "html.parser")
-        # select submissions (class of td.table--primaryLink a tag, submission id stored in href link)
-        submissions_a_tags = submissions_soup.select("td.table--primaryLink a")
-        submission_ids = [
-            a_tag.attrs.get("href").split("/")[-1] for a_tag in submissions_a_tags
-        ]
-        submission_links = {}
-        for submission_id in submission_ids:  # doesn't support image submissions yet
-            aws_links = get_submission_files(
-                session, course_id, assignment_id, submission_id
+
+        def parse():
+            submissions_soup = make_soup(
+                submissions_resp.text,
+                self.parser_backend,
+                parse_only=SUBMISSION_LINKS_STRAINER,
             )
-            submission_links[submission_id] = aws_links
-            # sleep for 0.1 seconds to avoid sending too many requests to gradescope
-            time.sleep(0.1)
-        return submission_links
+            return get_submission_ids(submissions_soup)
 
+        return cached_parse(submissions_resp, "submission_ids", parse)
+
+    def _fetch_submission_files(
+        self,
+        course_id: str,
+        assignment_id: str,
+        submission_ids: list[str],
+        max_workers: int,
+        requests_per_second: float | None,
+    ) -> Iterator[tuple[str, list[str]]]:
+        """Fetch the files of many submissions concurrently, yielding them as they finish."""
+        rate_limiter = bulk_rate_limiter(
+            self.session, self.gradescope_base_url, requests_per_second
+        )
+
+        def fetch(submission_id: str) -> list[str]:
+            # doesn't support image submissions yet
+            return get_submission_files(
+                self.session,
+                course_id,
+                assignment_id,
+                submission_id,
+                self.gradescope_base_url,
+            )
+
+        return run_concurrently(fetch, submission_ids, max_workers, rate_limiter)
+
+    @traced
     def get_assignment_submission(
         self, student_email: str, course_id: str, assignment_id: str
     ) -> list[str]:
@@ -228,27 +315,30 @@ class Account:
             raise Exception("One or more invalid parameters")
         session = self.session
         submissions_resp = check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
-        submissions_soup = BeautifulSoup(submissions_resp.text, "html.parser")
-        td_with_email = submissions_soup.find(
-            "td", string=lambda s: student_email in str(s)
-        )
-        if td_with_email:
-            # grab submission from previous td
-            submission_td = td_with_email.find_previous_sibling()
-            # submission_td will have an anchor element as a child if there is a submission
-            a_element = submission_td.find("a")
-            if a_element:
-                submission_id = a_element.get("href").split("/")[-1]
-            else:
-                raise Exception("No submission found")
-            # call get_submission_files helper function
-            aws_links = get_submission_files(
-                session, course_id, assignment_id, submission_id
+
+        def parse():
+            submissions_soup = make_soup(
+                submissions_resp.text,
+                self.parser_backend,
+                parse_only=SUBMISSIONS_TABLE_STRAINER,
             )
-            return aws_links
-        else:
-            raise Exception("No submission found")
+            return get_submission_id_for_email(submissions_soup, student_email)
 
+        submission_id = cached_parse(
+            submissions_resp, f"submission_id:{student_email}", parse
+        )
+        # call get_submission_files helper function
+        aws_links = get_submission_files(
+            session,
+            course_id,
+            assignment_id,
+            submission_id,
+            self.gradescope_base_url,
+        )
+        return aws_links
+
+    @traced
+    @memoized
     def get_assignment_graders(self, course_id: str, question_id: str) -> set[str]:
         """
         Get a set of graders for a specific question in an assignment
@@ -275,10 +365,9 @@ class Account:
             raise Exception("One or more invalid parameters")
         session = self.session
         submissions_resp = check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
-        submissions_soup = BeautifulSoup(submissions_resp.text, "html.parser")
-        # select graders (class of td tag, grader name stored in text)
-        graders = submissions_soup.select("td")[2::3]
-        grader_names = set(
-            [grader.text for grader in graders if grader.text]
-        )  # get non-empty grader names
-        return grader_names
+
+        def parse():
+            submissions_soup = make_soup(submissions_resp.text, self.parser_backend)
+            return get_graders(submissions_soup)
+
+        return cached_parse(submissions_resp, "graders", parse)
@@ -1,13 +1,31 @@
 """Functions for modifying assignment details."""
 
 import datetime
+from collections.abc import Awaitable, Callable, Mapping
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import requests
-from bs4 import BeautifulSoup
-from requests_toolbelt.multipart.encoder import MultipartEncoder
 
-from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL, DEFAULT_PARSER_BACKEND
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    SingleFlight,
+    run_concurrently,
+    run_concurrently_async,
+)
+from gradescopeapi.classes._helpers._csrf_helpers import (
+    fetch_csrf_token,
+    fetch_csrf_token_async,
+    send_with_csrf_token,
+    send_with_csrf_token_async,
+)
+from gradescopeapi.classes.result_cache import invalidate_assignment
+from gradescopeapi.classes.transport_policy import bulk_rate_limiter
+
+if TYPE_CHECKING:
+    import httpx
 
 
 @dataclass
@@ -30,6 +48,7 @@ def update_assignment_date(
     due_date: datetime.datetime | None = None,
     late_due_date: datetime.datetime | None = None,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
 ):
     """Update the dates of an assignment on Gradescope.
 
@@ -48,6 +67,31 @@ def update_assignment_date(
     Returns:
         bool: True if the assignment dates were successfully updated, False otherwise.
     """
+    GS_EDIT_ASSIGNMENT_ENDPOINT = (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/edit"
+    )
+    return _post_assignment_dates(
+        session,
+        course_id,
+        assignment_id,
+        release_date,
+        due_date,
+        late_due_date,
+        gradescope_base_url,
+        fetch_csrf_token(session, GS_EDIT_ASSIGNMENT_ENDPOINT, parser_backend),
+    )
+
+
+def _post_assignment_dates(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    release_date: datetime.datetime | None,
+    due_date: datetime.datetime | None,
+    late_due_date: datetime.datetime | None,
+    gradescope_base_url: str,
+    fetch_token: Callable[[], str],
+) -> bool:
     GS_EDIT_ASSIGNMENT_ENDPOINT = (
         f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/edit"
     )
@@ -55,37 +99,299 @@ def update_assignment_date(
         f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
     )
 
-    # Get auth token
-    response = session.get(GS_EDIT_ASSIGNMENT_ENDPOINT)
-    soup = BeautifulSoup(response.text, "html.parser")
-    auth_token = soup.select_one('input[name="authenticity_token"]')["value"]
-
-    # Setup multipart form data
-    multipart = MultipartEncoder(
-        fields={
-            "utf8": "✓",
-            "_method": "patch",
-            "authenticity_token": auth_token,
-            "assignment[release_date_string]": (
-                release_date.strftime("%Y-%m-%dT%H:%M") if release_date else ""
-            ),
-            "assignment[due_date_string]": (
-                due_date.strftime("%Y-%m-%dT%H:%M") if due_date else ""
-            ),
-            "assignment[allow_late_submissions]": "1" if late_due_date else "0",
-            "assignment[hard_due_date_string]": (
-                late_due_date.strftime("%Y-%m-%dT%H:%M") if late_due_date else ""
-            ),
-            "commit": "Save",
+    def send(auth_token: str):
+        from requests_toolbelt.multipart.encoder import MultipartEncoder
+
+        # Setup multipart form data
+        multipart = MultipartEncoder(
+            fields=_assignment_date_fields(
+                auth_token, release_date, due_date, late_due_date
+            )
+        )
+        headers = {
+            "Content-Type": multipart.content_type,
+            "Referer": GS_EDIT_ASSIGNMENT_ENDPOINT,
         }
+        return session.post(
+            GS_POST_ASSIGNMENT_ENDPOINT, data=multipart, headers=headers
+        )
+
+    # Use the cached auth token, only getting a page for one if needed
+    response = send_with_csrf_token(session, fetch_token, send)
+    invalidate_assignment(session, course_id, assignment_id)
+
+    return response.status_code == 200
+
+
+async def update_assignment_date_async(
+    client: "httpx.AsyncClient",
+    course_id: str,
+    assignment_id: str,
+    release_date: datetime.datetime | None = None,
+    due_date: datetime.datetime | None = None,
+    late_due_date: datetime.datetime | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+):
+    """Update the dates of an assignment on Gradescope. Asynchronous version of `update_assignment_date`.
+
+    Args:
+        client (httpx.AsyncClient): The client object for making HTTP requests.
+        course_id (str): The ID of the course.
+        assignment_id (str): The ID of the assignment.
+        release_date (datetime.datetime | None, optional): The release date of the assignment. Defaults to None.
+        due_date (datetime.datetime | None, optional): The due date of the assignment. Defaults to None.
+        late_due_date (datetime.datetime | None, optional): The late due date of the assignment. Defaults to None.
+
+    Returns:
+        bool: True if the assignment dates were successfully updated, False otherwise.
+    """
+    GS_EDIT_ASSIGNMENT_ENDPOINT = (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/edit"
+    )
+    return await _post_assignment_dates_async(
+        client,
+        course_id,
+        assignment_id,
+        release_date,
+        due_date,
+        late_due_date,
+        gradescope_base_url,
+        fetch_csrf_token_async(client, GS_EDIT_ASSIGNMENT_ENDPOINT, parser_backend),
     )
-    headers = {
-        "Content-Type": multipart.content_type,
-        "Referer": GS_EDIT_ASSIGNMENT_ENDPOINT,
-    }
 
-    response = session.post(
-        GS_POST_ASSIGNMENT_ENDPOINT, data=multipart, headers=headers
+
+async def _post_assignment_dates_async(
+    client: "httpx.AsyncClient",
+    course_id: str,
+    assignment_id: str,
+    release_date: datetime.datetime | None,
+    due_date: datetime.datetime | None,
+    late_due_date: datetime.datetime | None,
+    gradescope_base_url: str,
+    fetch_token: Callable[[], Awaitable[str]],
+) -> bool:
+    GS_EDIT_ASSIGNMENT_ENDPOINT = (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/edit"
+    )
+    GS_POST_ASSIGNMENT_ENDPOINT = (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
     )
 
+    async def send(auth_token: str) -> "httpx.Response":
+        # Send as multipart form data: (None, value) marks a field without a filename
+        fields = _assignment_date_fields(
+            auth_token, release_date, due_date, late_due_date
+        )
+        return await client.post(
+            GS_POST_ASSIGNMENT_ENDPOINT,
+            files={name: (None, value) for name, value in fields.items()},
+            headers={"Referer": GS_EDIT_ASSIGNMENT_ENDPOINT},
+        )
+
+    # Use the cached auth token, only getting a page for one if needed
+    response = await send_with_csrf_token_async(client, fetch_token, send)
+    invalidate_assignment(client, course_id, assignment_id)
+
     return response.status_code == 200
+
+
+@dataclass
+class AssignmentDateChange:
+    """New dates for an assignment from `shift_assignment_dates`.
+
+    `status` is "planned" for a dry run, then "updated" or "failed" with the reason in `error`.
+    """
+
+    assignment: Assignment
+    release_date: datetime.datetime | None
+    due_date: datetime.datetime | None
+    late_due_date: datetime.datetime | None
+    status: str = "planned"
+    error: str | None = None
+
+
+def shift_assignment_dates(
+    session: requests.Session,
+    course_id: str,
+    shift: datetime.timedelta | Mapping[str, datetime.timedelta],
+    dry_run: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+) -> list[AssignmentDateChange]:
+    """Move the release, due and late due dates of the assignments of a course.
+
+    The current dates are read once from the course page, and the assignments are updated
+    concurrently. The dates keep their wall clock time in the course's timezone, so a due
+    date at 11:59 PM is still at 11:59 PM after a shift across a daylight saving change.
+
+    Args:
+        session (requests.Session): The session object for making HTTP requests.
+        course_id (str): The ID of the course.
+        shift (datetime.timedelta | Mapping[str, datetime.timedelta]): How much to move the dates
+            of every assignment, or of each assignment by ID. Other assignments are left as they are.
+        dry_run (bool, optional): Only return the planned changes, without updating anything. Defaults to False.
+        max_workers (int, optional): Maximum number of concurrent updates. Defaults to DEFAULT_MAX_WORKERS.
+        requests_per_second (float | None, optional): Rate limit shared by all workers, used only when
+            the `TransportPolicy` of the session has none. None for no limit. Defaults to
+            DEFAULT_REQUESTS_PER_SECOND.
+
+    Returns:
+        list[AssignmentDateChange]: The change of every assignment that moves, in the order of the course page.
+
+    Raises:
+        ValueError: If `shift` maps an assignment that is not in the course.
+    """
+    # account.py imports this module for Assignment
+    from gradescopeapi.classes.account import Account
+
+    assignments = Account(session, gradescope_base_url, parser_backend).get_assignments(
+        course_id
+    )
+    changes = _plan_date_shift(course_id, assignments, shift)
+    if dry_run:
+        return changes
+
+    # the course page refreshed the cached token, one fetch is shared if it is rejected
+    token_fetches = SingleFlight()
+    GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
+    fetch_token = fetch_csrf_token(session, GS_COURSE_ENDPOINT, parser_backend)
+
+    def send(change: AssignmentDateChange) -> bool | Exception:
+        try:
+            return _post_assignment_dates(
+                session,
+                course_id,
+                change.assignment.assignment_id,
+                change.release_date,
+                change.due_date,
+                change.late_due_date,
+                gradescope_base_url,
+                lambda: token_fetches.do(course_id, fetch_token),
+            )
+        except Exception as e:
+            return e
+
+    rate_limiter = bulk_rate_limiter(session, gradescope_base_url, requests_per_second)
+    for change, sent in run_concurrently(send, changes, max_workers, rate_limiter):
+        _record_date_change(change, sent)
+    return changes
+
+
+async def shift_assignment_dates_async(
+    client: "httpx.AsyncClient",
+    course_id: str,
+    shift: datetime.timedelta | Mapping[str, datetime.timedelta],
+    dry_run: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+) -> list[AssignmentDateChange]:
+    """Asynchronous version of `shift_assignment_dates`."""
+    # async_account.py imports this module for Assignment
+    from gradescopeapi.classes.async_account import AsyncAccount
+
+    assignments = await AsyncAccount(
+        client, gradescope_base_url, parser_backend
+    ).get_assignments(course_id)
+    changes = _plan_date_shift(course_id, assignments, shift)
+    if dry_run:
+        return changes
+
+    token_fetches = SingleFlight()
+    GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
+    fetch_token = fetch_csrf_token_async(client, GS_COURSE_ENDPOINT, parser_backend)
+
+    async def send(change: AssignmentDateChange) -> bool | Exception:
+        try:
+            return await _post_assignment_dates_async(
+                client,
+                course_id,
+                change.assignment.assignment_id,
+                change.release_date,
+                change.due_date,
+                change.late_due_date,
+                gradescope_base_url,
+                lambda: token_fetches.do_async(course_id, fetch_token),
+            )
+        except Exception as e:
+            return e
+
+    rate_limiter = bulk_rate_limiter(client, gradescope_base_url, requests_per_second)
+    async for change, sent in run_concurrently_async(
+        send, changes, max_workers, rate_limiter
+    ):
+        _record_date_change(change, sent)
+    return changes
+
+
+def _plan_date_shift(
+    course_id: str,
+    assignments: list[Assignment],
+    shift: datetime.timedelta | Mapping[str, datetime.timedelta],
+) -> list[AssignmentDateChange]:
+    if isinstance(shift, Mapping):
+        unknown = set(shift) - {assignment.assignment_id for assignment in assignments}
+        if unknown:
+            raise ValueError(
+                f"Assignments {', '.join(sorted(unknown))} are not in course {course_id}"
+            )
+
+    def shifted(date: datetime.datetime | None, delta: datetime.timedelta):
+        return None if date is None else date + delta
+
+    changes = []
+    for assignment in assignments:
+        if isinstance(shift, Mapping):
+            delta = shift.get(assignment.assignment_id)
+        else:
+            delta = shift
+        dates = [
+            assignment.release_date,
+            assignment.due_date,
+            assignment.late_due_date,
+        ]
+        # nothing to move for assignments without dates
+        if not delta or not any(dates):
+            continue
+        changes.append(
+            AssignmentDateChange(assignment, *(shifted(date, delta) for date in dates))
+        )
+    return changes
+
+
+def _record_date_change(change: AssignmentDateChange, sent: bool | Exception) -> None:
+    if isinstance(sent, Exception):
+        change.status, change.error = "failed", f"{type(sent).__name__}: {sent}"
+    elif not sent:
+        change.status, change.error = "failed", "Gradescope rejected the new dates"
+    else:
+        change.status = "updated"
+
+
+def _assignment_date_fields(
+    auth_token: str,
+    release_date: datetime.datetime | None,
+    due_date: datetime.datetime | None,
+    late_due_date: datetime.datetime | None,
+) -> dict[str, str]:
+    """Build the form fields for the edit assignment endpoint."""
+    return {
+        "utf8": "✓",
+        "_method": "patch",
+        "authenticity_token": auth_token,
+        "assignment[release_date_string]": (
+            release_date.strftime("%Y-%m-%dT%H:%M") if release_date else ""
+        ),
+        "assignment[due_date_string]": (
+            due_date.strftime("%Y-%m-%dT%H:%M") if due_date else ""
+        ),
+        "assignment[allow_late_submissions]": "1" if late_due_date else "0",
+        "assignment[hard_due_date_string]": (
+            late_due_date.strftime("%Y-%m-%dT%H:%M") if late_due_date else ""
+        ),
+        "commit": "Save",
+    }
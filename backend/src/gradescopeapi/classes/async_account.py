@@ -0,0 +1,269 @@
+from collections.abc import AsyncIterator
+
+import httpx
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL, DEFAULT_PARSER_BACKEND
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    SUBMISSION_LINKS_STRAINER,
+    SUBMISSIONS_TABLE_STRAINER,
+    check_response_auth,
+    get_assignments_info_from_page,
+    get_graders,
+    get_submission_files_endpoint,
+    get_submission_files_from_response,
+    get_submission_id_for_email,
+    get_submission_ids,
+)
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    run_concurrently_async,
+)
+from gradescopeapi.classes._helpers._course_helpers import (
+    COURSE_MEMBERS_STRAINER,
+    get_all_courses_info,
+    get_course_members,
+)
+from gradescopeapi.classes._helpers._parser_helpers import make_soup
+from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.member import Member
+from gradescopeapi.classes.tracing import Tracer, traced
+from gradescopeapi.classes.transport_policy import bulk_rate_limiter
+
+
+class AsyncAccount:
+    """Asynchronous version of `Account`.
+
+    Every method mirrors the `Account` method of the same name, takes the same
+    arguments, returns the same objects and raises the same exceptions.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        tracer: Tracer | None = None,
+    ):
+        self.client = client
+        self.gradescope_base_url = gradescope_base_url
+        self.parser_backend = parser_backend
+        self.tracer = tracer
+
+    async def _check_page_auth(self, endpoint: str):
+        return check_response_auth(await self.client.get(endpoint))
+
+    @traced
+    async def get_courses(self) -> dict:
+        """
+        Get all courses for the user, including both instructor and student courses
+
+        Returns:
+            dict: A dictionary of dictionaries, where keys are "instructor" and "student" and values are
+            dictionaries containing all courses, where keys are course IDs and values are Course objects.
+
+        Raises:
+            RuntimeError: If request to account page fails.
+        """
+
+        endpoint = f"{self.gradescope_base_url}/account"
+
+        # get main page
+        response = await self.client.get(endpoint)
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Failed to access account page on Gradescope. Status code: {response.status_code}"
+            )
+
+        soup = make_soup(response.text, self.parser_backend)
+
+        return get_all_courses_info(soup)
+
+    @traced
+    async def get_course_users(self, course_id: str) -> list[Member]:
+        """
+        Get a list of all users in a course
+        Returns:
+            list: A list of users in the course (Member objects)
+        Raises:
+            Exceptions:
+            "One or more invalid parameters": if course_id is null or empty value
+            "You must be logged in to access this page.": if no user is logged in
+        """
+
+        membership_endpoint = (
+            f"{self.gradescope_base_url}/courses/{course_id}/memberships"
+        )
+
+        # check that course_id is valid (not empty)
+        if not course_id:
+            raise Exception("Invalid Course ID")
+
+        # scrape page
+        membership_resp = await self._check_page_auth(membership_endpoint)
+        membership_soup = make_soup(
+            membership_resp.text,
+            self.parser_backend,
+            parse_only=COURSE_MEMBERS_STRAINER,
+        )
+
+        # get all users in the course
+        return get_course_members(membership_soup, course_id)
+
+    @traced
+    async def get_assignments(self, course_id: str) -> list[Assignment]:
+        """
+        Get a list of detailed assignment information for a course
+        Returns:
+            list: A list of Assignments
+        Raises:
+            Exceptions:
+            "One or more invalid parameters": if course_id or assignment_id is null or empty value
+            "You are not authorized to access this page.": if logged in user is unable to access submissions
+            "You must be logged in to access this page.": if no user is logged in
+        """
+        course_endpoint = f"{self.gradescope_base_url}/courses/{course_id}"
+        # check that course_id is valid (not empty)
+        if not course_id:
+            raise Exception("Invalid Course ID")
+        # scrape page
+        coursepage_resp = await self._check_page_auth(course_endpoint)
+        return get_assignments_info_from_page(
+            coursepage_resp.content, self.parser_backend
+        )
+
+    @traced
+    async def get_assignment_submissions(
+        self,
+        course_id: str,
+        assignment_id: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+    ) -> dict[str, list[str]]:
+        """
+        Get a list of dicts mapping AWS links for all submissions to each submission id
+        Returns:
+            dict: A dictionary of submissions, where the keys are the submission ids and the values are
+            a list of aws links to the submission pdf
+        NOTE: See `Account.get_assignment_submissions` for the arguments and exceptions.
+        """
+        submission_ids = await self._get_submission_ids(course_id, assignment_id)
+        submission_links = {}
+        async for submission_id, aws_links in self._fetch_submission_files(
+            course_id, assignment_id, submission_ids, max_workers, requests_per_second
+        ):
+            submission_links[submission_id] = aws_links
+        # keep the order of the review_grades page
+        return {
+            submission_id: submission_links[submission_id]
+            for submission_id in submission_ids
+        }
+
+    async def iter_assignment_submissions(
+        self,
+        course_id: str,
+        assignment_id: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+    ) -> AsyncIterator[tuple[str, list[str]]]:
+        """
+        Stream the AWS links for all submissions to an assignment as each submission is fetched.
+        Yields:
+            tuple: `(submission_id, aws_links)` pairs in the order the fetches finish.
+        """
+        submission_ids = await self._get_submission_ids(course_id, assignment_id)
+        async for result in self._fetch_submission_files(
+            course_id, assignment_id, submission_ids, max_workers, requests_per_second
+        ):
+            yield result
+
+    async def _get_submission_ids(
+        self, course_id: str, assignment_id: str
+    ) -> list[str]:
+        """Scrape the ids of all submissions from the review_grades page of an assignment."""
+        ASSIGNMENT_ENDPOINT = f"{self.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+        ASSIGNMENT_SUBMISSIONS_ENDPOINT = f"{ASSIGNMENT_ENDPOINT}/review_grades"
+        if not course_id or not assignment_id:
+            raise Exception("One or more invalid parameters")
+        submissions_resp = await self._check_page_auth(ASSIGNMENT_SUBMISSIONS_ENDPOINT)
+        submissions_soup = make_soup(
+            submissions_resp.text,
+            self.parser_backend,
+            parse_only=SUBMISSION_LINKS_STRAINER,
+        )
+        return get_submission_ids(submissions_soup)
+
+    async def _get_submission_files(
+        self, course_id: str, assignment_id: str, submission_id: str
+    ) -> list[str]:
+        file_info_link = get_submission_files_endpoint(
+            course_id, assignment_id, submission_id, self.gradescope_base_url
+        )
+        file_info_resp = await self.client.get(file_info_link)
+        return get_submission_files_from_response(file_info_resp)
+
+    def _fetch_submission_files(
+        self,
+        course_id: str,
+        assignment_id: str,
+        submission_ids: list[str],
+        max_workers: int,
+        requests_per_second: float | None,
+    ) -> AsyncIterator[tuple[str, list[str]]]:
+        """Fetch the files of many submissions concurrently, yielding them as they finish."""
+        rate_limiter = bulk_rate_limiter(
+            self.client, self.gradescope_base_url, requests_per_second
+        )
+
+        async def fetch(submission_id: str) -> list[str]:
+            # doesn't support image submissions yet
+            return await self._get_submission_files(
+                course_id, assignment_id, submission_id
+            )
+
+        return run_concurrently_async(fetch, submission_ids, max_workers, rate_limiter)
+
+    @traced
+    async def get_assignment_submission(
+        self, student_email: str, course_id: str, assignment_id: str
+    ) -> list[str]:
+        """
+        Get a list of aws links to files of the student's most recent submission to an assignment
+        Returns:
+            list: A list of aws links as strings
+        NOTE: See `Account.get_assignment_submission` for the exceptions.
+        """
+        # fetch submission id
+        ASSIGNMENT_ENDPOINT = f"{self.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+        ASSIGNMENT_SUBMISSIONS_ENDPOINT = f"{ASSIGNMENT_ENDPOINT}/review_grades"
+        if not (student_email and course_id and assignment_id):
+            raise Exception("One or more invalid parameters")
+        submissions_resp = await self._check_page_auth(ASSIGNMENT_SUBMISSIONS_ENDPOINT)
+        submissions_soup = make_soup(
+            submissions_resp.text,
+            self.parser_backend,
+            parse_only=SUBMISSIONS_TABLE_STRAINER,
+        )
+        submission_id = get_submission_id_for_email(submissions_soup, student_email)
+        return await self._get_submission_files(course_id, assignment_id, submission_id)
+
+    @traced
+    async def get_assignment_graders(
+        self, course_id: str, question_id: str
+    ) -> set[str]:
+        """
+        Get a set of graders for a specific question in an assignment
+        Returns:
+            set: A set of graders as strings
+        NOTE: See `Account.get_assignment_graders` for the exceptions.
+        """
+        QUESTION_ENDPOINT = (
+            f"{self.gradescope_base_url}/courses/{course_id}/questions/{question_id}"
+        )
+        ASSIGNMENT_SUBMISSIONS_ENDPOINT = f"{QUESTION_ENDPOINT}/submissions"
+        if not course_id or not question_id:
+            raise Exception("One or more invalid parameters")
+        submissions_resp = await self._check_page_auth(ASSIGNMENT_SUBMISSIONS_ENDPOINT)
+        submissions_soup = make_soup(submissions_resp.text, self.parser_backend)
+        return get_graders(submissions_soup)
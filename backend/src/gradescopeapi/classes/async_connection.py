@@ -0,0 +1,164 @@
+import asyncio
+import weakref
+
+import httpx
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL, DEFAULT_PARSER_BACKEND
+from gradescopeapi.classes._helpers._csrf_helpers import (
+    CSRF_HEADER,
+    install_csrf_token_hook,
+)
+from gradescopeapi.classes._helpers._login_helpers import (
+    check_login_status,
+    get_auth_token_init_gradescope_session_async,
+    login_set_session_cookies_async,
+)
+from gradescopeapi.classes._helpers._session_helpers import (
+    check_session_async,
+    export_session_state,
+    import_session_state,
+)
+from gradescopeapi.classes.async_transport_policy import PolicyTransport
+from gradescopeapi.classes.tracing import Tracer, install_tracing_hook
+from gradescopeapi.classes.transport_policy import TransportPolicy
+
+DEFAULT_TIMEOUT = httpx.Timeout(30.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# connection pools are bound to the event loop that opened them, so one pool is
+# shared by every connection created on the same loop
+_shared_transports: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_shared_transport() -> httpx.AsyncHTTPTransport:
+    """Return the connection pool shared by all AsyncGSConnections on the running event loop."""
+    loop = asyncio.get_running_loop()
+    transport = _shared_transports.get(loop)
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(limits=DEFAULT_LIMITS)
+        _shared_transports[loop] = transport
+    return transport
+
+
+class AsyncGSConnection:
+    """Asynchronous version of `GSConnection`, built on `httpx.AsyncClient`.
+
+    Each connection keeps its own cookies and headers, but by default all
+    connections on an event loop send their requests through one shared
+    connection pool. Must be created inside a running event loop.
+
+    Args:
+        gradescope_base_url (str, optional): Base URL of Gradescope. Defaults to DEFAULT_GRADESCOPE_BASE_URL.
+        transport (httpx.AsyncBaseTransport | None, optional): Transport to send requests through. It is
+            left open when the connection is closed, like the shared connection pool. Defaults to the
+            shared connection pool.
+        parser_backend (str, optional): HTML parser used to scrape pages. See `GSConnection`.
+            Defaults to DEFAULT_PARSER_BACKEND.
+        transport_policy (TransportPolicy | None, optional): See `GSConnection`. Defaults to None,
+            which uses `TransportPolicy()`.
+        tracer (Tracer | None, optional): See `GSConnection`. Defaults to None (not traced).
+    """
+
+    def __init__(
+        self,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        transport: httpx.AsyncBaseTransport | None = None,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        transport_policy: TransportPolicy | None = None,
+        tracer: Tracer | None = None,
+    ):
+        self.transport_policy = transport_policy or TransportPolicy()
+        self.client = httpx.AsyncClient(
+            # the connection didn't create the transport, so closing it leaves the transport open
+            transport=PolicyTransport(
+                transport or get_shared_transport(),
+                self.transport_policy,
+                close_transport=False,
+            ),
+            follow_redirects=True,
+            timeout=DEFAULT_TIMEOUT,
+        )
+        install_csrf_token_hook(self.client)
+        if tracer is not None:
+            install_tracing_hook(self.client, tracer)
+        self.gradescope_base_url = gradescope_base_url
+        self.parser_backend = parser_backend
+        self.tracer = tracer
+        self.logged_in = False
+        self.account = None
+
+    async def login(self, email, password, two_factor_code=None):
+        # go to homepage to parse hidden authenticity token and to set initial "_gradescope_session" cookie
+        auth_token = await get_auth_token_init_gradescope_session_async(
+            self.client, self.gradescope_base_url, self.parser_backend
+        )
+
+        # login and set cookies in client. Result bool on whether login was success
+        login_success, status = await login_set_session_cookies_async(
+            self.client,
+            email,
+            password,
+            auth_token,
+            two_factor_code,
+            self.gradescope_base_url,
+            self.parser_backend,
+        )
+
+        check_login_status(login_success, status)
+
+        if login_success:
+            self._logged_in()
+
+    def _logged_in(self):
+        # imported on login, with the scrapers and parsers it needs
+        from gradescopeapi.classes.async_account import AsyncAccount
+
+        self.logged_in = True
+        self.account = AsyncAccount(
+            self.client, self.gradescope_base_url, self.parser_backend, self.tracer
+        )
+
+    def export_session(self, key: bytes | str | None = None) -> str:
+        """Export the logged in session. See `GSConnection.export_session`."""
+        if not self.logged_in:
+            raise RuntimeError(
+                "Cannot export the session of a connection that is not logged in"
+            )
+        return export_session_state(
+            self.client.cookies.jar,
+            self.client.headers.get(CSRF_HEADER),
+            self.gradescope_base_url,
+            key,
+        )
+
+    async def import_session(
+        self, exported: str, key: bytes | str | None = None, check: bool = True
+    ) -> bool:
+        """Log in with an exported session. See `GSConnection.import_session`."""
+        csrf_token = import_session_state(
+            exported, self.client.cookies.jar, self.gradescope_base_url, key
+        )
+        if csrf_token is not None:
+            self.client.headers[CSRF_HEADER] = csrf_token
+        if check and not await self.check_session():
+            self.client.cookies.clear()
+            self.client.headers.pop(CSRF_HEADER, None)
+            return False
+        self._logged_in()
+        return True
+
+    async def check_session(self) -> bool:
+        """Check with one request that the session is still logged in on Gradescope."""
+        return await check_session_async(self.client, self.gradescope_base_url)
+
+    async def aclose(self):
+        """Close the connection, leaving its transport (e.g. the shared pool) open for other connections."""
+        await self.client.aclose()
+        self.logged_in = False
+        self.account = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,71 @@
+"""`TransportPolicy` for `httpx` clients, kept apart so that sync connections don't import httpx."""
+
+import asyncio
+
+import httpx
+
+from gradescopeapi.classes.transport_policy import TransportPolicy, _failed
+
+
+class PolicyTransport(httpx.AsyncBaseTransport):
+    """`httpx` transport that sends requests through another transport with a `TransportPolicy`.
+
+    Args:
+        transport (httpx.AsyncBaseTransport): Transport to send the requests through.
+        policy (TransportPolicy): The policy.
+        close_transport (bool, optional): Whether closing this transport closes `transport` too.
+            Defaults to True.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        policy: TransportPolicy,
+        close_transport: bool = True,
+    ):
+        self.transport = transport
+        self.policy = policy
+        self.close_transport = close_transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.netloc.decode()
+        replayable = isinstance(request.stream, httpx.ByteStream)
+        attempt = 0
+        while True:
+            delay = self.policy.reserve(host)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                delay = self.policy.retry_delay(
+                    request.method,
+                    attempt,
+                    replayable,
+                    unsent=isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)),
+                )
+                if delay is None:
+                    self.policy.record(host, failed=True)
+                    raise
+            except BaseException:
+                self.policy.release(host)
+                raise
+            else:
+                delay = self.policy.retry_delay(
+                    request.method,
+                    attempt,
+                    replayable,
+                    response.status_code,
+                    response.headers.get("Retry-After"),
+                )
+                if delay is None:
+                    self.policy.record(host, _failed(response.status_code))
+                    return response
+                await response.aclose()
+            attempt += 1
+            self.policy.stats.record(retries=1)
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        if self.close_transport:
+            await self.transport.aclose()
@@ -1,40 +1,168 @@
 import requests
+from requests.adapters import HTTPAdapter
 
-from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL, DEFAULT_PARSER_BACKEND
+from gradescopeapi.classes._helpers._csrf_helpers import (
+    CSRF_HEADER,
+    install_csrf_token_hook,
+)
 from gradescopeapi.classes._helpers._login_helpers import (
+    check_login_status,
     get_auth_token_init_gradescope_session,
     login_set_session_cookies,
 )
-from gradescopeapi.classes.account import Account
+from gradescopeapi.classes._helpers._session_helpers import (
+    check_session,
+    export_session_state,
+    import_session_state,
+)
+from gradescopeapi.classes.connection_pool import ConnectionPool
+from gradescopeapi.classes.http_cache import CachingHTTPAdapter, HTTPCache
+from gradescopeapi.classes.result_cache import ResultCache
+from gradescopeapi.classes.tracing import Tracer, install_tracing_hook
+from gradescopeapi.classes.transport_policy import PolicyAdapter, TransportPolicy
 
 
 class GSConnection:
-    def __init__(self, gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL):
+    """Connection to Gradescope using `requests`.
+
+    Args:
+        gradescope_base_url (str, optional): Base URL of Gradescope. Defaults to DEFAULT_GRADESCOPE_BASE_URL.
+        parser_backend (str, optional): HTML parser used to scrape pages: "html.parser", "lxml" or
+            "selectolax". Every backend returns the same results. Defaults to DEFAULT_PARSER_BACKEND.
+        http_cache (HTTPCache | None, optional): Revalidate pages with conditional requests and
+            reuse their cached bodies and parse results when unchanged. Defaults to None (no cache).
+        result_cache (ResultCache | None, optional): Reuse the results of `Account` methods until they
+            expire or are changed through this connection. Defaults to None (no cache).
+        transport_policy (TransportPolicy | None, optional): How requests are retried, rate limited and
+            cut off when Gradescope fails. Defaults to None, which uses `TransportPolicy()`: up to 3
+            retries with backoff, no rate limit.
+        connection_pool (ConnectionPool | None, optional): Connections to send requests over, which can be
+            shared with other `GSConnection`s. Defaults to None, which uses a new `ConnectionPool()`.
+        tracer (Tracer | None, optional): Receives a span for every request, parse and object-construction
+            phase, to see where the time of a call goes. Defaults to None (not traced).
+    """
+
+    def __init__(
+        self,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        http_cache: HTTPCache | None = None,
+        result_cache: ResultCache | None = None,
+        transport_policy: TransportPolicy | None = None,
+        connection_pool: ConnectionPool | None = None,
+        tracer: Tracer | None = None,
+    ):
         self.session = requests.Session()
+        install_csrf_token_hook(self.session)
+        if tracer is not None:
+            install_tracing_hook(self.session, tracer)
+        self.transport_policy = transport_policy or TransportPolicy()
+        adapter = (
+            HTTPAdapter() if http_cache is None else CachingHTTPAdapter(http_cache)
+        )
+        self.connection_pool = connection_pool or ConnectionPool()
+        self.connection_pool.mount(adapter)
+        adapter = PolicyAdapter(adapter, self.transport_policy)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.http_cache = http_cache
+        self.result_cache = result_cache
         self.gradescope_base_url = gradescope_base_url
+        self.parser_backend = parser_backend
+        self.tracer = tracer
         self.logged_in = False
         self.account = None
 
     def login(self, email, password, two_factor_code=None):
         # go to homepage to parse hidden authenticity token and to set initial "_gradescope_session" cookie
         auth_token = get_auth_token_init_gradescope_session(
-            self.session, self.gradescope_base_url
+            self.session, self.gradescope_base_url, self.parser_backend
         )
 
         # login and set cookies in session. Result bool on whether login was success
         login_success, status = login_set_session_cookies(
-            self.session, email, password, auth_token, two_factor_code, self.gradescope_base_url
+            self.session,
+            email,
+            password,
+            auth_token,
+            two_factor_code,
+            self.gradescope_base_url,
+            self.parser_backend,
         )
-        
-        if status == "2FA_REQUIRED":
-            raise ValueError("2FA is required for this account. Please provide a 2FA code.")
-        elif status == "INVALID_CREDENTIALS":
-            raise ValueError("Invalid credentials.")
-        elif status == "INVALID_2FA_CODE":
-            raise ValueError("Invalid 2FA code.")
-        elif not login_success:
-            raise ValueError(f"Login failed: {status}")
-            
+
+        check_login_status(login_success, status)
+
         if login_success:
-            self.logged_in = True
-            self.account = Account(self.session, self.gradescope_base_url)
+            self._logged_in()
+
+    def _logged_in(self):
+        # imported on login, with the scrapers and parsers it needs
+        from gradescopeapi.classes.account import Account
+
+        self.logged_in = True
+        self.account = Account(
+            self.session,
+            self.gradescope_base_url,
+            self.parser_backend,
+            self.result_cache,
+            self.tracer,
+        )
+
+    def export_session(self, key: bytes | str | None = None) -> str:
+        """Export the cookies and CSRF token of the logged in session, to skip logging in next time.
+
+        Args:
+            key (bytes | str | None, optional): Fernet key to encrypt the session with, see
+                `cryptography.fernet.Fernet.generate_key`. Defaults to None (not encrypted).
+
+        Returns:
+            str: The session, to pass to `import_session`. Anyone who has it is logged in as this user.
+
+        Raises:
+            RuntimeError: If the connection is not logged in.
+        """
+        if not self.logged_in:
+            raise RuntimeError(
+                "Cannot export the session of a connection that is not logged in"
+            )
+        return export_session_state(
+            self.session.cookies,
+            self.session.headers.get(CSRF_HEADER),
+            self.gradescope_base_url,
+            key,
+        )
+
+    def import_session(
+        self, exported: str, key: bytes | str | None = None, check: bool = True
+    ) -> bool:
+        """Log in with a session exported by `export_session`.
+
+        Args:
+            exported (str): The exported session.
+            key (bytes | str | None, optional): Key the session was encrypted with. Defaults to None.
+            check (bool, optional): Check that the session is still logged in with one request.
+                Defaults to True.
+
+        Returns:
+            bool: Whether the connection is logged in. If not, the imported cookies and CSRF token
+            are dropped again, call `login` instead.
+
+        Raises:
+            ValueError: If the session is malformed, can't be decrypted or belongs to another base URL.
+        """
+        csrf_token = import_session_state(
+            exported, self.session.cookies, self.gradescope_base_url, key
+        )
+        if csrf_token is not None:
+            self.session.headers[CSRF_HEADER] = csrf_token
+        if check and not self.check_session():
+            self.session.cookies.clear()
+            self.session.headers.pop(CSRF_HEADER, None)
+            return False
+        self._logged_in()
+        return True
+
+    def check_session(self) -> bool:
+        """Check with one request that the session is still logged in on Gradescope."""
+        return check_session(self.session, self.gradescope_base_url)
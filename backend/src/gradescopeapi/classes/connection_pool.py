@@ -0,0 +1,242 @@
+"""Pooled, kept alive HTTP connections for `GSConnection`.
+
+`requests` gives every session a pool of 10 connections per host and closes
+the connections that don't fit back into it, so once more threads than that
+send requests at once, most requests open a new TCP connection and do a new
+TLS handshake. A `ConnectionPool` sizes the pools for the number of threads,
+keeps idle connections alive with TCP keep-alive probes, and counts how often
+its connections are reused and how often it runs out of them.
+
+Example:
+    pool = ConnectionPool(max_connections_per_host=32)
+    connections = [GSConnection(connection_pool=pool) for _ in range(4)]
+    ...
+    print(pool.stats.reuse_ratio, pool.stats.saturated)
+
+A pool is thread-safe and can be shared by several connections, which keep
+their own cookies but send their requests over the same connections. Every
+connection also shares the TLS context `requests` loads once per process, so
+a new connection does not read the CA bundle again.
+"""
+
+import socket
+import threading
+from dataclasses import dataclass, field
+
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, PoolManager
+from urllib3.connection import HTTPConnection
+
+DEFAULT_MAX_HOSTS = 10
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 20
+DEFAULT_KEEPALIVE_IDLE = 60
+DEFAULT_KEEPALIVE_INTERVAL = 15
+
+
+@dataclass
+class PoolStats:
+    """Counters of a pool, to size it and check that its connections are reused."""
+
+    requests: int = 0
+    reused: int = 0
+    saturated: int = 0
+    discarded: int = 0
+    peak_in_use: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record(
+        self,
+        requests: int = 0,
+        reused: int = 0,
+        saturated: int = 0,
+        discarded: int = 0,
+        in_use: int = 0,
+    ) -> None:
+        with self._lock:
+            self.requests += requests
+            self.reused += reused
+            self.saturated += saturated
+            self.discarded += discarded
+            self.peak_in_use = max(self.peak_in_use, in_use)
+
+    @property
+    def connections(self) -> int:
+        """Number of requests that opened a new connection (a TCP and TLS handshake)."""
+        return self.requests - self.reused
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused / self.requests if self.requests else 0.0
+
+
+class _TrackedPoolMixin:
+    """Records the checkouts of a urllib3 connection pool in `PoolStats`."""
+
+    stats: PoolStats
+
+    def _get_conn(self, timeout=None):
+        # every connection of the host is in use: wait for one, or open one
+        # that won't fit back into the pool
+        saturated = self.pool is not None and self.pool.empty()
+        conn = super()._get_conn(timeout)
+        # connections are opened lazily, so only a reused one has a socket
+        reused = getattr(conn, "sock", None) is not None
+        in_use = self.pool.maxsize - self.pool.qsize() if self.pool is not None else 0
+        self.stats.record(
+            requests=1, reused=int(reused), saturated=int(saturated), in_use=in_use
+        )
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None and self.pool is not None and self.pool.full():
+            self.stats.record(discarded=1)
+        super()._put_conn(conn)
+
+
+class _TrackedHTTPConnectionPool(_TrackedPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _TrackedHTTPSConnectionPool(_TrackedPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _SharedPoolManager(PoolManager):
+    """Pool manager shared by the adapters of several sessions.
+
+    Closing a session clears the pools of its adapter, which would close the
+    connections the other sessions are using, so every adapter holds a
+    `_PoolLease` instead, and the pools are only cleared when the last lease
+    is released.
+    """
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+        self.pool_classes_by_scheme = {
+            "http": _TrackedHTTPConnectionPool,
+            "https": _TrackedHTTPSConnectionPool,
+        }
+        self.users = 0
+        self._users_lock = threading.Lock()
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.stats = self.stats
+        return pool
+
+    def acquire(self) -> None:
+        with self._users_lock:
+            self.users += 1
+
+    def release(self) -> None:
+        with self._users_lock:
+            self.users -= 1
+            if self.users:
+                return
+        self.clear()
+
+
+class _PoolLease:
+    """The pool manager of one adapter: the shared one, released once however often it is cleared.
+
+    A session closes an adapter once per prefix it is mounted on, e.g. "https://" and "http://".
+    """
+
+    def __init__(self, pool_manager: _SharedPoolManager):
+        self.pool_manager = pool_manager
+        self._closed = False
+        self._lock = threading.Lock()
+        pool_manager.acquire()
+
+    def __getattr__(self, name):
+        if name == "pool_manager":
+            raise AttributeError(name)
+        return getattr(self.pool_manager, name)
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.pool_manager.release()
+
+
+def _keepalive_options(idle: int, interval: int) -> list[tuple[int, int, int]]:
+    """Socket options that send TCP keep-alive probes on idle connections, where supported."""
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    elif hasattr(socket, "TCP_KEEPALIVE"):  # macOS
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval))
+    return options
+
+
+class ConnectionPool:
+    """HTTP connections kept open between requests, shared by the threads of one or more `GSConnection`s.
+
+    Args:
+        max_hosts (int, optional): Number of hosts whose connections are kept. Defaults to DEFAULT_MAX_HOSTS.
+        max_connections_per_host (int, optional): Number of connections kept open to each host. Set it to
+            at least the number of threads sending requests, e.g. the `max_workers` of the bulk helpers.
+            Defaults to DEFAULT_MAX_CONNECTIONS_PER_HOST.
+        block (bool, optional): Make requests wait for a connection when all of them are in use,
+            instead of opening one that is closed after the request. Defaults to True, which caps the
+            connections to a host at max_connections_per_host.
+        keep_alive (bool, optional): Send TCP keep-alive probes on idle connections, so that proxies and
+            NATs don't drop them silently. Defaults to True.
+        keepalive_idle (int, optional): Seconds a connection is idle before the first probe.
+            Defaults to DEFAULT_KEEPALIVE_IDLE.
+        keepalive_interval (int, optional): Seconds between probes. Defaults to DEFAULT_KEEPALIVE_INTERVAL.
+    """
+
+    def __init__(
+        self,
+        max_hosts: int = DEFAULT_MAX_HOSTS,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        block: bool = True,
+        keep_alive: bool = True,
+        keepalive_idle: int = DEFAULT_KEEPALIVE_IDLE,
+        keepalive_interval: int = DEFAULT_KEEPALIVE_INTERVAL,
+    ):
+        if max_hosts < 1 or max_connections_per_host < 1:
+            raise ValueError("A pool must keep at least one connection to one host")
+
+        socket_options = list(HTTPConnection.default_socket_options)
+        if keep_alive:
+            socket_options += _keepalive_options(keepalive_idle, keepalive_interval)
+
+        self.max_hosts = max_hosts
+        self.max_connections_per_host = max_connections_per_host
+        self.block = block
+        self.stats = PoolStats()
+        self._pool_manager = _SharedPoolManager(
+            self.stats,
+            num_pools=max_hosts,
+            maxsize=max_connections_per_host,
+            block=block,
+            socket_options=socket_options,
+        )
+
+    def mount(self, adapter: HTTPAdapter) -> HTTPAdapter:
+        """Make an adapter send its requests over the connections of this pool, and return it.
+
+        Closing the adapter releases it from the pool, whose connections are closed once every
+        adapter mounted on it is closed.
+        """
+        if (
+            isinstance(adapter.poolmanager, _PoolLease)
+            and adapter.poolmanager.pool_manager is self._pool_manager
+        ):
+            return adapter
+        adapter.poolmanager.clear()
+        adapter.poolmanager = _PoolLease(self._pool_manager)
+        return adapter
+
+    def close(self) -> None:
+        """Close every idle connection of the pool, even if connections still use it."""
+        self._pool_manager.clear()
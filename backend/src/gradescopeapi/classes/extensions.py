@@ -8,18 +8,53 @@ The main functions in this module are:
 - `get_extensions`: Retrieves all extensions for a specific assignment.
 - `update_student_extension`: Updates the extension for a specific student on an assignment.
 - `remove_student_extension`: Removes the extension for a specific student.
+- `update_student_extensions`: Updates many extensions at once, skipping the ones that are already set.
+- `remove_student_extensions`: Removes many extensions at once.
+
+`get_extensions_async`, `update_student_extension_async`,
+`update_student_extensions_async`, `remove_student_extension_async` and
+`remove_student_extensions_async` are the asyncio equivalents for use with an
+`httpx.AsyncClient`.
 """
 
 import datetime
 import json
+import re
+import urllib.parse
 import zoneinfo
+from collections.abc import Awaitable, Callable, Iterable
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-import dateutil.parser
 import requests
-from bs4 import BeautifulSoup
 
-from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL, DEFAULT_PARSER_BACKEND
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    SingleFlight,
+    run_concurrently,
+    run_concurrently_async,
+)
+from gradescopeapi.classes._helpers._csrf_helpers import (
+    CSRF_HEADER,
+    fetch_csrf_token,
+    fetch_csrf_token_async,
+    send_with_csrf_token,
+    send_with_csrf_token_async,
+)
+from gradescopeapi.classes._helpers._parser_helpers import (
+    get_react_props,
+    make_soup,
+    parse_date,
+)
+from gradescopeapi.classes.http_cache import cached_parse
+from gradescopeapi.classes.result_cache import invalidate_assignment
+from gradescopeapi.classes.tracing import build_phase, span
+from gradescopeapi.classes.transport_policy import bulk_rate_limiter
+
+if TYPE_CHECKING:
+    import httpx
 
 
 @dataclass
@@ -36,6 +71,7 @@ def get_extensions(
     course_id: str,
     assignment_id: str,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
 ) -> dict:
     """Get all extensions for an assignment.
 
@@ -58,9 +94,6 @@ def get_extensions(
     """
 
     GS_EXTENSIONS_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions"
-    GS_EXTENSIONS_TABLE_CSS_CLASSES = (
-        "table js-overridesTable"  # Table containing extensions
-    )
 
     # get the extensions from the page
     response = session.get(GS_EXTENSIONS_ENDPOINT)
@@ -71,23 +104,30 @@ def get_extensions(
             f"Failed to get extensions for assignment {assignment_id}. Status code: {response.status_code}"
         )
 
-    # parse the html response
-    extensions_soup = BeautifulSoup(response.text, "html.parser")
-
-    extensions_table = extensions_soup.find(
-        "table", class_=GS_EXTENSIONS_TABLE_CSS_CLASSES
+    return cached_parse(
+        response,
+        "extensions",
+        lambda: _parse_extensions(response.content, parser_backend),
     )
 
-    extensions = {}
 
-    table_body = extensions_table.find("tbody")
-    for row in table_body.find_all("tr"):
-        # find relevant data
-        user_properties = row.find("div", {"data-react-class": "EditExtension"}).get(
-            "data-react-props"
-        )
-        user_properties = json.loads(user_properties)
+def _parse_extensions(
+    extensions_html: str | bytes, parser_backend: str = DEFAULT_PARSER_BACKEND
+) -> dict[str, Extension]:
+    """Parse the extensions page of an assignment into Extension objects keyed by user ID."""
+    # every extension is an EditExtension react component, read their props straight
+    # from the page and only parse it if that fails
+    all_user_properties = get_react_props(extensions_html, "EditExtension")
+    if not all_user_properties:
+        all_user_properties = _parse_extensions_table(extensions_html, parser_backend)
+    return _build_extensions(all_user_properties)
 
+
+@build_phase("Extension")
+def _build_extensions(all_user_properties: list[dict]) -> dict[str, Extension]:
+    extensions = {}
+
+    for user_properties in all_user_properties:
         # user id
         user_id = str(user_properties["override"]["user_id"])  # TODO: keep as int?
 
@@ -102,17 +142,11 @@ def get_extensions(
 
         # convert dates to datetime objects
         release_date = (
-            dateutil.parser.parse(release_date).replace(tzinfo=timezone)
-            if release_date
-            else None
-        )
-        due_date = (
-            dateutil.parser.parse(due_date).replace(tzinfo=timezone)
-            if due_date
-            else None
+            parse_date(release_date).replace(tzinfo=timezone) if release_date else None
         )
+        due_date = parse_date(due_date).replace(tzinfo=timezone) if due_date else None
         late_due_date = (
-            dateutil.parser.parse(late_due_date).replace(tzinfo=timezone)
+            parse_date(late_due_date).replace(tzinfo=timezone)
             if late_due_date
             else None
         )
@@ -136,6 +170,35 @@ def get_extensions(
     return extensions
 
 
+def _parse_extensions_table(
+    extensions_html: str | bytes, parser_backend: str
+) -> list[dict]:
+    """Read the props of every EditExtension in the extensions table by parsing the page."""
+    GS_EXTENSIONS_TABLE_CSS_CLASSES = (
+        "table js-overridesTable"  # Table containing extensions
+    )
+
+    # parse the html response
+    extensions_soup = make_soup(extensions_html, parser_backend)
+
+    extensions_table = extensions_soup.find(
+        "table", class_=GS_EXTENSIONS_TABLE_CSS_CLASSES
+    )
+
+    all_user_properties = []
+
+    table_body = extensions_table.find("tbody")
+    for row in table_body.find_all("tr"):
+        # find relevant data
+        user_properties = row.find("div", {"data-react-class": "EditExtension"}).get(
+            "data-react-props"
+        )
+        with span("parse", "json", react_class="EditExtension"):
+            all_user_properties.append(json.loads(user_properties))
+
+    return all_user_properties
+
+
 def update_student_extension(
     session: requests.Session,
     course_id: str,
@@ -145,6 +208,7 @@ def update_student_extension(
     due_date: datetime.datetime | None = None,
     late_due_date: datetime.datetime | None = None,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
 ) -> bool:
     """Updates the extension for a student on an assignment.
 
@@ -178,6 +242,53 @@ def update_student_extension(
         ValueError: If the dates are not in order
     """
 
+    body = _extension_request_body(user_id, release_date, due_date, late_due_date)
+    GS_EXTENSIONS_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions"
+    return _post_extension(
+        session,
+        course_id,
+        assignment_id,
+        body,
+        gradescope_base_url,
+        fetch_csrf_token(session, GS_EXTENSIONS_ENDPOINT, parser_backend),
+    )
+
+
+def _post_extension(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    body: dict,
+    gradescope_base_url: str,
+    fetch_token: Callable[[], str],
+) -> bool:
+    GS_EXTENSIONS_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions"
+
+    # send the request with the cached CSRF token, only getting a page for one if needed
+    resp = send_with_csrf_token(
+        session,
+        fetch_token,
+        lambda csrf_token: session.post(
+            GS_EXTENSIONS_ENDPOINT, json=body, headers={CSRF_HEADER: csrf_token}
+        ),
+    )
+    invalidate_assignment(session, course_id, assignment_id)
+    return resp.status_code == 200
+
+
+def _extension_request_body(
+    user_id: str,
+    release_date: datetime.datetime | None,
+    due_date: datetime.datetime | None,
+    late_due_date: datetime.datetime | None,
+) -> dict:
+    """Validate extension dates and build the JSON body for the extensions endpoint.
+
+    Raises:
+        ValueError: If no dates are provided
+        ValueError: If the dates are not in order
+    """
+
     # Check if at least 1 date is set
     if release_date is None and due_date is None and late_due_date is None:
         raise ValueError("At least one date must be provided")
@@ -216,16 +327,591 @@ def update_student_extension(
         if extension_datetime is not None:
             add_to_body(extension_name, extension_datetime)
 
-    # send the request
-    resp = session.post(
-        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions",
-        json=body,
+    return body
+
+
+# a delete_path is the extensions endpoint of the assignment followed by the extension id
+DELETE_PATH_PATTERN = re.compile(
+    r"^/courses/(?P<course_id>\d+)/assignments/(?P<assignment_id>\d+)/extensions/\d+$"
+)
+
+
+def remove_student_extension(
+    session: requests.Session,
+    delete_path: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+) -> bool:
+    """Removes the extension of a student on an assignment.
+
+    Args:
+        session (requests.Session): The session to use for the request
+        delete_path (str): The `delete_path` of the extension, as returned by `get_extensions`
+
+    Returns:
+        bool: True if the extension was removed, False otherwise
+
+    Raises:
+        ValueError: If delete_path is not the path of an extension
+    """
+    course_id, assignment_id = _parse_delete_path(delete_path)
+    response = _delete_extension(
+        session,
+        course_id,
+        assignment_id,
+        delete_path,
+        gradescope_base_url,
+        _fetch_extensions_token(
+            session, course_id, assignment_id, gradescope_base_url, parser_backend
+        ),
+    )
+    return _removed(response, delete_path)
+
+
+def _parse_delete_path(delete_path: str) -> tuple[str, str]:
+    match = DELETE_PATH_PATTERN.match(delete_path)
+    if match is None:
+        raise ValueError(f"{delete_path!r} is not the delete_path of an extension")
+    return match["course_id"], match["assignment_id"]
+
+
+def _fetch_extensions_token(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    gradescope_base_url: str,
+    parser_backend: str,
+) -> Callable[[], str]:
+    GS_EXTENSIONS_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions"
+    return fetch_csrf_token(session, GS_EXTENSIONS_ENDPOINT, parser_backend)
+
+
+def _delete_extension(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    delete_path: str,
+    gradescope_base_url: str,
+    fetch_token: Callable[[], str],
+) -> requests.Response:
+    # send the request with the cached CSRF token, only getting a page for one if needed
+    response = send_with_csrf_token(
+        session,
+        fetch_token,
+        lambda csrf_token: session.delete(
+            f"{gradescope_base_url}{delete_path}",
+            headers={CSRF_HEADER: csrf_token},
+            allow_redirects=False,
+        ),
     )
+    invalidate_assignment(session, course_id, assignment_id)
+    return response
+
+
+def _removed(response: "requests.Response | httpx.Response", delete_path: str) -> bool:
+    # Gradescope answers with 204 No Content, or redirects back to the extensions page. The redirect
+    # is not followed, so that e.g. the login page after a redirect doesn't count as removed.
+    if response.status_code == 204:
+        return True
+    location = urllib.parse.urlsplit(response.headers.get("location", ""))
+    extensions_path = delete_path.rsplit("/", 1)[0]
+    return response.status_code in (302, 303) and location.path == extensions_path
+
+
+async def get_extensions_async(
+    client: "httpx.AsyncClient",
+    course_id: str,
+    assignment_id: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+) -> dict:
+    """Get all extensions for an assignment. Asynchronous version of `get_extensions`.
+
+    Args:
+        client (httpx.AsyncClient): The client object used for making HTTP requests.
+        course_id (str): The ID of the course.
+        assignment_id (str): The ID of the assignment.
+
+    Returns:
+        dict: A dictionary containing the extensions, where the keys are user IDs and the values are Extension objects.
+
+    Raises:
+        RuntimeError: If the request to get extensions fails.
+    """
+
+    GS_EXTENSIONS_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions"
+
+    # get the extensions from the page
+    response = await client.get(GS_EXTENSIONS_ENDPOINT)
+
+    # check if the request was successful
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Failed to get extensions for assignment {assignment_id}. Status code: {response.status_code}"
+        )
+
+    return _parse_extensions(response.content, parser_backend)
+
+
+async def update_student_extension_async(
+    client: "httpx.AsyncClient",
+    course_id: str,
+    assignment_id: str,
+    user_id: str,
+    release_date: datetime.datetime | None = None,
+    due_date: datetime.datetime | None = None,
+    late_due_date: datetime.datetime | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+) -> bool:
+    """Updates the extension for a student on an assignment. Asynchronous version of `update_student_extension`.
+
+    Args:
+        client (httpx.AsyncClient): The client to use for the request
+        course_id (str): The course id
+        assignment_id (str): The assignment id
+        user_id (str): The user id
+        release_date (datetime.datetime | None): The release date. If None, it will not be updated
+        due_date (datetime.datetime | None): The due date. If None, it will not be updated
+        late_due_date (datetime.datetime | None): The late due date. If None, it will not be updated
+
+    Returns:
+        bool: True if the extension was successfully updated, False otherwise
+
+    Raises:
+        ValueError: If no dates are provided
+        ValueError: If the dates are not in order
+    """
+
+    body = _extension_request_body(user_id, release_date, due_date, late_due_date)
+    GS_EXTENSIONS_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions"
+    return await _post_extension_async(
+        client,
+        course_id,
+        assignment_id,
+        body,
+        gradescope_base_url,
+        fetch_csrf_token_async(client, GS_EXTENSIONS_ENDPOINT, parser_backend),
+    )
+
+
+async def _post_extension_async(
+    client: "httpx.AsyncClient",
+    course_id: str,
+    assignment_id: str,
+    body: dict,
+    gradescope_base_url: str,
+    fetch_token: Callable[[], Awaitable[str]],
+) -> bool:
+    GS_EXTENSIONS_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions"
+
+    # send the request with the cached CSRF token, only getting a page for one if needed
+    async def send(csrf_token: str) -> "httpx.Response":
+        return await client.post(
+            GS_EXTENSIONS_ENDPOINT, json=body, headers={CSRF_HEADER: csrf_token}
+        )
+
+    resp = await send_with_csrf_token_async(client, fetch_token, send)
+    invalidate_assignment(client, course_id, assignment_id)
     return resp.status_code == 200
 
 
-def remove_student_extension(
+@dataclass
+class ExtensionUpdate:
+    """Dates to set for a user on an assignment with `update_student_extensions`.
+
+    Dates that are None are not updated, as in `update_student_extension`.
+    """
+
+    assignment_id: str
+    user_id: str
+    release_date: datetime.datetime | None = None
+    due_date: datetime.datetime | None = None
+    late_due_date: datetime.datetime | None = None
+
+
+@dataclass
+class ExtensionUpdateResult:
+    """Outcome of an `ExtensionUpdate`.
+
+    `status` is "updated", "unchanged" if the extension already had the dates, or "failed"
+    with the reason in `error`.
+    """
+
+    update: ExtensionUpdate
+    status: str
+    error: str | None = None
+
+
+def update_student_extensions(
     session: requests.Session,
+    course_id: str,
+    updates: Iterable[ExtensionUpdate],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+) -> list[ExtensionUpdateResult]:
+    """Update the extensions of many users on many assignments of a course.
+
+    The current extensions of every assignment are read once with `get_extensions`. Updates
+    that would not change anything are skipped, and the others are sent concurrently.
+
+    Args:
+        session (requests.Session): The session to use for the requests.
+        course_id (str): The course id.
+        updates (Iterable[ExtensionUpdate]): The extensions to set, at most one per user and assignment.
+        max_workers (int, optional): Maximum number of concurrent requests. Defaults to DEFAULT_MAX_WORKERS.
+            The requests are retried by the `TransportPolicy` of the session.
+        requests_per_second (float | None, optional): Rate limit shared by all workers, used only when
+            the `TransportPolicy` of the session has none. None for no limit. Defaults to
+            DEFAULT_REQUESTS_PER_SECOND.
+
+    Returns:
+        list[ExtensionUpdateResult]: The result of every update, in the order of `updates`.
+        An update fails on its own if its dates are invalid or a request for it fails.
+
+    Raises:
+        ValueError: If a user has more than one update for the same assignment.
+    """
+    batch = _ExtensionBatch(updates)
+    rate_limiter = bulk_rate_limiter(session, gradescope_base_url, requests_per_second)
+
+    def read(assignment_id: str) -> dict | Exception:
+        try:
+            return get_extensions(
+                session, course_id, assignment_id, gradescope_base_url, parser_backend
+            )
+        except Exception as e:
+            return e
+
+    for assignment_id, extensions in run_concurrently(
+        read, batch.assignment_ids(), max_workers, rate_limiter
+    ):
+        batch.compare(assignment_id, extensions)
+
+    # the extensions pages refreshed the cached token, one fetch is shared if it is rejected
+    token_fetches = SingleFlight()
+    GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
+    fetch_token = fetch_csrf_token(session, GS_COURSE_ENDPOINT, parser_backend)
+
+    def send(index: int) -> bool | Exception:
+        update = batch.updates[index]
+        try:
+            return _post_extension(
+                session,
+                course_id,
+                update.assignment_id,
+                batch.bodies[index],
+                gradescope_base_url,
+                lambda: token_fetches.do(course_id, fetch_token),
+            )
+        except Exception as e:
+            return e
+
+    for index, sent in run_concurrently(
+        send, batch.pending(), max_workers, rate_limiter
+    ):
+        batch.sent(index, sent)
+    return batch.results()
+
+
+async def update_student_extensions_async(
+    client: "httpx.AsyncClient",
+    course_id: str,
+    updates: Iterable[ExtensionUpdate],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+) -> list[ExtensionUpdateResult]:
+    """Asynchronous version of `update_student_extensions`."""
+    batch = _ExtensionBatch(updates)
+    rate_limiter = bulk_rate_limiter(client, gradescope_base_url, requests_per_second)
+
+    async def read(assignment_id: str) -> dict | Exception:
+        try:
+            return await get_extensions_async(
+                client, course_id, assignment_id, gradescope_base_url, parser_backend
+            )
+        except Exception as e:
+            return e
+
+    async for assignment_id, extensions in run_concurrently_async(
+        read, batch.assignment_ids(), max_workers, rate_limiter
+    ):
+        batch.compare(assignment_id, extensions)
+
+    token_fetches = SingleFlight()
+    GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
+    fetch_token = fetch_csrf_token_async(client, GS_COURSE_ENDPOINT, parser_backend)
+
+    async def send(index: int) -> bool | Exception:
+        update = batch.updates[index]
+        try:
+            return await _post_extension_async(
+                client,
+                course_id,
+                update.assignment_id,
+                batch.bodies[index],
+                gradescope_base_url,
+                lambda: token_fetches.do_async(course_id, fetch_token),
+            )
+        except Exception as e:
+            return e
+
+    async for index, sent in run_concurrently_async(
+        send, batch.pending(), max_workers, rate_limiter
+    ):
+        batch.sent(index, sent)
+    return batch.results()
+
+
+class _ExtensionBatch:
+    """Bookkeeping of `update_student_extensions`, shared by its sync and async versions."""
+
+    def __init__(self, updates: Iterable[ExtensionUpdate]):
+        self.updates = list(updates)
+        keys = [(update.assignment_id, update.user_id) for update in self.updates]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Each user can only have one update per assignment")
+
+        self.bodies: dict[int, dict] = {}
+        self._results: dict[int, ExtensionUpdateResult] = {}
+        for index, update in enumerate(self.updates):
+            try:
+                self.bodies[index] = _extension_request_body(
+                    update.user_id,
+                    update.release_date,
+                    update.due_date,
+                    update.late_due_date,
+                )
+            except ValueError as e:
+                self._fail(index, e)
+
+    def assignment_ids(self) -> list[str]:
+        return list(
+            dict.fromkeys(self.updates[index].assignment_id for index in self.bodies)
+        )
+
+    def compare(self, assignment_id: str, extensions: dict | Exception) -> None:
+        """Settle the updates of an assignment that fail or change nothing."""
+        for index in self.pending():
+            update = self.updates[index]
+            if update.assignment_id != assignment_id:
+                continue
+            if isinstance(extensions, Exception):
+                self._fail(index, extensions)
+            elif _unchanged(update, extensions.get(update.user_id)):
+                self._results[index] = ExtensionUpdateResult(update, "unchanged")
+
+    def pending(self) -> list[int]:
+        return [index for index in self.bodies if index not in self._results]
+
+    def sent(self, index: int, sent: bool | Exception) -> None:
+        if isinstance(sent, Exception):
+            self._fail(index, sent)
+        elif not sent:
+            self._fail(index, "Gradescope rejected the update")
+        else:
+            self._results[index] = ExtensionUpdateResult(self.updates[index], "updated")
+
+    def results(self) -> list[ExtensionUpdateResult]:
+        return [self._results[index] for index in range(len(self.updates))]
+
+    def _fail(self, index: int, error: Exception | str) -> None:
+        if isinstance(error, Exception):
+            error = f"{type(error).__name__}: {error}"
+        self._results[index] = ExtensionUpdateResult(
+            self.updates[index], "failed", error
+        )
+
+
+def _unchanged(update: ExtensionUpdate, extension: Extension | None) -> bool:
+    """Whether the user already has every date of the update, to the second that is sent."""
+    if extension is None:
+        return False
+
+    def same(date: datetime.datetime | None, current: datetime.datetime | None):
+        if date is None:
+            return True
+        if current is None:
+            return False
+        return date.astimezone(datetime.timezone.utc).replace(
+            microsecond=0
+        ) == current.astimezone(datetime.timezone.utc)
+
+    return (
+        same(update.release_date, extension.release_date)
+        and same(update.due_date, extension.due_date)
+        and same(update.late_due_date, extension.late_due_date)
+    )
+
+
+async def remove_student_extension_async(
+    client: "httpx.AsyncClient",
     delete_path: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
 ) -> bool:
-    raise NotImplementedError("Not implemented yet")
+    """Removes the extension of a student on an assignment. Asynchronous version of `remove_student_extension`."""
+    course_id, assignment_id = _parse_delete_path(delete_path)
+    GS_EXTENSIONS_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions"
+    response = await _delete_extension_async(
+        client,
+        course_id,
+        assignment_id,
+        delete_path,
+        gradescope_base_url,
+        fetch_csrf_token_async(client, GS_EXTENSIONS_ENDPOINT, parser_backend),
+    )
+    return _removed(response, delete_path)
+
+
+async def _delete_extension_async(
+    client: "httpx.AsyncClient",
+    course_id: str,
+    assignment_id: str,
+    delete_path: str,
+    gradescope_base_url: str,
+    fetch_token: Callable[[], Awaitable[str]],
+) -> "httpx.Response":
+    async def send(csrf_token: str) -> "httpx.Response":
+        return await client.delete(
+            f"{gradescope_base_url}{delete_path}",
+            headers={CSRF_HEADER: csrf_token},
+            follow_redirects=False,
+        )
+
+    response = await send_with_csrf_token_async(client, fetch_token, send)
+    invalidate_assignment(client, course_id, assignment_id)
+    return response
+
+
+@dataclass
+class ExtensionRemovalResult:
+    """Outcome of removing an extension with `remove_student_extensions`.
+
+    `status` is "removed", "missing" if Gradescope no longer has the extension, or "failed"
+    with the reason in `error`.
+    """
+
+    delete_path: str
+    status: str
+    error: str | None = None
+
+
+def remove_student_extensions(
+    session: requests.Session,
+    delete_paths: Iterable[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+) -> list[ExtensionRemovalResult]:
+    """Remove many extensions concurrently.
+
+    Removals are retried by the `TransportPolicy` of the session, like every other request of
+    a connection. A removal that still fails after its retries is reported as
+    "failed" with the last status or error.
+
+    Args:
+        session (requests.Session): The session to use for the requests
+        delete_paths (Iterable[str]): The `delete_path`s of the extensions, as returned by `get_extensions`
+        max_workers (int, optional): Maximum number of concurrent removals. Defaults to DEFAULT_MAX_WORKERS.
+        requests_per_second (float | None, optional): Rate limit shared by all workers, used only when
+            the `TransportPolicy` of the session has none. None for no limit. Defaults to
+            DEFAULT_REQUESTS_PER_SECOND.
+
+    Returns:
+        list[ExtensionRemovalResult]: The result of every delete path, in the order of `delete_paths`.
+    """
+    delete_paths = list(dict.fromkeys(delete_paths))
+    token_fetches = SingleFlight()
+
+    def remove(delete_path: str) -> ExtensionRemovalResult:
+        try:
+            course_id, assignment_id = _parse_delete_path(delete_path)
+        except ValueError as e:
+            return _removal_failed(delete_path, e)
+        fetch_token = _fetch_extensions_token(
+            session, course_id, assignment_id, gradescope_base_url, parser_backend
+        )
+        try:
+            response = _delete_extension(
+                session,
+                course_id,
+                assignment_id,
+                delete_path,
+                gradescope_base_url,
+                lambda: token_fetches.do(course_id, fetch_token),
+            )
+        except Exception as e:
+            # e.g. a connection error the policy gave up on, or no CSRF token on the page
+            return _removal_failed(delete_path, e)
+        return _removal_result(delete_path, response)
+
+    rate_limiter = bulk_rate_limiter(session, gradescope_base_url, requests_per_second)
+    results = dict(run_concurrently(remove, delete_paths, max_workers, rate_limiter))
+    return [results[delete_path] for delete_path in delete_paths]
+
+
+async def remove_student_extensions_async(
+    client: "httpx.AsyncClient",
+    delete_paths: Iterable[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+) -> list[ExtensionRemovalResult]:
+    """Asynchronous version of `remove_student_extensions`."""
+    delete_paths = list(dict.fromkeys(delete_paths))
+    token_fetches = SingleFlight()
+
+    async def remove(delete_path: str) -> ExtensionRemovalResult:
+        try:
+            course_id, assignment_id = _parse_delete_path(delete_path)
+        except ValueError as e:
+            return _removal_failed(delete_path, e)
+        GS_EXTENSIONS_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions"
+        fetch_token = fetch_csrf_token_async(
+            client, GS_EXTENSIONS_ENDPOINT, parser_backend
+        )
+        try:
+            response = await _delete_extension_async(
+                client,
+                course_id,
+                assignment_id,
+                delete_path,
+                gradescope_base_url,
+                lambda: token_fetches.do_async(course_id, fetch_token),
+            )
+        except Exception as e:
+            # e.g. a connection error the policy gave up on, or no CSRF token on the page
+            return _removal_failed(delete_path, e)
+        return _removal_result(delete_path, response)
+
+    rate_limiter = bulk_rate_limiter(client, gradescope_base_url, requests_per_second)
+    results = {
+        delete_path: result
+        async for delete_path, result in run_concurrently_async(
+            remove, delete_paths, max_workers, rate_limiter
+        )
+    }
+    return [results[delete_path] for delete_path in delete_paths]
+
+
+def _removal_result(
+    delete_path: str, response: "requests.Response | httpx.Response"
+) -> ExtensionRemovalResult:
+    if _removed(response, delete_path):
+        return ExtensionRemovalResult(delete_path, "removed")
+    if response.status_code == 404:
+        return ExtensionRemovalResult(delete_path, "missing")
+    return _removal_failed(delete_path, f"Status code: {response.status_code}")
+
+
+def _removal_failed(delete_path: str, error: Exception | str) -> ExtensionRemovalResult:
+    if isinstance(error, Exception):
+        error = f"{type(error).__name__}: {error}"
+    return ExtensionRemovalResult(delete_path, "failed", error)
@@ -0,0 +1,389 @@
+"""Opt-in HTTP cache for `GSConnection` based on conditional requests.
+
+Gradescope pages are personal and change often, so nothing is served from the
+cache without asking the server first. Instead, the validators (`ETag` and
+`Last-Modified`) and body of every cacheable GET response are stored, later
+requests for the same URL send `If-None-Match` / `If-Modified-Since`, and a
+`304 Not Modified` is answered with the stored body. The objects scraped from a
+body are kept as well, so a 304 also skips parsing the page again.
+
+Example:
+    cache = HTTPCache(SQLiteCacheStore("gradescope_cache.sqlite3"))
+    connection = GSConnection(http_cache=cache)
+
+A cache holds the pages of one user and must not be shared between connections
+that are logged in as different users.
+"""
+
+import copy
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_PARSED = 256
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+    encoding: str | None
+    etag: str | None
+    last_modified: str | None
+
+    @property
+    def validator(self) -> str:
+        return self.etag or self.last_modified or ""
+
+
+@dataclass
+class CacheStats:
+    """Counters of a cache, to size it and check that it is useful."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record(self, hits: int = 0, misses: int = 0, evictions: int = 0) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.evictions += evictions
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MemoryCacheStore:
+    """In-memory LRU store of cached responses.
+
+    Args:
+        max_entries (int, optional): Maximum number of responses kept. Defaults to DEFAULT_MAX_ENTRIES.
+        max_bytes (int, optional): Maximum total size of the kept bodies. Defaults to DEFAULT_MAX_BYTES.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def set(self, url: str, entry: CachedResponse) -> None:
+        if len(entry.content) > self.max_bytes:
+            self.delete(url)
+            return
+        evicted = 0
+        with self._lock:
+            old_entry = self._entries.pop(url, None)
+            if old_entry is not None:
+                self._size -= len(old_entry.content)
+            self._entries[url] = entry
+            self._size += len(entry.content)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted_entry = self._entries.popitem(last=False)
+                self._size -= len(evicted_entry.content)
+                evicted += 1
+        self.stats.record(evictions=evicted)
+
+    def delete(self, url: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(url, None)
+            if entry is not None:
+                self._size -= len(entry.content)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheStore:
+    """LRU store of cached responses in a SQLite database, kept across processes.
+
+    Args:
+        path (str): Path of the database file. Created if it doesn't exist.
+        max_entries (int, optional): Maximum number of responses kept. Defaults to DEFAULT_MAX_ENTRIES.
+        max_bytes (int, optional): Maximum total size of the kept bodies. Defaults to DEFAULT_MAX_BYTES.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    status_code INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    encoding TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    size INTEGER NOT NULL,
+                    last_used INTEGER NOT NULL
+                )
+                """
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+            )
+
+    def get(self, url: str) -> CachedResponse | None:
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT status_code, headers, content, encoding, etag, last_modified"
+                " FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE responses SET last_used = ? WHERE url = ?",
+                (time.time_ns(), url),
+            )
+        status_code, headers, content, encoding, etag, last_modified = row
+        return CachedResponse(
+            status_code, json.loads(headers), content, encoding, etag, last_modified
+        )
+
+    def set(self, url: str, entry: CachedResponse) -> None:
+        if len(entry.content) > self.max_bytes:
+            self.delete(url)
+            return
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    entry.content,
+                    entry.encoding,
+                    entry.etag,
+                    entry.last_modified,
+                    len(entry.content),
+                    time.time_ns(),
+                ),
+            )
+            evicted = self._evict()
+        self.stats.record(evictions=evicted)
+
+    def _evict(self) -> int:
+        """Delete the least recently used responses until the store is within its bounds."""
+        count, size = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        evicted = 0
+        rows = self._db.execute("SELECT url, size FROM responses ORDER BY last_used")
+        to_delete = []
+        for url, entry_size in rows:
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            to_delete.append((url,))
+            count -= 1
+            size -= entry_size
+            evicted += 1
+        self._db.executemany("DELETE FROM responses WHERE url = ?", to_delete)
+        return evicted
+
+    def delete(self, url: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+
+    def clear(self) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class HTTPCache:
+    """Conditional-request cache for the pages of one user.
+
+    Args:
+        store (MemoryCacheStore | SQLiteCacheStore | None, optional): Where responses are kept.
+            Defaults to a new MemoryCacheStore.
+        max_parsed (int, optional): Maximum number of parse results kept in memory.
+            Defaults to DEFAULT_MAX_PARSED.
+
+    Attributes:
+        stats (CacheStats): `hits` counts requests answered with 304, `misses` counts
+            requests answered with a new body.
+        parse_stats (CacheStats): Hits and misses of the parse results.
+    """
+
+    def __init__(
+        self,
+        store: MemoryCacheStore | SQLiteCacheStore | None = None,
+        max_parsed: int = DEFAULT_MAX_PARSED,
+    ):
+        self.store = store if store is not None else MemoryCacheStore()
+        self.max_parsed = max_parsed
+        self.stats = CacheStats()
+        self.parse_stats = CacheStats()
+        self._parsed: OrderedDict[tuple[str, str, str], object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(
+        self, response: requests.Response, name: str, parse: Callable[[], T]
+    ) -> T:
+        """Return `parse()`, reusing the result from the last time this version of the page was parsed.
+
+        Args:
+            response (requests.Response): Response returned through this cache.
+            name (str): Identifies what is scraped from the page, and with which arguments.
+            parse (Callable): Scrapes the response.
+        """
+        key = (response.url, response.cache_validator, name)
+        with self._lock:
+            result = self._parsed.get(key, self)
+            if result is not self:
+                self._parsed.move_to_end(key)
+        if result is not self:
+            self.parse_stats.record(hits=1)
+            # callers may change the returned objects, keep the cached ones intact
+            return copy.deepcopy(result)
+
+        self.parse_stats.record(misses=1)
+        result = parse()
+        evicted = 0
+        with self._lock:
+            self._parsed[key] = copy.deepcopy(result)
+            while len(self._parsed) > self.max_parsed:
+                self._parsed.popitem(last=False)
+                evicted += 1
+        self.parse_stats.record(evictions=evicted)
+        return result
+
+    def clear(self) -> None:
+        self.store.clear()
+        with self._lock:
+            self._parsed.clear()
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """`requests` transport adapter that revalidates GET requests through an `HTTPCache`."""
+
+    def __init__(self, cache: HTTPCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != "GET" or stream:
+            return super().send(request, stream=stream, **kwargs)
+
+        entry = self.cache.store.get(request.url)
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if entry is not None and response.status_code == requests.codes.not_modified:
+            self.cache.stats.record(hits=1)
+            return _from_cache(response, entry, self.cache)
+
+        self.cache.stats.record(misses=1)
+        if response.status_code == requests.codes.ok and _is_cacheable(response):
+            entry = CachedResponse(
+                status_code=response.status_code,
+                headers=dict(response.headers),
+                content=response.content,
+                encoding=response.encoding,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+            self.cache.store.set(request.url, entry)
+            response.http_cache = self.cache
+            response.cache_validator = entry.validator
+        return response
+
+
+def _is_cacheable(response: requests.Response) -> bool:
+    cache_control = response.headers.get("Cache-Control", "").lower()
+    return "no-store" not in cache_control and (
+        "ETag" in response.headers or "Last-Modified" in response.headers
+    )
+
+
+def _from_cache(
+    response: requests.Response, entry: CachedResponse, cache: HTTPCache
+) -> requests.Response:
+    """Turn a 304 response into the cached response it confirmed."""
+    # keep the raw 304 response so that requests still reads the cookies it sets
+    headers = dict(entry.headers)
+    headers.update(
+        (name, value)
+        for name, value in response.headers.items()
+        if name.lower()
+        not in ("content-length", "content-encoding", "transfer-encoding")
+    )
+    response.status_code = entry.status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = entry.encoding
+    response._content = entry.content
+    response._content_consumed = True
+    response.from_cache = True
+    response.http_cache = cache
+    response.cache_validator = entry.validator
+    return response
+
+
+def cached_parse(response, name: str, parse: Callable[[], T]) -> T:
+    """Return `parse()`, through the HTTP cache the response came from if it has one."""
+    cache = getattr(response, "http_cache", None)
+    if cache is None:
+        return parse()
+    return cache.parse(response, name, parse)
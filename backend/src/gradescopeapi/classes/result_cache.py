@@ -0,0 +1,225 @@
+"""Opt-in memoization of the objects returned by `Account` methods.
+
+Unlike `HTTPCache`, a `ResultCache` answers repeated calls without contacting
+Gradescope at all, for as long as the result's time to live. The functions in
+this package that change a course or an assignment drop the results they make
+stale, when they are called with the session of an account that uses the cache:
+
+- `update_assignment_date` and `update_student_extension` drop the results about
+  that assignment, including the course's assignment list.
+- `upload_assignment` drops every result about that course.
+
+Changes made elsewhere (in the browser, by other users) are only seen once a
+result expires.
+
+Example:
+    connection = GSConnection(result_cache=ResultCache(ttl={"get_courses": 3600}))
+"""
+
+import copy
+import functools
+import inspect
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from gradescopeapi.classes.http_cache import CacheStats
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 1024
+
+# seconds that the result of each Account method is reused for
+DEFAULT_TTLS = {
+    "get_courses": 300.0,
+    "get_assignments": 60.0,
+    "get_course_users": 300.0,
+    "get_assignment_graders": 60.0,
+}
+
+# the cache of each session, for the functions that take a session instead of an Account
+_session_caches: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class _Entry:
+    value: object
+    expires_at: float
+    course_id: str | None
+    assignment_id: str | None
+
+
+class ResultCache:
+    """Thread-safe LRU cache of `Account` results, each reused until its TTL runs out.
+
+    Args:
+        ttl (float | dict[str, float] | None, optional): Seconds results are reused for, either for
+            every method or by method name. Methods missing from the dict use DEFAULT_TTLS.
+            Defaults to None (DEFAULT_TTLS).
+        max_entries (int, optional): Maximum number of results kept. Defaults to DEFAULT_MAX_ENTRIES.
+
+    Attributes:
+        stats (CacheStats): Lookups that found a live result, lookups that did not, and results
+            dropped to stay within max_entries.
+    """
+
+    def __init__(
+        self,
+        ttl: float | dict[str, float] | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        if isinstance(ttl, dict):
+            self.ttls = {**DEFAULT_TTLS, **ttl}
+        elif ttl is not None:
+            self.ttls = dict.fromkeys(DEFAULT_TTLS, ttl)
+        else:
+            self.ttls = dict(DEFAULT_TTLS)
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        # bumped by every invalidation, so that results computed across one are not kept
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        method: str,
+        args: tuple,
+        compute: Callable[[], T],
+        course_id: str | None = None,
+        assignment_id: str | None = None,
+    ) -> T:
+        """Return the live result of `method(*args)`, or compute and keep it.
+
+        Args:
+            method (str): Name of the Account method, which selects the TTL.
+            args (tuple): Arguments of the call, which together with `method` identify the result.
+            compute (Callable): Returns the result when it is not cached. None results are not kept,
+                nor results whose computation overlapped an invalidation.
+            course_id (str | None, optional): Course the result is about, for invalidation.
+            assignment_id (str | None, optional): Assignment the result is about, for invalidation.
+        """
+        key = (method, *args)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                value = entry.value
+            else:
+                value = self
+            generation = self._generation
+        if value is not self:
+            self.stats.record(hits=1)
+            # callers may change the returned objects, keep the cached ones intact
+            return copy.deepcopy(value)
+
+        self.stats.record(misses=1)
+        value = compute()
+        if value is None:
+            return value
+
+        entry = _Entry(
+            copy.deepcopy(value),
+            time.monotonic() + self.ttls[method],
+            course_id,
+            assignment_id,
+        )
+        evicted = 0
+        with self._lock:
+            if generation != self._generation:
+                # invalidated while computing, the result may be from before the change
+                return value
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                evicted = self._evict(now)
+        self.stats.record(evictions=evicted)
+        return value
+
+    def _evict(self, now: float) -> int:
+        """Drop expired results, then the least recently used ones, until within max_entries."""
+        for key in [key for key, e in self._entries.items() if e.expires_at <= now]:
+            del self._entries[key]
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def invalidate_course(self, course_id: str) -> None:
+        """Drop every result about a course."""
+        self._invalidate(lambda key, entry: entry.course_id == course_id)
+
+    def invalidate_assignment(self, course_id: str, assignment_id: str) -> None:
+        """Drop the results about an assignment, and the assignment list of its course."""
+        self._invalidate(
+            lambda key, entry: (
+                entry.assignment_id == assignment_id
+                or key == ("get_assignments", course_id)
+            )
+        )
+
+    def _invalidate(self, is_stale: Callable[[Hashable, _Entry], bool]) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, e in self._entries.items() if is_stale(key, e)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def memoized(method: Callable[..., T]) -> Callable[..., T]:
+    """Serve an `Account` method from the account's `result_cache`, when it has one.
+
+    The arguments named `course_id` and `assignment_id` tag the result for invalidation.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.result_cache is None:
+            return method(self, *args, **kwargs)
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        arguments.pop("self")
+        return self.result_cache.get_or_compute(
+            method.__name__,
+            tuple(arguments.values()),
+            lambda: method(self, *args, **kwargs),
+            course_id=arguments.get("course_id"),
+            assignment_id=arguments.get("assignment_id"),
+        )
+
+    return wrapper
+
+
+def register_result_cache(session, result_cache: ResultCache | None) -> None:
+    """Let the functions that change Gradescope through `session` invalidate `result_cache`."""
+    if result_cache is None:
+        _session_caches.pop(session, None)
+    else:
+        _session_caches[session] = result_cache
+
+
+def invalidate_course(session, course_id: str) -> None:
+    """Drop the cached results about a course, if `session` has a ResultCache."""
+    result_cache = _session_caches.get(session)
+    if result_cache is not None:
+        result_cache.invalidate_course(course_id)
+
+
+def invalidate_assignment(session, course_id: str, assignment_id: str) -> None:
+    """Drop the cached results about an assignment, if `session` has a ResultCache."""
+    result_cache = _session_caches.get(session)
+    if result_cache is not None:
+        result_cache.invalidate_assignment(course_id, assignment_id)
@@ -0,0 +1,301 @@
+"""Where the time of a connection goes: requests, parsing and building objects.
+
+A `Tracer` passed to `GSConnection` or `AsyncGSConnection` receives a `Span`
+for every:
+
+- "http": request sent, with its method, URL template (IDs replaced by
+  "{id}"), status, bytes and latency until the response headers arrived.
+- "call": call of an `Account` method.
+- "parse": parse phase, i.e. a page parsed into a tree ("html"), JSON read
+  from a page ("json") or a date parsed by dateutil ("date").
+- "build": object-construction phase, i.e. the Courses, Members, Assignments
+  or Extensions built from a page, with their number.
+
+Example:
+    tracer = InMemoryTracer()
+    connection = GSConnection(tracer=tracer)
+    connection.login(email, password)
+    connection.account.get_assignments(course_id)
+    print(tracer.totals())  # {("http", "GET /courses/{id}"): (1, 0.31), ...}
+
+Spans nest: the "parse" and "build" spans of a call are within its "call"
+span. Parse and build spans are only recorded while a tracer is active, i.e.
+during the `Account` methods of a connection with a tracer, or in a `with
+tracer.activate():` block around the free functions. Without an active tracer
+a span costs one context variable lookup.
+"""
+
+import contextvars
+import functools
+import inspect
+import re
+import threading
+import time
+import urllib.parse
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import requests
+
+if TYPE_CHECKING:
+    import httpx
+
+# numeric path segments, e.g. "/123" in "/courses/123/assignments" or "/456.json"
+ID_SEGMENT_PATTERN = re.compile(r"/\d+(?=/|\.|$)")
+_TRACE_START = "gradescopeapi.trace_start"
+
+T = TypeVar("T")
+
+
+@dataclass
+class Span:
+    """One timed operation."""
+
+    kind: str
+    name: str
+    # time.perf_counter() when it started
+    start: float = 0.0
+    # seconds
+    duration: float = 0.0
+    attributes: dict = field(default_factory=dict)
+
+
+class Tracer:
+    """Receives the spans of the connections it is passed to.
+
+    Args:
+        on_span (Callable[[Span], None] | None, optional): Called with every finished span, e.g. to
+            send it to a metrics or tracing system. Defaults to None. Subclasses can override `on_span`
+            instead.
+    """
+
+    def __init__(self, on_span: Callable[[Span], None] | None = None):
+        self._on_span = on_span
+
+    def on_span(self, span: Span) -> None:
+        if self._on_span is not None:
+            self._on_span(span)
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Record the parse and build spans of the code in the `with` block."""
+        token = _current_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _current_tracer.reset(token)
+
+
+class InMemoryTracer(Tracer):
+    """Keeps every span in `spans`, e.g. for tests."""
+
+    def __init__(self):
+        super().__init__()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def on_span(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+    def totals(self) -> dict[tuple[str, str], tuple[int, float]]:
+        """Number of spans and seconds spent, per kind and name of span."""
+        totals = {}
+        with self._lock:
+            for span in self.spans:
+                count, seconds = totals.get((span.kind, span.name), (0, 0.0))
+                totals[span.kind, span.name] = (count + 1, seconds + span.duration)
+        return totals
+
+
+_current_tracer: contextvars.ContextVar[Tracer | None] = contextvars.ContextVar(
+    "gradescopeapi_tracer", default=None
+)
+
+
+class _ActiveSpan:
+    __slots__ = ("tracer", "span")
+
+    def __init__(self, tracer: Tracer, span: Span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> "_ActiveSpan":
+        self.span.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.span.duration = time.perf_counter() - self.span.start
+        if exc_type is not None:
+            self.span.attributes["error"] = exc_type.__name__
+        self.tracer.on_span(self.span)
+
+    def set(self, **attributes) -> None:
+        self.span.attributes.update(attributes)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+    def set(self, **attributes) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(kind: str, name: str, **attributes) -> _ActiveSpan | _NoSpan:
+    """Time the `with` block as a span of the active tracer, if there is one.
+
+    `set(**attributes)` on the value of the `with` statement adds attributes
+    known at the end of the block, e.g. the number of objects built.
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return _NO_SPAN
+    return _ActiveSpan(tracer, Span(kind, name, attributes=attributes))
+
+
+def traced(method: Callable) -> Callable:
+    """Activate the `tracer` of an `Account` or `AsyncAccount` during a method, and time it."""
+    name = f"Account.{method.__name__}"
+
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            if self.tracer is None:
+                return await method(self, *args, **kwargs)
+            token = _current_tracer.set(self.tracer)
+            try:
+                with span("call", name):
+                    return await method(self, *args, **kwargs)
+            finally:
+                _current_tracer.reset(token)
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.tracer is None:
+            return method(self, *args, **kwargs)
+        token = _current_tracer.set(self.tracer)
+        try:
+            with span("call", name):
+                return method(self, *args, **kwargs)
+        finally:
+            _current_tracer.reset(token)
+
+    return wrapper
+
+
+def build_phase(
+    name: str, count: Callable[[Any], int] = len
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Time a function that builds objects from a page as a "build" span, with the number built."""
+
+    def decorator(function: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span("build", name) as build_span:
+                built = function(*args, **kwargs)
+                build_span.set(count=count(built))
+                return built
+
+        return wrapper
+
+    return decorator
+
+
+def url_template(url: str) -> str:
+    """The path of a URL with its IDs replaced by "{id}", to group the requests of an endpoint."""
+    return ID_SEGMENT_PATTERN.sub("/{id}", urllib.parse.urlsplit(url).path) or "/"
+
+
+def _http_span(
+    request_method: str,
+    url: str,
+    status: int,
+    size: int | None,
+    start: float,
+    end: float,
+) -> Span:
+    template = url_template(url)
+    return Span(
+        "http",
+        f"{request_method} {template}",
+        start,
+        end - start,
+        {
+            "method": request_method,
+            "url_template": template,
+            "status": status,
+            "bytes": size,
+        },
+    )
+
+
+def _content_length(headers) -> int | None:
+    value = headers.get("Content-Length")
+    return int(value) if value is not None and value.isdigit() else None
+
+
+def install_tracing_hook(
+    session: "requests.Session | httpx.AsyncClient", tracer: Tracer
+) -> None:
+    """Send a span to `tracer` for every response a session or client receives."""
+    if isinstance(session, requests.Session):
+
+        def record(response: requests.Response, *args, **kwargs) -> None:
+            end = time.perf_counter()
+            # leave the bodies of streamed responses to the caller
+            size = (
+                _content_length(response.headers)
+                if kwargs.get("stream")
+                else len(response.content)
+            )
+            tracer.on_span(
+                _http_span(
+                    response.request.method,
+                    response.url,
+                    response.status_code,
+                    size,
+                    end - response.elapsed.total_seconds(),
+                    end,
+                )
+            )
+
+        session.hooks["response"].append(record)
+        return
+
+    async def start_async(request: "httpx.Request") -> None:
+        request.extensions[_TRACE_START] = time.perf_counter()
+
+    async def record_async(response: "httpx.Response") -> None:
+        end = time.perf_counter()
+        request = response.request
+        tracer.on_span(
+            _http_span(
+                request.method,
+                str(request.url),
+                response.status_code,
+                _content_length(response.headers),
+                request.extensions.get(_TRACE_START, end),
+                end,
+            )
+        )
+
+    session.event_hooks["request"].append(start_async)
+    session.event_hooks["response"].append(record_async)
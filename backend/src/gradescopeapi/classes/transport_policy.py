@@ -0,0 +1,323 @@
+"""Retries, rate limits and circuit breaking for the requests of a connection.
+
+Every request of a `GSConnection` or `AsyncGSConnection` goes through its
+`TransportPolicy`, so the page helpers, the bulk functions and the FastAPI
+server all get the same behaviour:
+
+- requests that failed without being processed (connection errors, 429, 503)
+  are retried with exponential backoff and full jitter, waiting at least as
+  long as the `Retry-After` header asks for. 500, 502, 504 and read errors are
+  only retried for idempotent methods, so an upload or a date change is never
+  applied twice. Requests with a streamed body, such as uploads, can't be
+  sent again and are never retried,
+- requests to a host can be rate limited with a `TokenBucket`,
+- a host that keeps failing is not sent any requests for `reset_timeout`
+  seconds, after which a single request probes whether it has recovered.
+
+Example:
+    policy = TransportPolicy(retries=5, requests_per_second=20)
+    connection = GSConnection(transport_policy=policy)
+
+A policy can be shared between connections to share their rate limits and
+circuits. `PolicyAdapter` applies it to a `requests` session, and
+`PolicyTransport` (in `async_transport_policy`, which imports httpx) to an
+`httpx` client.
+"""
+
+import datetime
+import email.utils
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_REQUESTS_PER_SECOND,
+    TokenBucket,
+)
+
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# the server did not process the request, so any method can be sent again
+UNPROCESSED_STATUS_CODES = frozenset({429, 503})
+# the server may have processed the request
+FAILED_STATUS_CODES = frozenset({500, 502, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+@dataclass
+class TransportStats:
+    """Counters of a policy, to tune its limits."""
+
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    rejected: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record(
+        self, requests: int = 0, retries: int = 0, throttled: int = 0, rejected: int = 0
+    ) -> None:
+        with self._lock:
+            self.requests += requests
+            self.retries += retries
+            self.throttled += throttled
+            self.rejected += rejected
+
+
+class _Circuit:
+    """Consecutive failures of a host, and when its circuit was opened."""
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+
+class TransportPolicy:
+    """How the requests of a connection are retried, rate limited and cut off.
+
+    Args:
+        retries (int, optional): Maximum number of retries of a request. Defaults to DEFAULT_RETRIES.
+        backoff (float, optional): Upper bound of the first retry delay in seconds, doubled for every
+            other retry. Delays are drawn uniformly below it (full jitter). Defaults to DEFAULT_BACKOFF.
+        max_backoff (float, optional): Upper bound of any retry delay, including the ones asked for
+            by Retry-After. A response asking to wait longer is returned. Defaults to DEFAULT_MAX_BACKOFF.
+        requests_per_second (float | None, optional): Rate limit of every host, or None for no limit.
+            Defaults to None.
+        burst (float, optional): Number of requests a host can be sent at once. Defaults to 1.
+        failure_threshold (int | None, optional): Number of consecutive failures (connection errors and
+            5xx statuses, after retries) that open the circuit of a host, or None to never open it.
+            Defaults to DEFAULT_FAILURE_THRESHOLD.
+        reset_timeout (float, optional): Seconds before an open circuit lets a request through to
+            probe the host. Defaults to DEFAULT_RESET_TIMEOUT.
+    """
+
+    def __init__(
+        self,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        requests_per_second: float | None = None,
+        burst: float = 1.0,
+        failure_threshold: int | None = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ):
+        if retries < 0:
+            raise ValueError("retries must not be negative")
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.stats = TransportStats()
+        self._rate_limiters: dict[str, TokenBucket] = {}
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, host: str) -> float:
+        """Admit a request to a host, and return the number of seconds to wait before sending it.
+
+        Raises:
+            CircuitOpenError: If the circuit of the host is open.
+        """
+        with self._lock:
+            circuit = self._circuits.setdefault(host, _Circuit())
+            if self._is_open(circuit):
+                if (
+                    circuit.probing
+                    or time.monotonic() - circuit.opened_at < self.reset_timeout
+                ):
+                    self.stats.record(rejected=1)
+                    raise CircuitOpenError(
+                        f"{host} failed {circuit.failures} times in a row, "
+                        f"not sending requests for {self.reset_timeout} seconds"
+                    )
+                # half open: let this request through to probe the host
+                circuit.probing = True
+            rate_limiter = self._rate_limiters.get(host)
+            if rate_limiter is None and self.requests_per_second:
+                rate_limiter = self._rate_limiters[host] = TokenBucket(
+                    self.requests_per_second, self.burst
+                )
+
+        self.stats.record(requests=1)
+        delay = rate_limiter.reserve() if rate_limiter is not None else 0.0
+        if delay > 0:
+            self.stats.record(throttled=1)
+        return delay
+
+    def record(self, host: str, failed: bool) -> None:
+        """Record the final outcome of a request to a host, to open or close its circuit."""
+        with self._lock:
+            circuit = self._circuits.setdefault(host, _Circuit())
+            circuit.probing = False
+            if not failed:
+                circuit.failures = 0
+                return
+            circuit.failures += 1
+            if self._is_open(circuit):
+                circuit.opened_at = time.monotonic()
+
+    def release(self, host: str) -> None:
+        """Forget a request to a host that ended without an outcome, e.g. because it was cancelled."""
+        with self._lock:
+            self._circuits.setdefault(host, _Circuit()).probing = False
+
+    def _is_open(self, circuit: _Circuit) -> bool:
+        return (
+            self.failure_threshold is not None
+            and circuit.failures >= self.failure_threshold
+        )
+
+    def retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        replayable: bool,
+        status_code: int | None = None,
+        retry_after: str | None = None,
+        unsent: bool = False,
+    ) -> float | None:
+        """Seconds to wait before sending a request again, or None if it must not be retried.
+
+        Args:
+            method (str): Method of the request.
+            attempt (int): Number of retries made so far.
+            replayable (bool): Whether the body of the request can be sent again.
+            status_code (int | None, optional): Status code of the response, or None if the request
+                failed with a connection error. Defaults to None.
+            retry_after (str | None, optional): Retry-After header of the response. Defaults to None.
+            unsent (bool, optional): Whether the connection error happened before the request was
+                sent, e.g. when connecting. Defaults to False.
+        """
+        if attempt >= self.retries or not replayable:
+            return None
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if status_code is None:
+            retryable = idempotent or unsent
+        else:
+            retryable = status_code in UNPROCESSED_STATUS_CODES or (
+                idempotent and status_code in FAILED_STATUS_CODES
+            )
+        if not retryable:
+            return None
+
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        wait = _parse_retry_after(retry_after)
+        if wait is not None:
+            if wait > self.max_backoff:
+                return None
+            delay = max(delay, wait)
+        return delay
+
+
+def _parse_retry_after(retry_after: str | None) -> float | None:
+    """Read a Retry-After header, given in seconds or as an HTTP date."""
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(
+        0.0, (date - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+    )
+
+
+def _failed(status_code: int | None) -> bool:
+    """Whether the outcome of a request counts towards opening the circuit of its host."""
+    return status_code is None or status_code >= 500
+
+
+def bulk_rate_limiter(
+    session, url: str, requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND
+) -> TokenBucket | None:
+    """Rate limiter for the workers of a bulk helper that sends many requests to `url`.
+
+    None if the `TransportPolicy` of the session or client already limits the rate of requests,
+    so that the two limits don't stack. Otherwise, e.g. for a session not made by a connection,
+    a `TokenBucket` of `requests_per_second`, or None if that is None.
+    """
+    if isinstance(session, requests.Session):
+        try:
+            policy = getattr(session.get_adapter(url), "policy", None)
+        except requests.exceptions.InvalidSchema:
+            policy = None
+    else:
+        # httpx keeps the transport of a client in _transport
+        policy = getattr(getattr(session, "_transport", None), "policy", None)
+    if isinstance(policy, TransportPolicy) and policy.requests_per_second:
+        return None
+    return TokenBucket(requests_per_second) if requests_per_second else None
+
+
+class PolicyAdapter(BaseAdapter):
+    """`requests` transport adapter that sends requests through another adapter with a `TransportPolicy`."""
+
+    def __init__(self, adapter: BaseAdapter, policy: TransportPolicy):
+        super().__init__()
+        self.adapter = adapter
+        self.policy = policy
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        host = urlsplit(request.url).netloc
+        replayable = request.body is None or isinstance(request.body, (bytes, str))
+        attempt = 0
+        while True:
+            delay = self.policy.reserve(host)
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                response = self.adapter.send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = self.policy.retry_delay(
+                    request.method,
+                    attempt,
+                    replayable,
+                    unsent=isinstance(e, requests.ConnectTimeout),
+                )
+                if delay is None:
+                    self.policy.record(host, failed=True)
+                    raise
+            except BaseException:
+                self.policy.release(host)
+                raise
+            else:
+                delay = self.policy.retry_delay(
+                    request.method,
+                    attempt,
+                    replayable,
+                    response.status_code,
+                    response.headers.get("Retry-After"),
+                )
+                if delay is None:
+                    self.policy.record(host, _failed(response.status_code))
+                    return response
+                response.close()
+            attempt += 1
+            self.policy.stats.record(retries=1)
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self.adapter.close()
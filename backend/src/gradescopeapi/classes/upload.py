@@ -1,82 +1,473 @@
-"""Functions for uploading assignments to Gradescope."""
+"""Functions for uploading assignments to Gradescope.
 
+Files are streamed to Gradescope in chunks as the request is sent, so uploads
+take constant memory whatever their size. They can be given as paths, binary
+file objects, or `(filename, file)` pairs for file-like objects without a name
+such as `mmap.mmap` or `io.BytesIO`. Text file objects are read through their
+binary buffer.
+"""
+
+import contextlib
 import io
 import mimetypes
+import mmap
+import os
 import pathlib
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, BinaryIO
 
 import requests
-from bs4 import BeautifulSoup
-from requests_toolbelt.multipart.encoder import MultipartEncoder
 
-from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL, DEFAULT_PARSER_BACKEND
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    SingleFlight,
+    run_concurrently,
+    run_concurrently_async,
+)
+from gradescopeapi.classes._helpers._csrf_helpers import (
+    fetch_csrf_token,
+    fetch_csrf_token_async,
+    send_with_csrf_token,
+    send_with_csrf_token_async,
+)
+from gradescopeapi.classes.result_cache import invalidate_course
+from gradescopeapi.classes.transport_policy import bulk_rate_limiter
+
+if TYPE_CHECKING:
+    import httpx
+
+SubmissionFile = (
+    str | os.PathLike | BinaryIO | io.TextIOWrapper | tuple[str, BinaryIO | mmap.mmap]
+)
+
+# called with the number of bytes of the files sent so far, and their total size
+ProgressCallback = Callable[[int, int], None]
 
 
 def upload_assignment(
     session: requests.Session,
     course_id: str,
     assignment_id: str,
-    *files: io.TextIOWrapper,
+    *files: SubmissionFile,
     leaderboard_name: str | None = None,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+    progress: ProgressCallback | None = None,
 ) -> str | None:
-    """Uploads given file objects to the specified assignment on Gradescope.
+    """Uploads given files to the specified assignment on Gradescope.
 
     Args:
         session (requests.Session): The session object to use for making HTTP requests.
         course_id (str): The ID of the course on Gradescope.
         assignment_id (str): The ID of the assignment on Gradescope.
-        *files (io.TextIOWrapper): Variable number of file objects to upload.
+        *files (SubmissionFile): Variable number of paths, binary file objects or (filename, file) pairs to upload.
         leaderboard_name (str | None, optional): The name of the leaderboard. Defaults to None.
+        progress (ProgressCallback | None, optional): Called with the bytes sent and the total as the
+            files are sent. Defaults to None.
 
     Returns:
         str | None: Link to submission if successful or None if unsuccessful.
     """
+    GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
+    return _upload_assignment(
+        session,
+        course_id,
+        assignment_id,
+        files,
+        leaderboard_name,
+        gradescope_base_url,
+        progress,
+        fetch_csrf_token(session, GS_COURSE_ENDPOINT, parser_backend),
+    )
+
+
+def _upload_assignment(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    files: tuple[SubmissionFile, ...],
+    leaderboard_name: str | None,
+    gradescope_base_url: str,
+    progress: ProgressCallback | None,
+    fetch_token: Callable[[], str],
+) -> str | None:
     GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
     GS_UPLOAD_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/submissions"
 
-    # Get auth token
-    # TODO: Refactor to helper function since it is needed in multiple places
-    response = session.get(GS_COURSE_ENDPOINT)
-    soup = BeautifulSoup(response.text, "html.parser")
-    auth_token = soup.find("meta", {"name": "csrf-token"})["content"]
+    with contextlib.ExitStack() as stack:
+        upload = _UploadFiles(files, stack, progress)
 
-    # Format files for upload
-    form_files = []
-    for file in files:
-        form_files.append(
-            (
-                "submission[files][]",
-                (
-                    pathlib.Path(file.name).name,  # get the filename from the path
-                    file,
-                    mimetypes.guess_type(file.name)[0],
-                ),
+        def send(auth_token: str) -> requests.Response:
+            from requests_toolbelt.multipart.encoder import MultipartEncoder
+
+            upload.rewind()
+            # Setup multipart form data, read from the files while the request is sent
+            fields = [
+                *_upload_form_fields(auth_token, leaderboard_name),
+                *upload.form_files(),
+            ]
+            multipart = MultipartEncoder(fields=fields)
+
+            headers = {
+                "Content-Type": multipart.content_type,
+                "Referer": GS_COURSE_ENDPOINT,
+            }
+            return session.post(GS_UPLOAD_ENDPOINT, data=multipart, headers=headers)
+
+        # Use the cached auth token, only getting the course page for one if needed
+        response = send_with_csrf_token(session, fetch_token, send)
+    invalidate_course(session, course_id)
+
+    return _submission_link(response.url, GS_COURSE_ENDPOINT)
+
+
+async def upload_assignment_async(
+    client: "httpx.AsyncClient",
+    course_id: str,
+    assignment_id: str,
+    *files: SubmissionFile,
+    leaderboard_name: str | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+    progress: ProgressCallback | None = None,
+) -> str | None:
+    """Uploads given files to the specified assignment on Gradescope.
+    Asynchronous version of `upload_assignment`.
+
+    Args:
+        client (httpx.AsyncClient): The client object to use for making HTTP requests.
+        course_id (str): The ID of the course on Gradescope.
+        assignment_id (str): The ID of the assignment on Gradescope.
+        *files (SubmissionFile): Variable number of paths, binary file objects or (filename, file) pairs to upload.
+        leaderboard_name (str | None, optional): The name of the leaderboard. Defaults to None.
+        progress (ProgressCallback | None, optional): Called with the bytes sent and the total as the
+            files are sent. Defaults to None.
+
+    Returns:
+        str | None: Link to submission if successful or None if unsuccessful.
+    """
+    GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
+    return await _upload_assignment_async(
+        client,
+        course_id,
+        assignment_id,
+        files,
+        leaderboard_name,
+        gradescope_base_url,
+        progress,
+        fetch_csrf_token_async(client, GS_COURSE_ENDPOINT, parser_backend),
+    )
+
+
+async def _upload_assignment_async(
+    client: "httpx.AsyncClient",
+    course_id: str,
+    assignment_id: str,
+    files: tuple[SubmissionFile, ...],
+    leaderboard_name: str | None,
+    gradescope_base_url: str,
+    progress: ProgressCallback | None,
+    fetch_token: Callable[[], Awaitable[str]],
+) -> str | None:
+    GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
+    GS_UPLOAD_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/submissions"
+
+    with contextlib.ExitStack() as stack:
+        upload = _UploadFiles(files, stack, progress)
+
+        async def send(auth_token: str) -> "httpx.Response":
+            upload.rewind()
+            # Send as multipart form data: (None, value) marks a field without a filename
+            form_fields = [
+                (name, (None, value))
+                for name, value in _upload_form_fields(auth_token, leaderboard_name)
+            ]
+            return await client.post(
+                GS_UPLOAD_ENDPOINT,
+                files=[*form_fields, *upload.form_files()],
+                headers={"Referer": GS_COURSE_ENDPOINT},
             )
-        )
 
-    # Setup multipart form data
+        # Use the cached auth token, only getting the course page for one if needed
+        response = await send_with_csrf_token_async(client, fetch_token, send)
+    invalidate_course(client, course_id)
+
+    return _submission_link(str(response.url), GS_COURSE_ENDPOINT)
+
+
+@dataclass
+class UploadJob:
+    """One submission of `upload_assignments`: files to upload to an assignment."""
+
+    course_id: str
+    assignment_id: str
+    files: tuple[SubmissionFile, ...]
+    leaderboard_name: str | None = None
+
+
+@dataclass
+class UploadResult:
+    """Outcome of an `UploadJob`: the link to the submission, or why there is none."""
+
+    job: UploadJob
+    submission_link: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.submission_link is not None
+
+
+def upload_assignments(
+    session: requests.Session,
+    jobs: Iterable[UploadJob],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+) -> Iterator[UploadResult]:
+    """Upload many submissions concurrently, yielding the result of each as it finishes.
+
+    The cached CSRF token is used for every upload. When it is missing or rejected, the
+    uploads to a course that need a fresh one wait for a single fetch of its page.
+
+    Args:
+        session (requests.Session): The session object to use for making HTTP requests.
+        jobs (Iterable[UploadJob]): The submissions to upload. The same file can be uploaded by
+            many jobs through its path, but not through a shared file object.
+        max_workers (int, optional): Maximum number of concurrent uploads. Defaults to DEFAULT_MAX_WORKERS.
+        requests_per_second (float | None, optional): Rate limit shared by all workers, used only when
+            the `TransportPolicy` of the session has none. None for no limit. Defaults to
+            DEFAULT_REQUESTS_PER_SECOND.
+
+    Returns:
+        Iterator[UploadResult]: A result for every job in the order the uploads finish. A failed
+        upload does not stop the others.
+
+    Raises:
+        ValueError: If a file object is given to more than one job.
+    """
+    jobs = list(jobs)
+    _check_unshared_files(jobs)
+    token_fetches = SingleFlight()
+
+    def upload(job: UploadJob) -> UploadResult:
+        GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{job.course_id}"
+        fetch_token = fetch_csrf_token(session, GS_COURSE_ENDPOINT, parser_backend)
+        try:
+            submission_link = _upload_assignment(
+                session,
+                job.course_id,
+                job.assignment_id,
+                job.files,
+                job.leaderboard_name,
+                gradescope_base_url,
+                None,
+                lambda: token_fetches.do(job.course_id, fetch_token),
+            )
+        except Exception as e:
+            return UploadResult(job, error=_failure_reason(e))
+        return _upload_result(job, submission_link)
+
+    rate_limiter = bulk_rate_limiter(session, gradescope_base_url, requests_per_second)
+    return (
+        result
+        for _, result in run_concurrently(upload, jobs, max_workers, rate_limiter)
+    )
+
+
+def upload_assignments_async(
+    client: "httpx.AsyncClient",
+    jobs: Iterable[UploadJob],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+) -> AsyncIterator[UploadResult]:
+    """Asynchronous version of `upload_assignments`.
+
+    Returns:
+        AsyncIterator[UploadResult]: A result for every job in the order the uploads finish.
+    """
+    jobs = list(jobs)
+    _check_unshared_files(jobs)
+    token_fetches = SingleFlight()
+
+    async def upload(job: UploadJob) -> UploadResult:
+        GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{job.course_id}"
+        fetch_token = fetch_csrf_token_async(client, GS_COURSE_ENDPOINT, parser_backend)
+        try:
+            submission_link = await _upload_assignment_async(
+                client,
+                job.course_id,
+                job.assignment_id,
+                job.files,
+                job.leaderboard_name,
+                gradescope_base_url,
+                None,
+                lambda: token_fetches.do_async(job.course_id, fetch_token),
+            )
+        except Exception as e:
+            return UploadResult(job, error=_failure_reason(e))
+        return _upload_result(job, submission_link)
+
+    rate_limiter = bulk_rate_limiter(client, gradescope_base_url, requests_per_second)
+
+    async def results() -> AsyncIterator[UploadResult]:
+        async for _, result in run_concurrently_async(
+            upload, jobs, max_workers, rate_limiter
+        ):
+            yield result
+
+    return results()
+
+
+def _check_unshared_files(jobs: list[UploadJob]) -> None:
+    """Concurrent uploads would read a shared file object from the same position."""
+    file_objects = set()
+    for job in jobs:
+        for file in job.files:
+            if isinstance(file, tuple):
+                file = file[1]
+            if isinstance(file, (str, os.PathLike)):
+                continue
+            if id(file) in file_objects:
+                raise ValueError(
+                    f"{file!r} is uploaded more than once, pass its path instead"
+                )
+            file_objects.add(id(file))
+
+
+def _upload_result(job: UploadJob, submission_link: str | None) -> UploadResult:
+    if submission_link is None:
+        # Gradescope redirects back instead of showing an error, e.g. after the due date
+        return UploadResult(job, error="Gradescope did not accept the submission")
+    return UploadResult(job, submission_link)
+
+
+def _failure_reason(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
+
+def _upload_form_fields(
+    auth_token: str, leaderboard_name: str | None
+) -> list[tuple[str, str]]:
+    """Build the non-file form fields for the submissions endpoint."""
     fields = [
         ("utf8", "✓"),
         ("authenticity_token", auth_token),
         ("submission[method]", "upload"),
-        *form_files,
     ]
     if leaderboard_name is not None:
         fields.append(("submission[leaderboard_name]", leaderboard_name))
+    return fields
+
+
+class _UploadFiles:
+    """Files of an upload, opened for reading in binary mode, and the bytes sent of them."""
+
+    def __init__(
+        self,
+        files: tuple[SubmissionFile, ...],
+        stack: contextlib.ExitStack,
+        progress: ProgressCallback | None,
+    ):
+        self.files = []
+        for file in files:
+            if isinstance(file, tuple):
+                name, file = file
+            elif isinstance(file, (str, os.PathLike)):
+                name = os.fspath(file)
+                file = stack.enter_context(open(file, "rb"))
+            else:
+                name = file.name
+                if isinstance(file, io.TextIOBase):
+                    file = file.buffer
+            # each file is sent from its current position to its end
+            self.files.append(_FileSection(name, file, self))
+
+        self.total = sum(section.size for section in self.files)
+        self.sent = 0
+        self.progress = progress
+
+    def rewind(self) -> None:
+        """Go back to the start of the files, e.g. to send them again after a retry."""
+        for section in self.files:
+            section.seek(0)
+        self.sent = 0
+
+    def count(self, size: int) -> None:
+        self.sent += size
+        if self.progress is not None:
+            self.progress(self.sent, self.total)
+
+    def form_files(self) -> list[tuple]:
+        """Format the files as (field name, (filename, file, mimetype)) pairs."""
+        return [
+            (
+                "submission[files][]",
+                (
+                    pathlib.Path(section.name).name,  # get the filename from the path
+                    section,
+                    mimetypes.guess_type(section.name)[0],
+                ),
+            )
+            for section in self.files
+        ]
+
+
+class _FileSection:
+    """Read-only view of a file from the position it was at, counting the bytes read.
+
+    Both multipart encoders read it in chunks while the request is sent: `requests_toolbelt`
+    asks for the bytes left with `len`, and `httpx` seeks to its start and end.
+    """
+
+    def __init__(self, name: str, file: BinaryIO | mmap.mmap, upload: _UploadFiles):
+        self.name = name
+        self._file = file
+        self._upload = upload
+        self._start = file.tell()
+        # mmap.seek returns None before Python 3.13
+        file.seek(0, io.SEEK_END)
+        self.size = file.tell() - self._start
+        file.seek(self._start)
+
+    @property
+    def len(self) -> int:
+        return self.size - self.tell()
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.len:
+            size = self.len
+        data = self._file.read(size)
+        self._upload.count(len(data))
+        return data
+
+    def tell(self) -> int:
+        return self._file.tell() - self._start
 
-    multipart = MultipartEncoder(fields=fields)
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            offset += self._start
+        elif whence == io.SEEK_END:
+            offset += self._start + self.size
+        else:
+            offset += self._file.tell()
+        self._file.seek(offset)
+        return self.tell()
 
-    headers = {
-        "Content-Type": multipart.content_type,
-        "Referer": GS_COURSE_ENDPOINT,
-    }
-    response = session.post(GS_UPLOAD_ENDPOINT, data=multipart, headers=headers)
 
+def _submission_link(response_url: str, course_endpoint: str) -> str | None:
+    """Interpret the URL the submissions endpoint redirected to."""
     # Note: Response status code is always 200 even if upload was unsuccessful (e.g. past the due date,
     # missing form fields, etc.). The response from the server either redirects to the submission page (url)
     # if successful, or redirects to the Course homepage if unsuccessful.
     return (
         None
-        if response.url == GS_COURSE_ENDPOINT or response.url.endswith("submissions")
-        else response.url
+        if response_url == course_endpoint or response_url.endswith("submissions")
+        else response_url
     )
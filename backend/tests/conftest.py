@@ -1,9 +1,19 @@
+import hashlib
+import html
+import json
 import os
+import pathlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
+import httpx
 import pytest
 from dotenv import load_dotenv
+from requests.structures import CaseInsensitiveDict
 
+from gradescopeapi.classes.async_connection import AsyncGSConnection
 from gradescopeapi.classes.connection import GSConnection
+from tests.fake_gradescope import FakeGradescope, FakeGradescopeServer, generate_dataset
 
 load_dotenv()
 
@@ -12,6 +22,190 @@ GRADESCOPE_CI_STUDENT_PASSWORD = os.getenv("GRADESCOPE_CI_STUDENT_PASSWORD")
 GRADESCOPE_CI_INSTRUCTOR_EMAIL = os.getenv("GRADESCOPE_CI_INSTRUCTOR_EMAIL")
 GRADESCOPE_CI_INSTRUCTOR_PASSWORD = os.getenv("GRADESCOPE_CI_INSTRUCTOR_PASSWORD")
 
+BASE_URL = "https://gradescope.test"
+COURSE_ID = "753413"
+ASSIGNMENT_ID = "4330410"
+PASSWORD = "correct horse"
+
+HOMEPAGE = """
+<form action="/login"><input name="authenticity_token" value="login-token"></form>
+"""
+ACCOUNT_PAGE = f"""
+<meta name="csrf-token" content="csrf-token">
+<h1 class="pageHeading">Your Courses</h1>
+<button> Create a new course</button>
+<div class="courseList">
+  <div class="courseList--term">Fall 2024
+    <a href="/courses/{COURSE_ID}">
+      <h3 class="courseBox--shortname">CS 1134</h3>
+      <div class="courseBox--name">Data Structures</div>
+      <div class="courseBox--noGradesPublised">0 grades published</div>
+      <div class="courseBox--assignments courseBox--assignments-unpublished">5 assignments</div>
+    </a>
+  </div>
+</div>
+"""
+EXTENSION_PROPS = {
+    "override": {
+        "user_id": 6515875,
+        "settings": {"due_date": {"value": "2024-04-16T00:00:00"}},
+    },
+    "timezone": {"identifier": "America/New_York"},
+    "deletePath": f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/extensions/1",
+    "studentName": "Ada Lovelace",
+}
+EXTENSIONS_PAGE = f"""
+<table class="table js-overridesTable"><tbody><tr><td>
+<div data-react-class="EditExtension" data-react-props="{html.escape(json.dumps(EXTENSION_PROPS))}"></div>
+</td></tr></tbody></table>
+"""
+
+
+def gradescope_handler(request: httpx.Request) -> httpx.Response:
+    """Minimal stand-in for the Gradescope pages used by the async client."""
+    path = request.url.path
+    logged_in = "signed_token" in request.headers.get("cookie", "")
+
+    if path == "/" and request.method == "GET":
+        return httpx.Response(
+            200,
+            text=HOMEPAGE,
+            headers={"set-cookie": "_gradescope_session=anon; path=/"},
+        )
+    if path == "/login":
+        if request.url.params.get("session[password]") != PASSWORD:
+            return httpx.Response(200, text='<div class="alert-error">Bad login</div>')
+        return httpx.Response(
+            302,
+            headers={
+                "location": f"{BASE_URL}/account",
+                "set-cookie": "signed_token=abc; path=/",
+            },
+        )
+    if not logged_in:
+        return httpx.Response(
+            401, json={"error": "You must be logged in to access this page."}
+        )
+    if path == "/account":
+        return httpx.Response(200, text=ACCOUNT_PAGE)
+    if path == f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/extensions":
+        if request.method == "POST":
+            assert request.headers["x-csrf-token"] == "csrf-token"
+            return httpx.Response(200, json={})
+        return httpx.Response(200, text=EXTENSIONS_PAGE)
+    if path == f"/courses/{COURSE_ID}":
+        return httpx.Response(200, text=ACCOUNT_PAGE)
+    if path == f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/submissions":
+        assert b'name="authenticity_token"' in request.read()
+        return httpx.Response(302, headers={"location": f"{BASE_URL}{path}/123"})
+    if path.endswith("/submissions/123"):
+        return httpx.Response(200, text="submission")
+    return httpx.Response(404)
+
+
+async def login(password=PASSWORD) -> AsyncGSConnection:
+    connection = AsyncGSConnection(
+        BASE_URL, transport=httpx.MockTransport(gradescope_handler)
+    )
+    await connection.login("student@example.com", password)
+    return connection
+
+
+FIXTURES = pathlib.Path(__file__).parent / "html_fixtures"
+
+
+class Response:
+    """The parts of a `requests.Response` read by the package, for sessions faked in tests."""
+
+    def __init__(self, url, status_code=200, content=b"", headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.text = content.decode()
+        self.history = []
+
+
+class TokenSession:
+    """Accepts mutations carrying the current token, and serves it on every page."""
+
+    def __init__(self, cached_token=None, token="fresh"):
+        self.headers = {} if cached_token is None else {"X-CSRF-Token": cached_token}
+        self.token = token
+        self.requests = []
+        self.bodies = []
+
+    def get(self, url):
+        self.requests.append("GET")
+        page = f'<meta name="csrf-token" content="{self.token}">'
+        return Response(url, content=page.encode())
+
+    def post(self, url, data=None, headers=None, json=None):
+        self.requests.append("POST")
+        body = data.to_string()
+        self.bodies.append(body)
+        accepted = f'name="authenticity_token"\r\n\r\n{self.token}\r\n'.encode()
+        return Response(url, status_code=200 if accepted in body else 422)
+
+
+class PageServer(ThreadingHTTPServer):
+    """Serves saved pages with ETags and answers matching conditional requests with 304."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), PageHandler)
+        self.pages = {
+            "/account": (FIXTURES / "account.html").read_bytes(),
+            "/courses/753413/memberships": (FIXTURES / "memberships.html").read_bytes(),
+        }
+        self.requests = []
+        self.etags = True
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        page = self.server.pages.get(self.path)
+        if page is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        etag = f'W/"{hashlib.md5(page).hexdigest()}"'
+        if self.server.etags and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Set-Cookie", "_gradescope_session=rotated; path=/")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        if self.server.etags:
+            self.send_header("ETag", etag)
+        else:
+            self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """A `PageServer` on localhost serving the saved account and memberships pages."""
+    server = PageServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
 
 @pytest.fixture
 def create_session():
@@ -36,3 +230,10 @@ def create_session():
         return connection.session
 
     return _create_session
+
+
+@pytest.fixture
+def fake_gradescope():
+    """A fake Gradescope serving a small synthetic dataset on localhost."""
+    with FakeGradescopeServer(FakeGradescope(generate_dataset())) as server:
+        yield server
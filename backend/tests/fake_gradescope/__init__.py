@@ -0,0 +1,27 @@
+"""A fake Gradescope, to run tests and benchmarks without network access or credentials.
+
+`generate_dataset` builds synthetic courses of any size, `FakeGradescope` is a
+WSGI app that serves them the way Gradescope does, and `FakeGradescopeServer`
+serves the app on localhost, for `GSConnection` and `AsyncGSConnection` to
+connect to like to the real site:
+
+    dataset = generate_dataset(students=SCALES["large"])
+    with FakeGradescopeServer(FakeGradescope(dataset)) as server:
+        connection = GSConnection(server.base_url)
+        connection.login(dataset.email, dataset.password)
+
+Run `python -m tests.fake_gradescope --students 1000` from `backend` to serve
+a dataset until interrupted.
+"""
+
+from tests.fake_gradescope.app import FakeGradescope
+from tests.fake_gradescope.dataset import SCALES, Dataset, generate_dataset
+from tests.fake_gradescope.server import FakeGradescopeServer
+
+__all__ = [
+    "SCALES",
+    "Dataset",
+    "FakeGradescope",
+    "FakeGradescopeServer",
+    "generate_dataset",
+]
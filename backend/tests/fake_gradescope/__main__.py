@@ -0,0 +1,33 @@
+import argparse
+import threading
+
+from tests.fake_gradescope import (
+    SCALES,
+    FakeGradescope,
+    FakeGradescopeServer,
+    generate_dataset,
+)
+
+parser = argparse.ArgumentParser(description="Serve a fake Gradescope on localhost.")
+parser.add_argument("--students", type=int, default=SCALES["small"])
+parser.add_argument("--courses", type=int, default=1)
+parser.add_argument("--assignments", type=int, default=5)
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response.")
+parser.add_argument("--port", type=int, default=8025)
+args = parser.parse_args()
+
+dataset = generate_dataset(
+    students=args.students,
+    courses=args.courses,
+    assignments=args.assignments,
+    seed=args.seed,
+)
+with FakeGradescopeServer(
+    FakeGradescope(dataset, args.latency), port=args.port
+) as server:
+    print(f"Serving {server.base_url}, log in as {dataset.email} / {dataset.password}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
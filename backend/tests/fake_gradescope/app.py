@@ -0,0 +1,517 @@
+"""WSGI app that serves a `Dataset` the way Gradescope serves its pages.
+
+Only the pages and endpoints this package reads or sends to are served, with
+just the markup its parsers look at. Changes (dates, extensions, uploads)
+are applied to the dataset, so they show up on the next page load. Unlike
+Gradescope, uploads are accepted after the due date.
+"""
+
+import datetime
+import email.parser
+import email.policy
+import hashlib
+import html
+import http
+import http.cookies
+import itertools
+import json
+import re
+import secrets
+import threading
+import time
+import urllib.parse
+import zoneinfo
+from collections import Counter
+from collections.abc import Callable, Iterable
+
+from tests.fake_gradescope.dataset import (
+    TIMEZONE,
+    Dataset,
+    FakeExtension,
+    FakeSubmission,
+)
+
+LOGIN_TOKEN = "fake-login-token"
+NOT_LOGGED_IN = "You must be logged in to access this page."
+ROLES = {0: "Student", 1: "Instructor", 2: "TA"}
+
+
+class FakeResponse:
+    def __init__(
+        self,
+        status: int = 200,
+        body: bytes | str = b"",
+        content_type: str = "text/html; charset=utf-8",
+        headers: Iterable[tuple[str, str]] = (),
+    ):
+        self.status = status
+        self.body = body.encode() if isinstance(body, str) else body
+        self.headers = [("Content-Type", content_type), *headers]
+
+
+def _json_response(status: int, payload) -> FakeResponse:
+    return FakeResponse(status, json.dumps(payload), "application/json")
+
+
+def _redirect(location: str, headers: Iterable[tuple[str, str]] = ()) -> FakeResponse:
+    return FakeResponse(302, headers=[("Location", location), *headers])
+
+
+def _page(title: str, csrf_token: str, content: str) -> str:
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta name="csrf-token" content="{csrf_token}">
+  <title>{html.escape(title)} | Gradescope</title>
+</head>
+<body class="l-app">
+<div class="l-content">
+{content}
+</div>
+</body>
+</html>"""
+
+
+def _props(react_class: str, props: dict) -> str:
+    return f'<div data-react-class="{react_class}" data-react-props="{html.escape(json.dumps(props))}"></div>'
+
+
+class _Request:
+    def __init__(self, environ: dict, match: re.Match):
+        self.method = environ["REQUEST_METHOD"]
+        self.params = match.groupdict()
+        self.query = urllib.parse.parse_qs(environ.get("QUERY_STRING", ""))
+        self.headers = {
+            key[5:].replace("_", "-").lower(): value
+            for key, value in environ.items()
+            if key.startswith("HTTP_")
+        }
+        self.content_type = environ.get("CONTENT_TYPE", "")
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        self.body = environ["wsgi.input"].read(length) if length else b""
+        cookies = http.cookies.SimpleCookie(self.headers.get("cookie", ""))
+        self.cookies = {name: morsel.value for name, morsel in cookies.items()}
+
+    def form(self) -> dict[str, list]:
+        """Fields of a urlencoded or multipart body. Files are (filename, content) pairs."""
+        if self.content_type.startswith("multipart/form-data"):
+            message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+                f"Content-Type: {self.content_type}\r\n\r\n".encode() + self.body
+            )
+            fields = {}
+            for part in message.iter_parts():
+                name = part.get_param("name", header="content-disposition")
+                content = part.get_payload(decode=True) or b""
+                filename = part.get_filename()
+                value = (filename, content) if filename else content.decode()
+                fields.setdefault(name, []).append(value)
+            return fields
+        return urllib.parse.parse_qs(self.body.decode())
+
+    def field(self, name: str) -> str | None:
+        values = self.query.get(name) or self.form().get(name)
+        return values[0] if values else None
+
+
+class FakeGradescope:
+    """WSGI app serving a dataset to its instructor.
+
+    Any `name+alias@` address of the instructor's email also logs in as the
+    instructor, e.g. so that a load test can log in as many distinct users.
+
+    Args:
+        dataset (Dataset): What to serve. It is changed in place by updates and uploads.
+        latency (float, optional): Seconds every response is delayed by, to serve at the pace of
+            the real Gradescope. Defaults to 0.
+
+    Attributes:
+        requests (Counter): Number of requests per route, e.g. `requests["GET memberships"]`.
+        failures (dict[str, list[int]]): Statuses to answer the next requests of a route with instead
+            of serving them, e.g. `failures["DELETE remove_extension"] = [503, 503]`.
+    """
+
+    def __init__(self, dataset: Dataset, latency: float = 0.0):
+        self.dataset = dataset
+        self.latency = latency
+        self.requests = Counter()
+        self.failures: dict[str, list[int]] = {}
+        self.timezone = zoneinfo.ZoneInfo(TIMEZONE)
+        # signed_token cookie -> CSRF token of the session
+        self._sessions: dict[str, str] = {}
+        self._ids = itertools.count(9_000_000)
+        self._lock = threading.Lock()
+        self._routes: list[tuple[str, re.Pattern, str, Callable]] = []
+        course = r"/courses/(?P<course_id>\d+)"
+        assignment = rf"{course}/assignments/(?P<assignment_id>\d+)"
+        for method, pattern, name, handler in [
+            ("GET", r"/", "homepage", self._homepage),
+            ("POST", r"/login", "login", self._login),
+            ("GET", r"/account", "account", self._account),
+            ("HEAD", r"/account", "account", self._account),
+            ("GET", course, "course", self._course),
+            ("GET", rf"{course}/memberships", "memberships", self._memberships),
+            ("GET", rf"{assignment}/review_grades", "review_grades", self._review),
+            ("GET", rf"{assignment}/edit", "edit", self._edit),
+            ("POST", assignment, "update_dates", self._update_dates),
+            ("GET", rf"{assignment}/extensions", "extensions", self._extensions),
+            ("POST", rf"{assignment}/extensions", "update_extension", self._extend),
+            (
+                "DELETE",
+                rf"{assignment}/extensions/(?P<extension_id>\d+)",
+                "remove_extension",
+                self._remove_extension,
+            ),
+            ("POST", rf"{assignment}/submissions", "upload", self._upload),
+            (
+                "GET",
+                rf"{assignment}/submissions/(?P<submission_id>\d+)\.json",
+                "submission_files",
+                self._submission_files,
+            ),
+            (
+                "GET",
+                rf"{assignment}/submissions/(?P<submission_id>\d+)",
+                "submission",
+                self._submission,
+            ),
+            (
+                "GET",
+                rf"{course}/questions/(?P<question_id>\d+)/submissions",
+                "question_submissions",
+                self._question_submissions,
+            ),
+        ]:
+            self._routes.append((method, re.compile(f"{pattern}$"), name, handler))
+
+    def __call__(self, environ: dict, start_response: Callable) -> list[bytes]:
+        if self.latency:
+            time.sleep(self.latency)
+        response = self._dispatch(environ)
+        if response.status == 200 and environ["REQUEST_METHOD"] in ("GET", "HEAD"):
+            etag = f'"{hashlib.sha1(response.body).hexdigest()[:20]}"'
+            response.headers.append(("ETag", etag))
+            if environ.get("HTTP_IF_NONE_MATCH") == etag:
+                response = FakeResponse(304, headers=[("ETag", etag)])
+        status = http.HTTPStatus(response.status)
+        start_response(f"{status.value} {status.phrase}", response.headers)
+        return [response.body]
+
+    def _dispatch(self, environ: dict) -> FakeResponse:
+        method, path = environ["REQUEST_METHOD"], environ.get("PATH_INFO") or "/"
+        for route_method, pattern, name, handler in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                with self._lock:
+                    self.requests[f"{method} {name}"] += 1
+                    failures = self.failures.get(f"{method} {name}")
+                    failure = failures.pop(0) if failures else None
+                if failure is not None:
+                    return FakeResponse(failure, http.HTTPStatus(failure).phrase)
+                request = _Request(environ, match)
+                csrf_token = self._sessions.get(request.cookies.get("signed_token"))
+                if name not in ("homepage", "login") and csrf_token is None:
+                    if name == "account":
+                        return _redirect("/login")
+                    return _json_response(401, {"error": NOT_LOGGED_IN})
+                if method != "GET" and name not in ("login", "account"):
+                    sent = request.headers.get("x-csrf-token") or request.field(
+                        "authenticity_token"
+                    )
+                    if sent != csrf_token:
+                        return _json_response(422, {"error": "Invalid CSRF token"})
+                try:
+                    return handler(request, csrf_token)
+                except KeyError:
+                    return FakeResponse(404, "Page not found")
+        return FakeResponse(404, "Page not found")
+
+    def _homepage(self, request: _Request, csrf_token: None) -> FakeResponse:
+        content = f"""<form class="js-loginForm" action="/login" accept-charset="UTF-8" method="post">
+  <input type="hidden" name="authenticity_token" value="{LOGIN_TOKEN}">
+  <input type="email" name="session[email]">
+  <input type="password" name="session[password]">
+</form>"""
+        return FakeResponse(
+            body=_page("Log In", "homepage-csrf-token", content),
+            headers=[("Set-Cookie", "_gradescope_session=anonymous; path=/")],
+        )
+
+    def _login(self, request: _Request, csrf_token: None) -> FakeResponse:
+        if (
+            request.field("authenticity_token") != LOGIN_TOKEN
+            or _without_alias(request.field("session[email]") or "")
+            != self.dataset.email
+            or request.field("session[password]") != self.dataset.password
+        ):
+            content = (
+                '<div class="alert-error">Invalid email/password combination.</div>'
+            )
+            return FakeResponse(body=_page("Log In", "homepage-csrf-token", content))
+        signed_token = secrets.token_hex(16)
+        with self._lock:
+            self._sessions[signed_token] = secrets.token_hex(16)
+        return _redirect(
+            "/account", [("Set-Cookie", f"signed_token={signed_token}; path=/")]
+        )
+
+    def _account(self, request: _Request, csrf_token: str) -> FakeResponse:
+        terms = {}
+        for course in self.dataset.courses.values():
+            published = sum(
+                1
+                for assignment in course.assignments.values()
+                if assignment.submissions
+            )
+            terms.setdefault(course.term, []).append(
+                f"""<a class="courseBox" href="/courses/{course.course_id}">
+  <h3 class="courseBox--shortname">{html.escape(course.shortname)}</h3>
+  <div class="courseBox--name">{html.escape(course.name)}</div>
+  <div class="courseBox--noGradesPublised">{published} grades published</div>
+  <div class="courseBox--assignments courseBox--assignments-unpublished">{len(course.assignments)} assignments</div>
+</a>"""
+            )
+        content = "".join(
+            f'<div class="courseList--term pageSubheading">{term}</div>'
+            f'<div class="courseList--coursesForTerm">{"".join(boxes)}</div>'
+            for term, boxes in terms.items()
+        )
+        content = f"""<h1 class="pageHeading">Your Courses</h1>
+<button class="btnv7 btnv7-secondary" type="button"> Create a new course</button>
+<div class="courseList">{content}</div>"""
+        return FakeResponse(body=_page("Your Courses", csrf_token, content))
+
+    def _course(self, request: _Request, csrf_token: str) -> FakeResponse:
+        course = self.dataset.courses[request.params["course_id"]]
+        table_data = [{"type": "section", "title": "Homework"}]
+        for assignment in course.assignments.values():
+            table_data.append(
+                {
+                    "type": "assignment",
+                    "id": f"assignment_{assignment.assignment_id}",
+                    "url": f"/courses/{course.course_id}/assignments/{assignment.assignment_id}",
+                    "title": assignment.title,
+                    "total_points": str(assignment.total_points),
+                    "submission_window": {
+                        "release_date": _isoformat(assignment.release_date),
+                        "due_date": _isoformat(assignment.due_date),
+                        "hard_due_date": _isoformat(assignment.late_due_date),
+                    },
+                }
+            )
+        content = _props(
+            "AssignmentsTable",
+            {"table_data": table_data, "course_id": int(course.course_id)},
+        )
+        return FakeResponse(body=_page(course.shortname, csrf_token, content))
+
+    def _memberships(self, request: _Request, csrf_token: str) -> FakeResponse:
+        course = self.dataset.courses[request.params["course_id"]]
+        rows = []
+        for member in course.members:
+            data_cm = {
+                "full_name": member.full_name,
+                "first_name": member.first_name,
+                "last_name": member.last_name,
+                "sid": member.sid,
+            }
+            submissions = sum(
+                member.user_id in assignment.submissions
+                for assignment in course.assignments.values()
+            )
+            rows.append(
+                f"""<tr class="rosterRow">
+  <td><button class="js-rosterName rosterCell--editIcon" type="button" data-cm="{html.escape(json.dumps(data_cm))}" data-email="{member.email}" data-id="{member.user_id}" data-role="{member.role}" data-sections="{member.section}">{html.escape(member.full_name)}</button></td>
+  <td>{member.email}</td>
+  <td>{ROLES[member.role]}</td>
+  <td>{member.section}</td>
+  <td>{submissions}</td>
+  <td></td>
+  <td></td>
+</tr>"""
+            )
+        content = f"""<table class="table js-rosterTable">
+<thead><tr><th>Name</th><th>Email</th><th>Role</th><th>Sections</th><th>Submissions</th><th></th><th></th></tr></thead>
+<tbody>{"".join(rows)}</tbody>
+</table>"""
+        return FakeResponse(body=_page("Roster", csrf_token, content))
+
+    def _review(self, request: _Request, csrf_token: str) -> FakeResponse:
+        course = self.dataset.courses[request.params["course_id"]]
+        assignment = course.assignments[request.params["assignment_id"]]
+        rows = []
+        for student in course.students:
+            submission = assignment.submissions.get(student.user_id)
+            name = html.escape(student.full_name)
+            if submission is not None:
+                name = f'<a href="/courses/{course.course_id}/assignments/{assignment.assignment_id}/submissions/{submission.submission_id}">{name}</a>'
+            score = "" if submission is None else submission.score
+            rows.append(
+                f'<tr><td class="table--primaryLink">{name}</td><td>{student.email}</td><td>{score}</td></tr>'
+            )
+        content = f"""<table class="js-reviewGradesTable table">
+<thead><tr><th>Name</th><th>Email</th><th>Score</th></tr></thead>
+<tbody>{"".join(rows)}</tbody>
+</table>"""
+        return FakeResponse(body=_page("Review Grades", csrf_token, content))
+
+    def _edit(self, request: _Request, csrf_token: str) -> FakeResponse:
+        assignment = self._assignment(request)
+        content = f'<form action="/courses/{request.params["course_id"]}/assignments/{assignment.assignment_id}" method="post"></form>'
+        return FakeResponse(body=_page(f"Edit {assignment.title}", csrf_token, content))
+
+    def _update_dates(self, request: _Request, csrf_token: str) -> FakeResponse:
+        assignment = self._assignment(request)
+        form = request.form()
+
+        def date(name: str) -> datetime.datetime | None:
+            value = form.get(f"assignment[{name}_string]", [""])[0]
+            if not value:
+                return None
+            return datetime.datetime.fromisoformat(value).replace(tzinfo=self.timezone)
+
+        with self._lock:
+            assignment.release_date = date("release_date")
+            assignment.due_date = date("due_date")
+            assignment.late_due_date = (
+                date("hard_due_date")
+                if form.get("assignment[allow_late_submissions]") == ["1"]
+                else None
+            )
+        return self._edit(request, csrf_token)
+
+    def _extensions(self, request: _Request, csrf_token: str) -> FakeResponse:
+        course = self.dataset.courses[request.params["course_id"]]
+        assignment = course.assignments[request.params["assignment_id"]]
+        names = {member.user_id: member.full_name for member in course.members}
+        rows = []
+        for extension in list(assignment.extensions.values()):
+            props = {
+                "override": {
+                    "id": int(extension.extension_id),
+                    "user_id": int(extension.user_id),
+                    "settings": {
+                        name: {"type": "absolute", "value": value}
+                        for name, value in extension.settings.items()
+                    },
+                },
+                "timezone": {"identifier": TIMEZONE},
+                "deletePath": f"/courses/{course.course_id}/assignments/{assignment.assignment_id}/extensions/{extension.extension_id}",
+                "studentName": names.get(extension.user_id, ""),
+            }
+            rows.append(
+                f"<tr><td>{html.escape(props['studentName'])}</td><td>{_props('EditExtension', props)}</td></tr>"
+            )
+        content = f"""<table class="table js-overridesTable">
+<thead><tr><th>Name</th><th></th></tr></thead>
+<tbody>{"".join(rows)}</tbody>
+</table>"""
+        return FakeResponse(body=_page("Extensions", csrf_token, content))
+
+    def _extend(self, request: _Request, csrf_token: str) -> FakeResponse:
+        assignment = self._assignment(request)
+        override = json.loads(request.body)["override"]
+        user_id = str(override["user_id"])
+        settings = {
+            # sent in UTC, shown in the course's timezone
+            name: datetime.datetime.fromisoformat(setting["value"])
+            .astimezone(self.timezone)
+            .replace(tzinfo=None)
+            .isoformat()
+            for name, setting in override["settings"].items()
+        }
+        with self._lock:
+            extension = assignment.extensions.get(user_id)
+            if extension is None:
+                assignment.extensions[user_id] = FakeExtension(
+                    str(next(self._ids)), user_id, settings
+                )
+            else:
+                extension.settings.update(settings)
+        return _json_response(200, {})
+
+    def _remove_extension(self, request: _Request, csrf_token: str) -> FakeResponse:
+        assignment = self._assignment(request)
+        with self._lock:
+            for user_id, extension in list(assignment.extensions.items()):
+                if extension.extension_id == request.params["extension_id"]:
+                    del assignment.extensions[user_id]
+                    return FakeResponse(204)
+        return FakeResponse(404, "Page not found")
+
+    def _upload(self, request: _Request, csrf_token: str) -> FakeResponse:
+        assignment = self._assignment(request)
+        files = [
+            filename for filename, _ in request.form().get("submission[files][]", [])
+        ]
+        if not files:
+            return _redirect(f"/courses/{request.params['course_id']}")
+        with self._lock:
+            submission = FakeSubmission(str(next(self._ids)), "", None, files)
+            # the instructor's own submissions are not on the review grades page
+            assignment.submissions[f"upload-{submission.submission_id}"] = submission
+        return _redirect(
+            f"/courses/{request.params['course_id']}/assignments/{assignment.assignment_id}/submissions/{submission.submission_id}"
+        )
+
+    def _submission(self, request: _Request, csrf_token: str) -> FakeResponse:
+        submission = self._find_submission(request)
+        content = f"<h1>Submission {submission.submission_id}</h1>"
+        return FakeResponse(body=_page("Submission", csrf_token, content))
+
+    def _submission_files(self, request: _Request, csrf_token: str) -> FakeResponse:
+        submission = self._find_submission(request)
+        return _json_response(
+            200,
+            {
+                "text_files": [
+                    {
+                        "file": {
+                            "url": f"https://files.gradescope.test/submissions/{submission.submission_id}/{filename}"
+                        }
+                    }
+                    for filename in submission.files
+                ],
+                "file_comments": {},
+            },
+        )
+
+    def _question_submissions(self, request: _Request, csrf_token: str) -> FakeResponse:
+        course = self.dataset.courses[request.params["course_id"]]
+        question = next(
+            question
+            for assignment in course.assignments.values()
+            for question in assignment.questions
+            if question.question_id == request.params["question_id"]
+        )
+        rows = "".join(
+            f'<tr><td><a href="/courses/{course.course_id}/questions/{question.question_id}/submissions/{submission_id}/grade">Submission</a></td><td></td><td>{html.escape(grader)}</td></tr>'
+            for submission_id, grader in question.graders.items()
+        )
+        content = f"""<table class="table">
+<thead><tr><th>Submission</th><th>Score</th><th>Grader</th></tr></thead>
+<tbody>{rows}</tbody>
+</table>"""
+        return FakeResponse(body=_page("Question Submissions", csrf_token, content))
+
+    def _assignment(self, request: _Request):
+        return self.dataset.assignment(
+            request.params["course_id"], request.params["assignment_id"]
+        )
+
+    def _find_submission(self, request: _Request) -> FakeSubmission:
+        assignment = self._assignment(request)
+        for submission in list(assignment.submissions.values()):
+            if submission.submission_id == request.params["submission_id"]:
+                return submission
+        raise KeyError(request.params["submission_id"])
+
+
+def _without_alias(email: str) -> str:
+    """Remove the `+alias` of an email address."""
+    local, at, domain = email.partition("@")
+    return f"{local.partition('+')[0]}{at}{domain}"
+
+
+def _isoformat(date: datetime.datetime | None) -> str | None:
+    return date.isoformat(timespec="milliseconds") if date else None
@@ -0,0 +1,236 @@
+"""Synthetic courses for the fake Gradescope, generated from a seed."""
+
+import datetime
+import random
+import zoneinfo
+from dataclasses import dataclass, field
+
+TIMEZONE = "America/New_York"
+
+# students per course
+SCALES = {"tiny": 10, "small": 100, "medium": 1_000, "large": 10_000}
+
+FIRST_NAMES = [
+    "Ada", "Alan", "Barbara", "Claude", "Donald", "Edsger", "Frances", "Grace",
+    "John", "Katherine", "Leslie", "Margaret", "Niklaus", "Radia", "Tim", "Vint",
+]  # fmt: skip
+LAST_NAMES = [
+    "Allen", "Cerf", "Dijkstra", "Hamilton", "Hopper", "Johnson", "Knuth",
+    "Lamport", "Liskov", "Lovelace", "McCarthy", "Perlman", "Shannon", "Turing",
+    "Wirth",
+]  # fmt: skip
+
+STUDENT, INSTRUCTOR, TA = 0, 1, 2
+STUDENTS_PER_TA = 50
+
+
+@dataclass
+class FakeMember:
+    user_id: str
+    first_name: str
+    last_name: str
+    email: str
+    sid: str | None
+    role: int
+    section: str
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+
+@dataclass
+class FakeSubmission:
+    submission_id: str
+    user_id: str
+    score: float | None
+    files: list[str]
+
+
+@dataclass
+class FakeExtension:
+    extension_id: str
+    user_id: str
+    # setting name (release_date, due_date, hard_due_date) -> local time in ISO format
+    settings: dict[str, str]
+
+
+@dataclass
+class FakeQuestion:
+    question_id: str
+    # submission ID -> name of its grader, empty if not graded yet
+    graders: dict[str, str]
+
+
+@dataclass
+class FakeAssignment:
+    assignment_id: str
+    title: str
+    total_points: float
+    release_date: datetime.datetime | None
+    due_date: datetime.datetime | None
+    late_due_date: datetime.datetime | None
+    # user ID -> latest submission
+    submissions: dict[str, FakeSubmission] = field(default_factory=dict)
+    # user ID -> extension
+    extensions: dict[str, FakeExtension] = field(default_factory=dict)
+    questions: list[FakeQuestion] = field(default_factory=list)
+
+
+@dataclass
+class FakeCourse:
+    course_id: str
+    shortname: str
+    name: str
+    term: str
+    members: list[FakeMember]
+    assignments: dict[str, FakeAssignment]
+
+    @property
+    def students(self) -> list[FakeMember]:
+        return [member for member in self.members if member.role == STUDENT]
+
+
+@dataclass
+class Dataset:
+    """Everything the fake Gradescope serves to its one instructor."""
+
+    email: str
+    password: str
+    courses: dict[str, FakeCourse]
+
+    def assignment(self, course_id: str, assignment_id: str) -> FakeAssignment:
+        return self.courses[course_id].assignments[assignment_id]
+
+
+class _Ids:
+    """Hands out increasing IDs, one range per kind of object."""
+
+    def __init__(self):
+        self._next = {}
+
+    def __call__(self, start: int) -> str:
+        self._next[start] = self._next.get(start, start) + 1
+        return str(self._next[start])
+
+
+def generate_dataset(
+    students: int = SCALES["small"],
+    courses: int = 1,
+    assignments: int = 5,
+    questions: int = 2,
+    submission_rate: float = 0.9,
+    extension_rate: float = 0.05,
+    seed: int = 0,
+) -> Dataset:
+    """Generate courses of `students` students each, with their assignments, submissions and extensions.
+
+    Args:
+        students (int, optional): Number of students in each course. Defaults to SCALES["small"].
+        courses (int, optional): Number of courses. Defaults to 1.
+        assignments (int, optional): Number of assignments of each course. Defaults to 5.
+        questions (int, optional): Number of questions of each assignment. Defaults to 2.
+        submission_rate (float, optional): Share of students who submitted each assignment. Defaults to 0.9.
+        extension_rate (float, optional): Share of students with an extension on each assignment.
+            Defaults to 0.05.
+        seed (int, optional): The same seed always generates the same dataset. Defaults to 0.
+    """
+    rng = random.Random(seed)
+    ids = _Ids()
+    timezone = zoneinfo.ZoneInfo(TIMEZONE)
+    instructor = FakeMember(
+        ids(1_000_000),
+        "Ida",
+        "Instructor",
+        "instructor@example.edu",
+        None,
+        INSTRUCTOR,
+        "",
+    )
+
+    all_courses = {}
+    for course_index in range(courses):
+        course_id = ids(100_000)
+        members = [instructor]
+        for student_index in range(students):
+            first_name = rng.choice(FIRST_NAMES)
+            last_name = rng.choice(LAST_NAMES)
+            members.append(
+                FakeMember(
+                    ids(1_000_000),
+                    first_name,
+                    last_name,
+                    f"{first_name}.{last_name}.{student_index}@example.edu".lower(),
+                    f"N{student_index:05d}" if rng.random() < 0.9 else None,
+                    STUDENT,
+                    f"Section {student_index % 4 + 1}",
+                )
+            )
+        tas = [
+            FakeMember(
+                ids(1_000_000),
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+                f"ta.{course_id}.{ta_index}@example.edu",
+                None,
+                TA,
+                "",
+            )
+            for ta_index in range(max(1, students // STUDENTS_PER_TA))
+        ]
+        members += tas
+        course = FakeCourse(
+            course_id,
+            f"CS {1100 + course_index * 10}",
+            f"Synthetic Course {course_index + 1}",
+            "Spring 2024",
+            members,
+            {},
+        )
+
+        first_release = datetime.datetime(2024, 1, 22, 9, tzinfo=timezone)
+        for assignment_index in range(assignments):
+            release_date = first_release + datetime.timedelta(weeks=assignment_index)
+            due_date = release_date + datetime.timedelta(days=7, hours=14, minutes=59)
+            assignment = FakeAssignment(
+                ids(2_000_000),
+                f"Homework {assignment_index + 1}",
+                float(rng.choice([10, 25, 100])),
+                release_date,
+                due_date,
+                due_date + datetime.timedelta(days=2) if assignment_index % 2 else None,
+            )
+            for student in course.students:
+                if rng.random() < submission_rate:
+                    assignment.submissions[student.user_id] = FakeSubmission(
+                        ids(3_000_000),
+                        student.user_id,
+                        round(rng.uniform(0, assignment.total_points), 1),
+                        ["solution.py", "README.md"][: rng.randint(1, 2)],
+                    )
+                if rng.random() < extension_rate:
+                    assignment.extensions[student.user_id] = FakeExtension(
+                        ids(4_000_000),
+                        student.user_id,
+                        {
+                            "due_date": (due_date + datetime.timedelta(days=3))
+                            .replace(tzinfo=None)
+                            .isoformat()
+                        },
+                    )
+            for _ in range(questions):
+                assignment.questions.append(
+                    FakeQuestion(
+                        ids(5_000_000),
+                        {
+                            submission.submission_id: (
+                                rng.choice(tas).full_name if rng.random() < 0.8 else ""
+                            )
+                            for submission in assignment.submissions.values()
+                        },
+                    )
+                )
+            course.assignments[assignment.assignment_id] = assignment
+        all_courses[course_id] = course
+
+    return Dataset(instructor.email, "fake-password", all_courses)
@@ -0,0 +1,111 @@
+"""Serve a WSGI app on localhost over HTTP/1.1, with keep-alive, from a background thread."""
+
+import http.server
+import io
+import threading
+import urllib.parse
+from collections.abc import Callable
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    app: Callable
+
+    def _handle(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        environ = {
+            "REQUEST_METHOD": self.command,
+            "PATH_INFO": urllib.parse.unquote(url.path),
+            "QUERY_STRING": url.query,
+            "CONTENT_TYPE": self.headers.get("Content-Type", ""),
+            "SERVER_NAME": self.server.server_address[0],
+            "SERVER_PORT": str(self.server.server_address[1]),
+            "SERVER_PROTOCOL": self.request_version,
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(self._read_body()),
+            "wsgi.errors": io.StringIO(),
+        }
+        environ["CONTENT_LENGTH"] = str(len(environ["wsgi.input"].getvalue()))
+        for name, value in self.headers.items():
+            key = "HTTP_" + name.upper().replace("-", "_")
+            if key not in ("HTTP_CONTENT_TYPE", "HTTP_CONTENT_LENGTH"):
+                environ[key] = value
+
+        response = {}
+
+        def start_response(status: str, headers: list[tuple[str, str]], exc_info=None):
+            response["status"], response["headers"] = status, headers
+
+        body = b"".join(self.app(environ, start_response))
+        code, _, reason = response["status"].partition(" ")
+        self.send_response(int(code), reason)
+        for name, value in response["headers"]:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int(self.rfile.readline().split(b";")[0], 16):
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            self.rfile.readline()
+            return b"".join(chunks)
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    do_GET = do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    # a burst of clients connecting at once must not be refused
+    request_queue_size = 1024
+
+
+class FakeGradescopeServer:
+    """Serve a WSGI app, e.g. a `FakeGradescope`, on a free port of localhost.
+
+    Example:
+        with FakeGradescopeServer(FakeGradescope(generate_dataset())) as server:
+            connection = GSConnection(server.base_url)
+
+    Args:
+        app (Callable): The WSGI app.
+        host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on, or 0 for a free one. Defaults to 0.
+    """
+
+    def __init__(self, app: Callable, host: str = "127.0.0.1", port: int = 0):
+        self.app = app
+        handler = type("Handler", (_Handler,), {"app": staticmethod(app)})
+        self._server = _Server((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGradescopeServer":
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeGradescopeServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
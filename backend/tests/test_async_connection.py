@@ -0,0 +1,100 @@
+import asyncio
+import io
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from gradescopeapi.classes import async_connection
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.extensions import (
+    get_extensions_async,
+    update_student_extension_async,
+)
+from gradescopeapi.classes.upload import upload_assignment_async
+from tests.conftest import ASSIGNMENT_ID, BASE_URL, COURSE_ID, gradescope_handler, login
+
+
+def test_async_login_and_get_courses():
+    async def run():
+        async with await login() as connection:
+            return await connection.account.get_courses()
+
+    courses = asyncio.run(run())
+
+    assert courses["student"] == {}
+    assert courses["instructor"][COURSE_ID].name == "CS 1134"
+
+
+def test_async_login_invalid_credentials():
+    with pytest.raises(ValueError, match="Bad login"):
+        asyncio.run(login("wrong password"))
+
+
+def test_async_extensions():
+    async def run():
+        async with await login() as connection:
+            extensions = await get_extensions_async(
+                connection.client, COURSE_ID, ASSIGNMENT_ID, BASE_URL
+            )
+            updated = await update_student_extension_async(
+                connection.client,
+                COURSE_ID,
+                ASSIGNMENT_ID,
+                "6515875",
+                due_date=datetime(2024, 4, 16),
+                late_due_date=datetime(2024, 4, 16) + timedelta(days=1),
+                gradescope_base_url=BASE_URL,
+            )
+            return extensions, updated
+
+    extensions, updated = asyncio.run(run())
+
+    assert extensions["6515875"].name == "Ada Lovelace"
+    assert extensions["6515875"].due_date.day == 16
+    assert updated
+
+
+def test_async_upload():
+    async def run():
+        async with await login() as connection:
+            file = io.BytesIO(b"print('hello')")
+            file.name = "python_file.py"
+            return await upload_assignment_async(
+                connection.client,
+                COURSE_ID,
+                ASSIGNMENT_ID,
+                file,
+                gradescope_base_url=BASE_URL,
+            )
+
+    submission_link = asyncio.run(run())
+
+    assert submission_link.endswith("/submissions/123")
+
+
+class ClosingTransport(httpx.MockTransport):
+    closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_closing_a_connection_leaves_its_transport_open(monkeypatch):
+    async def run():
+        shared = ClosingTransport(gradescope_handler)
+        monkeypatch.setattr(async_connection, "get_shared_transport", lambda: shared)
+        supplied = ClosingTransport(gradescope_handler)
+        connections = [
+            AsyncGSConnection(BASE_URL),
+            AsyncGSConnection(BASE_URL, transport=supplied),
+        ]
+        for connection in connections:
+            await connection.aclose()
+        return shared, supplied, connections
+
+    shared, supplied, connections = asyncio.run(run())
+
+    assert not shared.closed
+    assert not supplied.closed
+    assert all(connection.client.is_closed for connection in connections)
@@ -0,0 +1,133 @@
+import asyncio
+import io
+import threading
+import time
+
+import httpx
+import pytest
+
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.upload import (
+    UploadJob,
+    upload_assignments,
+    upload_assignments_async,
+)
+from tests.conftest import BASE_URL, PASSWORD, TokenSession, gradescope_handler
+
+COURSE_IDS = ["753413", "753414"]
+ASSIGNMENT_IDS = [str(4330410 + i) for i in range(5)]
+CLOSED_ASSIGNMENT_ID = "4330404"
+
+
+class BulkSession(TokenSession):
+    """Accepts uploads from several threads, slowly enough for them to overlap."""
+
+    def __init__(self, delay=0.02, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        time.sleep(self.delay)
+        with self._lock:
+            return super().get(url)
+
+    def post(self, url, data=None, headers=None, json=None):
+        time.sleep(self.delay)
+        with self._lock:
+            response = super().post(url, data=data, headers=headers, json=json)
+            if response.status_code == 200 and CLOSED_ASSIGNMENT_ID not in url:
+                # the submission page it redirects to
+                response.url = f"{url}/{len(self.requests)}"
+            return response
+
+
+@pytest.fixture
+def solution(tmp_path):
+    path = tmp_path / "solution.py"
+    path.write_text("print('reference')")
+    return path
+
+
+def test_uploads_fetch_one_token_per_course(solution):
+    session = BulkSession()
+    jobs = [
+        UploadJob(course_id, assignment_id, (solution,))
+        for course_id in COURSE_IDS
+        for assignment_id in ASSIGNMENT_IDS
+    ]
+
+    results = list(
+        upload_assignments(
+            session,
+            jobs,
+            max_workers=4,
+            requests_per_second=None,
+            gradescope_base_url=BASE_URL,
+        )
+    )
+
+    assert len(results) == len(jobs)
+    assert all(result.ok and result.error is None for result in results)
+    assert 1 <= session.requests.count("GET") <= len(COURSE_IDS)
+    assert session.requests.count("POST") == len(jobs)
+
+
+def test_failed_uploads_are_reported_without_stopping_the_others(solution):
+    session = BulkSession(cached_token="fresh")
+    jobs = [
+        UploadJob(COURSE_IDS[0], ASSIGNMENT_IDS[0], (solution,)),
+        UploadJob(COURSE_IDS[0], CLOSED_ASSIGNMENT_ID, (solution,)),
+        UploadJob(COURSE_IDS[0], ASSIGNMENT_IDS[1], (solution.with_name("gone.py"),)),
+    ]
+
+    results = {
+        result.job.assignment_id: result
+        for result in upload_assignments(session, jobs, gradescope_base_url=BASE_URL)
+    }
+
+    assert results[ASSIGNMENT_IDS[0]].ok
+    assert results[CLOSED_ASSIGNMENT_ID].error == (
+        "Gradescope did not accept the submission"
+    )
+    assert results[ASSIGNMENT_IDS[1]].error.startswith("FileNotFoundError")
+
+
+def test_shared_file_objects_are_rejected():
+    file = io.BytesIO(b"print('reference')")
+    jobs = [
+        UploadJob(COURSE_IDS[0], assignment_id, (("solution.py", file),))
+        for assignment_id in ASSIGNMENT_IDS
+    ]
+
+    with pytest.raises(ValueError, match="pass its path instead"):
+        upload_assignments(BulkSession(), jobs)
+
+
+def test_async_uploads_fetch_one_token_per_course(solution):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        return gradescope_handler(request)
+
+    async def run():
+        transport = httpx.MockTransport(handler)
+        async with AsyncGSConnection(BASE_URL, transport=transport) as connection:
+            await connection.login("student@example.com", PASSWORD)
+            del connection.client.headers["X-CSRF-Token"]
+            jobs = [UploadJob(COURSE_IDS[0], "4330410", (solution,)) for _ in range(6)]
+            return [
+                result
+                async for result in upload_assignments_async(
+                    connection.client,
+                    jobs,
+                    requests_per_second=None,
+                    gradescope_base_url=BASE_URL,
+                )
+            ]
+
+    results = asyncio.run(run())
+
+    assert all(result.ok for result in results)
+    assert requests.count(("GET", f"/courses/{COURSE_IDS[0]}")) == 1
@@ -0,0 +1,102 @@
+import http.server
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.connection_pool import ConnectionPool
+
+
+class KeepAliveHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        # slow enough for the requests of several threads to overlap
+        time.sleep(0.005)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused(base_url):
+    connection = GSConnection(base_url)
+
+    for _ in range(5):
+        assert connection.session.get(f"{base_url}/courses").text == "ok"
+
+    stats = connection.connection_pool.stats
+    assert (stats.requests, stats.connections, stats.reused) == (5, 1, 4)
+    assert stats.reuse_ratio == 0.8
+
+
+def test_pool_is_shared_across_connections_and_threads(base_url):
+    pool = ConnectionPool(max_connections_per_host=2)
+    connections = [GSConnection(base_url, connection_pool=pool) for _ in range(4)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for response in executor.map(
+            lambda i: connections[i % 4].session.get(f"{base_url}/courses"),
+            range(40),
+        ):
+            assert response.status_code == 200
+
+    assert pool.stats.requests == 40
+    assert pool.stats.connections <= 2
+    assert pool.stats.peak_in_use == 2
+    assert pool.stats.saturated > 0
+    assert pool.stats.discarded == 0
+
+    # closing one connection leaves the others' connections open
+    connections[0].session.close()
+    connections[1].session.get(f"{base_url}/courses")
+    assert pool.stats.connections <= 2
+
+
+def test_closing_one_of_two_connections_keeps_the_pool_open(base_url):
+    pool = ConnectionPool()
+    first, second = (GSConnection(base_url, connection_pool=pool) for _ in range(2))
+    second.session.get(f"{base_url}/courses")
+
+    # the adapter of the session is mounted on "https://" and "http://", and closed for both
+    first.session.close()
+    first.session.close()
+    second.session.get(f"{base_url}/courses")
+
+    assert pool._pool_manager.users == 1
+    assert (pool.stats.requests, pool.stats.reused) == (2, 1)
+
+    second.session.close()
+    assert pool._pool_manager.users == 0
+    assert len(pool._pool_manager.pools) == 0
+
+
+def test_unblocked_pool_discards_overflow_connections(base_url):
+    pool = ConnectionPool(max_connections_per_host=1, block=False)
+    connection = GSConnection(base_url, connection_pool=pool)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(
+            executor.map(
+                lambda _: connection.session.get(f"{base_url}/courses"), range(40)
+            )
+        )
+
+    assert pool.stats.saturated > 0
+    assert pool.stats.discarded > 0
@@ -0,0 +1,137 @@
+import asyncio
+import datetime
+
+import httpx
+import pytest
+
+from gradescopeapi.classes._helpers._csrf_helpers import (
+    csrf_token_rejected,
+    read_csrf_token,
+)
+from gradescopeapi.classes.assignments import update_assignment_date
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.extensions import update_student_extension_async
+from gradescopeapi.classes.upload import upload_assignment
+from tests.conftest import ASSIGNMENT_ID, BASE_URL, COURSE_ID, Response, TokenSession
+
+DUE_DATE = datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def test_read_csrf_token():
+    assert (
+        read_csrf_token(b'<meta name="csrf-token" content="a">', "html.parser") == "a"
+    )
+    form = '<input type="hidden" name="authenticity_token" value="b">'
+    assert read_csrf_token(form, "html.parser") == "b"
+    with pytest.raises(ValueError):
+        read_csrf_token("<html></html>", "html.parser")
+
+
+def test_csrf_token_rejected():
+    assert csrf_token_rejected(Response(BASE_URL, status_code=422))
+    assert not csrf_token_rejected(Response(BASE_URL))
+    # a redirect to log in, followed or not
+    followed = Response(f"{BASE_URL}/login")
+    followed.history = [Response(BASE_URL, status_code=302)]
+    assert csrf_token_rejected(followed)
+    location = {"Location": f"{BASE_URL}/login"}
+    assert csrf_token_rejected(Response(BASE_URL, status_code=302, headers=location))
+    location = {"Location": f"{BASE_URL}/courses/{COURSE_ID}"}
+    assert not csrf_token_rejected(
+        Response(BASE_URL, status_code=302, headers=location)
+    )
+
+
+def update_dates(session):
+    return update_assignment_date(
+        session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        due_date=DUE_DATE,
+        gradescope_base_url=BASE_URL,
+    )
+
+
+def test_cached_token_takes_one_request():
+    session = TokenSession(cached_token="fresh")
+
+    assert update_dates(session)
+    assert session.requests == ["POST"]
+
+
+def test_missing_token_is_fetched_and_cached():
+    session = TokenSession()
+
+    assert update_dates(session)
+    assert update_dates(session)
+    assert session.requests == ["GET", "POST", "POST"]
+    assert session.headers["X-CSRF-Token"] == "fresh"
+
+
+def test_rejected_token_is_refreshed_once():
+    session = TokenSession(cached_token="stale")
+    assert update_dates(session)
+    assert session.requests == ["POST", "GET", "POST"]
+
+    # a fresh token that is rejected too is not retried again
+    session = TokenSession(cached_token="stale", token="never")
+    session.post = lambda *args, **kwargs: (
+        session.requests.append("POST") or Response("", 422)
+    )
+    assert not update_dates(session)
+    assert session.requests == ["POST", "GET", "POST"]
+
+
+def test_upload_retry_sends_the_files_again(tmp_path):
+    submission = tmp_path / "hello.py"
+    submission.write_text("print('hi')")
+    session = TokenSession(cached_token="stale")
+
+    with submission.open("rb") as file:
+        upload_assignment(
+            session, COURSE_ID, ASSIGNMENT_ID, file, gradescope_base_url=BASE_URL
+        )
+
+    assert session.requests == ["POST", "GET", "POST"]
+    assert all(b"print('hi')" in body for body in session.bodies)
+
+
+def test_connections_refresh_the_token_from_html_pages(server):
+    connection = GSConnection(server.base_url)
+
+    connection.session.get(f"{server.base_url}/account")
+
+    assert connection.session.headers["X-CSRF-Token"] == "account-csrf-token"
+
+
+def test_async_rejected_token_is_refreshed_once():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.headers.get("x-csrf-token")))
+        if request.method == "GET":
+            return httpx.Response(
+                200,
+                html='<meta name="csrf-token" content="fresh">',
+            )
+        accepted = request.headers["x-csrf-token"] == "fresh"
+        return httpx.Response(200 if accepted else 422)
+
+    async def run():
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            headers={"X-CSRF-Token": "stale"},
+        )
+        async with client:
+            updated = await update_student_extension_async(
+                client,
+                COURSE_ID,
+                ASSIGNMENT_ID,
+                "1",
+                due_date=DUE_DATE,
+                gradescope_base_url=BASE_URL,
+            )
+            return updated, client.headers["X-CSRF-Token"]
+
+    assert asyncio.run(run()) == (True, "fresh")
+    assert requests == [("POST", "stale"), ("GET", "stale"), ("POST", "fresh")]
@@ -0,0 +1,130 @@
+import asyncio
+import datetime
+import pathlib
+import threading
+
+import httpx
+import pytest
+
+from gradescopeapi.classes.assignments import (
+    shift_assignment_dates,
+    shift_assignment_dates_async,
+)
+from gradescopeapi.classes.result_cache import ResultCache, register_result_cache
+from tests.conftest import Response
+
+FIXTURES = pathlib.Path(__file__).parent / "html_fixtures"
+BASE_URL = "https://gradescope.test"
+COURSE_ID = "753413"
+SNOW_DAY = datetime.timedelta(days=2)
+
+
+class CourseSession:
+    """Serves an instructor course page and records the dates posted to each assignment."""
+
+    def __init__(self, rejected=()):
+        self.headers = {}
+        self.rejected = rejected
+        self.requests = []
+        self.posted = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            self.requests.append(("GET", url))
+        content = (FIXTURES / "course_instructor.html").read_bytes()
+        return Response(url, content=content)
+
+    def post(self, url, data=None, headers=None):
+        assignment_id = url.rsplit("/", 1)[1]
+        with self._lock:
+            self.requests.append(("POST", url))
+            self.posted[assignment_id] = data.to_string()
+        return Response(url, status_code=500 if assignment_id in self.rejected else 200)
+
+
+def test_dry_run_plans_without_updating():
+    session = CourseSession()
+
+    changes = shift_assignment_dates(
+        session, COURSE_ID, SNOW_DAY, dry_run=True, gradescope_base_url=BASE_URL
+    )
+
+    # the midterm has no dates to move
+    assert [change.assignment.assignment_id for change in changes] == [
+        "4330410",
+        "4330411",
+    ]
+    assert changes[0].due_date == changes[0].assignment.due_date + SNOW_DAY
+    assert changes[1].late_due_date is None
+    assert {change.status for change in changes} == {"planned"}
+    assert [method for method, _ in session.requests] == ["GET"]
+
+
+def test_shift_fetches_one_token_and_posts_every_change():
+    session = CourseSession(rejected={"4330411"})
+
+    changes = shift_assignment_dates(
+        session,
+        COURSE_ID,
+        SNOW_DAY,
+        requests_per_second=None,
+        gradescope_base_url=BASE_URL,
+    )
+
+    assert [change.status for change in changes] == ["updated", "failed"]
+    assert changes[1].error == "Gradescope rejected the new dates"
+    # the course page and one token fetch shared by both updates
+    assert [method for method, _ in session.requests].count("GET") == 2
+    assert b"2024-01-31T23:59" in session.posted["4330410"]  # was the 29th
+    assert b"2024-02-02T23:59" in session.posted["4330410"]
+
+
+def test_shift_by_assignment():
+    session = CourseSession()
+
+    changes = shift_assignment_dates(
+        session,
+        COURSE_ID,
+        {"4330411": datetime.timedelta(hours=1)},
+        dry_run=True,
+        gradescope_base_url=BASE_URL,
+    )
+
+    assert [change.assignment.assignment_id for change in changes] == ["4330411"]
+    with pytest.raises(ValueError, match="not in course"):
+        shift_assignment_dates(
+            session, COURSE_ID, {"1": SNOW_DAY}, gradescope_base_url=BASE_URL
+        )
+
+
+def test_async_shift():
+    posted = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            posted.append(request.url.path)
+            return httpx.Response(200)
+        return httpx.Response(
+            200, content=(FIXTURES / "course_instructor.html").read_bytes()
+        )
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        register_result_cache(client, cache)
+        async with client:
+            return await shift_assignment_dates_async(
+                client, COURSE_ID, SNOW_DAY, gradescope_base_url=BASE_URL
+            )
+
+    cache = ResultCache()
+    cache.get_or_compute("get_assignments", (COURSE_ID,), list, course_id=COURSE_ID)
+    changes = asyncio.run(run())
+
+    assert [change.status for change in changes] == ["updated", "updated"]
+    assert sorted(posted) == [
+        f"/courses/{COURSE_ID}/assignments/4330410",
+        f"/courses/{COURSE_ID}/assignments/4330411",
+    ]
+    # the cached assignments of the course are stale
+    assert len(cache) == 0
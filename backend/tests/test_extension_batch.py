@@ -0,0 +1,135 @@
+import asyncio
+import datetime
+import threading
+import zoneinfo
+
+import httpx
+import pytest
+
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.extensions import (
+    ExtensionUpdate,
+    update_student_extensions,
+    update_student_extensions_async,
+)
+from tests.conftest import (
+    ASSIGNMENT_ID,
+    BASE_URL,
+    COURSE_ID,
+    EXTENSIONS_PAGE,
+    PASSWORD,
+    Response,
+    gradescope_handler,
+)
+
+USER_ID = "6515875"  # has an extension due 2024-04-16 00:00 in New York
+OTHER_ASSIGNMENT_ID = "4330411"
+MISSING_ASSIGNMENT_ID = "4330499"
+CURRENT_DUE_DATE = datetime.datetime(
+    2024, 4, 16, tzinfo=zoneinfo.ZoneInfo("America/New_York")
+)
+NEW_DUE_DATE = datetime.datetime(2024, 4, 20, tzinfo=datetime.timezone.utc)
+
+
+class ExtensionsSession:
+    """Serves the same extensions page for every assignment and accepts every update."""
+
+    def __init__(self):
+        self.headers = {"X-CSRF-Token": "token"}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            self.requests.append(("GET", url))
+        if MISSING_ASSIGNMENT_ID in url:
+            return Response(url, status_code=404)
+        return Response(url, content=EXTENSIONS_PAGE.encode())
+
+    def post(self, url, json=None, headers=None):
+        with self._lock:
+            self.requests.append(("POST", json["override"]["user_id"]))
+        return Response(url)
+
+
+def test_batch_reads_each_assignment_once_and_skips_no_ops():
+    session = ExtensionsSession()
+    updates = [
+        # the same instant in UTC, with microseconds that are not sent
+        ExtensionUpdate(
+            ASSIGNMENT_ID,
+            USER_ID,
+            due_date=CURRENT_DUE_DATE.astimezone(datetime.timezone.utc).replace(
+                microsecond=5
+            ),
+        ),
+        ExtensionUpdate(ASSIGNMENT_ID, "1", due_date=NEW_DUE_DATE),
+        ExtensionUpdate(OTHER_ASSIGNMENT_ID, USER_ID, due_date=NEW_DUE_DATE),
+        ExtensionUpdate(
+            OTHER_ASSIGNMENT_ID,
+            "2",
+            due_date=NEW_DUE_DATE,
+            late_due_date=CURRENT_DUE_DATE,
+        ),
+        ExtensionUpdate(MISSING_ASSIGNMENT_ID, USER_ID, due_date=NEW_DUE_DATE),
+    ]
+
+    results = update_student_extensions(
+        session, COURSE_ID, updates, gradescope_base_url=BASE_URL
+    )
+
+    assert [result.update for result in results] == updates
+    assert [result.status for result in results] == [
+        "unchanged",
+        "updated",
+        "updated",
+        "failed",
+        "failed",
+    ]
+    assert results[3].error.startswith("ValueError: Dates must be in order")
+    assert results[4].error.startswith("RuntimeError: Failed to get extensions")
+    assert (
+        sorted(method for method, _ in session.requests) == ["GET"] * 3 + ["POST"] * 2
+    )
+    assert sorted(user for method, user in session.requests if method == "POST") == [
+        "1",
+        USER_ID,
+    ]
+
+
+def test_batch_rejects_duplicate_updates():
+    updates = [
+        ExtensionUpdate(ASSIGNMENT_ID, USER_ID, due_date=NEW_DUE_DATE),
+        ExtensionUpdate(ASSIGNMENT_ID, USER_ID, release_date=NEW_DUE_DATE),
+    ]
+
+    with pytest.raises(ValueError, match="one update per assignment"):
+        update_student_extensions(ExtensionsSession(), COURSE_ID, updates)
+
+
+def test_async_batch_skips_no_ops():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.method)
+        return gradescope_handler(request)
+
+    async def run():
+        transport = httpx.MockTransport(handler)
+        async with AsyncGSConnection(BASE_URL, transport=transport) as connection:
+            await connection.login("student@example.com", PASSWORD)
+            requests.clear()
+            return await update_student_extensions_async(
+                connection.client,
+                COURSE_ID,
+                [
+                    ExtensionUpdate(ASSIGNMENT_ID, USER_ID, due_date=CURRENT_DUE_DATE),
+                    ExtensionUpdate(ASSIGNMENT_ID, "1", due_date=NEW_DUE_DATE),
+                ],
+                gradescope_base_url=BASE_URL,
+            )
+
+    results = asyncio.run(run())
+
+    assert [result.status for result in results] == ["unchanged", "updated"]
+    assert requests == ["GET", "POST"]
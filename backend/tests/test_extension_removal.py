@@ -0,0 +1,139 @@
+import asyncio
+import threading
+from collections import Counter
+
+import pytest
+
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.extensions import (
+    remove_student_extension,
+    remove_student_extensions,
+    remove_student_extensions_async,
+)
+from gradescopeapi.classes.transport_policy import TransportPolicy
+from tests.conftest import Response
+
+BASE_URL = "https://gradescope.test"
+EXTENSIONS_PATH = "/courses/753413/assignments/4330410/extensions"
+
+# status code answered for each extension
+STATUS_CODES = {
+    f"{EXTENSIONS_PATH}/1": 204,
+    f"{EXTENSIONS_PATH}/2": 503,
+    f"{EXTENSIONS_PATH}/3": 404,
+    f"{EXTENSIONS_PATH}/4": 500,
+    f"{EXTENSIONS_PATH}/5": 302,
+    f"{EXTENSIONS_PATH}/6": 302,
+}
+# where the redirects go
+LOCATIONS = {
+    f"{EXTENSIONS_PATH}/5": f"{BASE_URL}{EXTENSIONS_PATH}",
+    f"{EXTENSIONS_PATH}/6": f"{BASE_URL}/courses/753413",
+}
+
+
+class DeleteSession:
+    def __init__(self):
+        self.headers = {"X-CSRF-Token": "token"}
+        self.attempts = Counter()
+        self._lock = threading.Lock()
+
+    def delete(self, url, headers=None, allow_redirects=True):
+        assert not allow_redirects
+        path = url.removeprefix(BASE_URL)
+        with self._lock:
+            self.attempts[path] += 1
+        location = {"Location": LOCATIONS[path]} if path in LOCATIONS else {}
+        return Response(url, status_code=STATUS_CODES[path], headers=location)
+
+
+def test_remove_student_extension():
+    session = DeleteSession()
+
+    assert remove_student_extension(
+        session, f"{EXTENSIONS_PATH}/1", gradescope_base_url=BASE_URL
+    )
+    assert not remove_student_extension(
+        session, f"{EXTENSIONS_PATH}/3", gradescope_base_url=BASE_URL
+    )
+    # only a redirect back to the extensions page means the extension was removed
+    assert remove_student_extension(
+        session, f"{EXTENSIONS_PATH}/5", gradescope_base_url=BASE_URL
+    )
+    assert not remove_student_extension(
+        session, f"{EXTENSIONS_PATH}/6", gradescope_base_url=BASE_URL
+    )
+    with pytest.raises(ValueError):
+        remove_student_extension(session, "/account", gradescope_base_url=BASE_URL)
+
+
+def test_bulk_removal_reports_each_path():
+    session = DeleteSession()
+    delete_paths = [*STATUS_CODES, "/account"]
+
+    results = remove_student_extensions(
+        session, delete_paths, gradescope_base_url=BASE_URL
+    )
+
+    assert [result.delete_path for result in results] == delete_paths
+    assert [result.status for result in results] == [
+        "removed",
+        "failed",
+        "missing",
+        "failed",
+        "removed",
+        "failed",
+        "failed",
+    ]
+    assert results[1].error == "Status code: 503"
+    assert results[3].error == "Status code: 500"
+    assert results[5].error == "Status code: 302"
+    assert results[6].error.startswith("ValueError")
+    # retrying is left to the transport policy of the session
+    assert set(session.attempts.values()) == {1}
+
+
+def test_async_bulk_removal_is_retried_by_the_transport_policy_only(fake_gradescope):
+    dataset = fake_gradescope.app.dataset
+    course = next(iter(dataset.courses.values()))
+    assignment = next(
+        assignment
+        for assignment in course.assignments.values()
+        if len(assignment.extensions) >= 2
+    )
+    failing, flaky = list(assignment.extensions.values())[:2]
+    extensions_path = (
+        f"/courses/{course.course_id}/assignments/{assignment.assignment_id}/extensions"
+    )
+    requests = fake_gradescope.app.requests
+    failures = fake_gradescope.app.failures
+
+    async def run():
+        policy = TransportPolicy(retries=2, backoff=0, failure_threshold=None)
+        async with AsyncGSConnection(
+            fake_gradescope.base_url, transport_policy=policy
+        ) as connection:
+            await connection.login(dataset.email, dataset.password)
+            results = []
+            # failing until the retries run out, then failing once
+            for extension, statuses in [(failing, [503] * 3), (flaky, [503])]:
+                failures["DELETE remove_extension"] = statuses
+                sent = requests["DELETE remove_extension"]
+                (result,) = await remove_student_extensions_async(
+                    connection.client,
+                    [f"{extensions_path}/{extension.extension_id}"],
+                    gradescope_base_url=fake_gradescope.base_url,
+                )
+                results.append((result, requests["DELETE remove_extension"] - sent))
+            return results
+
+    (failed, failed_sent), (removed, removed_sent) = asyncio.run(run())
+
+    assert (failed.status, failed.error, failed_sent) == (
+        "failed",
+        "Status code: 503",
+        3,
+    )
+    assert (removed.status, removed_sent) == ("removed", 2)
+    assert failing.user_id in assignment.extensions
+    assert flaky.user_id not in assignment.extensions
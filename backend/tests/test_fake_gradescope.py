@@ -0,0 +1,129 @@
+import asyncio
+import datetime
+import io
+
+import pytest
+
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.extensions import (
+    get_extensions,
+    remove_student_extension,
+    update_student_extension,
+)
+from gradescopeapi.classes.upload import upload_assignment
+from tests.fake_gradescope import SCALES, generate_dataset
+
+
+@pytest.fixture
+def connection(fake_gradescope):
+    dataset = fake_gradescope.app.dataset
+    connection = GSConnection(fake_gradescope.base_url)
+    connection.login(dataset.email, dataset.password)
+    return connection
+
+
+def test_datasets_are_sized_and_reproducible():
+    dataset = generate_dataset(students=SCALES["tiny"], courses=2, seed=1)
+
+    assert len(dataset.courses) == 2
+    for course in dataset.courses.values():
+        assert len(course.students) == SCALES["tiny"]
+    assert dataset == generate_dataset(students=SCALES["tiny"], courses=2, seed=1)
+    assert dataset != generate_dataset(students=SCALES["tiny"], courses=2, seed=2)
+
+
+def test_login_is_checked(fake_gradescope):
+    connection = GSConnection(fake_gradescope.base_url)
+
+    with pytest.raises(ValueError):
+        connection.login(fake_gradescope.app.dataset.email, "wrong password")
+    assert not connection.check_session()
+
+
+def test_pages_are_read_like_gradescope(fake_gradescope, connection):
+    dataset = fake_gradescope.app.dataset
+    course = next(iter(dataset.courses.values()))
+    assignment = next(iter(course.assignments.values()))
+
+    courses = connection.account.get_courses()
+    assert courses["instructor"][course.course_id].name == course.shortname
+
+    assignments = connection.account.get_assignments(course.course_id)
+    assert [a.assignment_id for a in assignments] == list(course.assignments)
+    assert assignments[0].due_date == assignment.due_date
+
+    users = connection.account.get_course_users(course.course_id)
+    assert len(users) == len(course.members)
+
+    submissions = connection.account.get_assignment_submissions(
+        course.course_id, assignment.assignment_id, requests_per_second=None
+    )
+    assert len(submissions) == len(assignment.submissions)
+
+    question = assignment.questions[0]
+    graders = connection.account.get_assignment_graders(
+        course.course_id, question.question_id
+    )
+    assert graders == set(question.graders.values()) - {""}
+
+    assert fake_gradescope.app.requests["GET submission_files"] == len(
+        assignment.submissions
+    )
+
+
+def test_changes_are_served_back(fake_gradescope, connection):
+    dataset = fake_gradescope.app.dataset
+    course = next(iter(dataset.courses.values()))
+    assignment = next(iter(course.assignments.values()))
+    student = course.students[0]
+    base_url = fake_gradescope.base_url
+    due_date = datetime.datetime(2024, 5, 1, 23, 59, tzinfo=datetime.timezone.utc)
+
+    assert update_student_extension(
+        connection.session,
+        course.course_id,
+        assignment.assignment_id,
+        student.user_id,
+        due_date=due_date,
+        gradescope_base_url=base_url,
+    )
+    extensions = get_extensions(
+        connection.session,
+        course.course_id,
+        assignment.assignment_id,
+        gradescope_base_url=base_url,
+    )
+    assert extensions[student.user_id].due_date == due_date
+
+    assert remove_student_extension(
+        connection.session,
+        extensions[student.user_id].delete_path,
+        gradescope_base_url=base_url,
+    )
+    assert student.user_id not in assignment.extensions
+
+    file = io.BytesIO(b"print('hello')")
+    file.name = "solution.py"
+    link = upload_assignment(
+        connection.session,
+        course.course_id,
+        assignment.assignment_id,
+        file,
+        gradescope_base_url=base_url,
+    )
+    assert link.startswith(f"{base_url}/courses/{course.course_id}/")
+
+
+def test_async_connection(fake_gradescope):
+    dataset = fake_gradescope.app.dataset
+    course_id = next(iter(dataset.courses))
+
+    async def run():
+        async with AsyncGSConnection(fake_gradescope.base_url) as connection:
+            await connection.login(dataset.email, dataset.password)
+            return await connection.account.get_course_users(course_id)
+
+    users = asyncio.run(run())
+
+    assert len(users) == len(dataset.courses[course_id].members)
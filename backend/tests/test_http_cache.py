@@ -0,0 +1,111 @@
+import pytest
+
+from gradescopeapi.classes.account import Account
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.http_cache import (
+    CachedResponse,
+    HTTPCache,
+    MemoryCacheStore,
+    SQLiteCacheStore,
+)
+
+
+def cached_account(server, cache):
+    connection = GSConnection(server.base_url, http_cache=cache)
+    return Account(connection.session, server.base_url), connection
+
+
+def test_unchanged_page_reuses_body_and_parse_result(server):
+    cache = HTTPCache()
+    account, connection = cached_account(server, cache)
+
+    first = account.get_courses()
+    second = account.get_courses()
+
+    assert second == first
+    assert "If-None-Match" not in server.requests[0][1]
+    assert server.requests[1][1]["If-None-Match"].startswith('W/"')
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert (cache.parse_stats.hits, cache.parse_stats.misses) == (1, 1)
+    # cookies set by the 304 still reach the session
+    assert connection.session.cookies["_gradescope_session"] == "rotated"
+
+
+def test_changed_page_is_parsed_again(server):
+    cache = HTTPCache()
+    account, _ = cached_account(server, cache)
+
+    account.get_courses()
+    server.pages["/account"] = server.pages["/account"].replace(b"CS 1134", b"CS 1135")
+    courses = account.get_courses()
+
+    assert courses["instructor"]["753413"].name == "CS 1135"
+    assert cache.stats.hits == 0
+    assert cache.parse_stats.misses == 2
+
+
+def test_cached_results_are_not_shared_with_callers(server):
+    account, _ = cached_account(server, HTTPCache())
+
+    members = account.get_course_users("753413")
+    members[0].full_name = "changed"
+    members.clear()
+
+    members = account.get_course_users("753413")
+    assert members[0].full_name == "Ada Lovelace"
+
+
+def test_no_store_responses_are_not_cached(server):
+    server.etags = False
+    cache = HTTPCache()
+    account, _ = cached_account(server, cache)
+
+    account.get_courses()
+    account.get_courses()
+
+    assert len(cache.store) == 0
+    assert "If-None-Match" not in server.requests[1][1]
+
+
+def test_sqlite_store_persists_across_connections(server, tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    account, _ = cached_account(server, HTTPCache(SQLiteCacheStore(path)))
+    expected = account.get_courses()
+
+    cache = HTTPCache(SQLiteCacheStore(path))
+    account, _ = cached_account(server, cache)
+
+    assert account.get_courses() == expected
+    assert cache.stats.hits == 1
+
+
+def response(size, etag="a"):
+    return CachedResponse(200, {"ETag": etag}, b"x" * size, "utf-8", etag, None)
+
+
+@pytest.mark.parametrize(
+    "make_store",
+    [MemoryCacheStore, lambda **kwargs: SQLiteCacheStore(":memory:", **kwargs)],
+)
+def test_store_evicts_least_recently_used(make_store):
+    store = make_store(max_entries=2, max_bytes=100)
+
+    store.set("a", response(10))
+    store.set("b", response(10))
+    store.get("a")
+    store.set("c", response(10))
+
+    assert store.get("b") is None
+    assert store.get("a") == response(10)
+    assert len(store) == 2
+
+    # a body that fills the store pushes out everything else
+    store.set("d", response(100))
+
+    assert len(store) == 1
+    assert store.stats.evictions == 3
+
+    # a body larger than the store is not kept
+    store.set("e", response(101))
+
+    assert store.get("e") is None
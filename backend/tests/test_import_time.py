@@ -0,0 +1,33 @@
+import pytest
+
+from benchmarks import import_time
+
+
+@pytest.mark.parametrize("module", import_time.BUDGETS)
+def test_import_leaves_parsing_dependencies_for_first_use(module):
+    measurement = import_time.measure(module, runs=1)
+
+    assert measurement.loaded(import_time.BUDGETS[module].lazy) == []
+    assert measurement.loaded(("requests",)) == ["requests"]
+
+
+def test_parse_importtime():
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   gradescopeapi",
+            "import time:        80 |        100 |     bs4.element",
+            "import time:        50 |        150 |   bs4",
+            "import time:       300 |        570 | gradescopeapi.x",
+        ]
+    )
+
+    imports = import_time.parse_importtime(output)
+
+    assert [(record.name, record.depth) for record in imports] == [
+        ("gradescopeapi", 1),
+        ("bs4.element", 2),
+        ("bs4", 1),
+        ("gradescopeapi.x", 0),
+    ]
+    assert imports[-1].cumulative == 570
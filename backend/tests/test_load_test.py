@@ -0,0 +1,26 @@
+import asyncio
+
+from benchmarks import load_test
+from gradescopeapi.api import api
+from gradescopeapi.api.session_store import MemorySessionStore
+from gradescopeapi.classes._helpers._concurrency_helpers import SingleFlight
+
+
+def test_short_load_test_covers_the_mix_without_errors(monkeypatch):
+    monkeypatch.setattr(api, "user_sessions", MemorySessionStore())
+    monkeypatch.setattr(api, "live_connections", {})
+    monkeypatch.setattr(api, "single_flight", SingleFlight())
+    monkeypatch.setattr(api, "gradescope_base_url", api.gradescope_base_url)
+    args = load_test.parse_args(
+        ["--users", "1", "4", "--duration", "1", "--think-time", "0.02"]
+        + ["--students", "10", "--latency", "0"]
+    )
+
+    stages = asyncio.run(load_test.main(args))
+
+    assert [stage["users"] for stage in stages] == [1, 4]
+    last = stages[-1]
+    assert last["error_rate"] == 0
+    assert all(endpoint["requests"] for endpoint in last["endpoints"].values())
+    assert last["p50"] <= last["p95"] <= last["p99"]
+    assert "threads_peak" in last and "loop_lag_p99" in last
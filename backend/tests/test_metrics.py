@@ -0,0 +1,124 @@
+import asyncio
+import threading
+
+import httpx
+
+from gradescopeapi.api import api
+from gradescopeapi.api.metrics import Counter, Histogram, Metrics, MetricsMiddleware
+from gradescopeapi.api.session_store import MemorySessionStore
+from gradescopeapi.classes._helpers._concurrency_helpers import SingleFlight
+
+
+def parse(text: str) -> dict[str, float]:
+    return {
+        line.rpartition(" ")[0]: float(line.rpartition(" ")[2])
+        for line in text.splitlines()
+        if not line.startswith("#")
+    }
+
+
+def test_metrics_endpoint_reports_routes_upstream_and_sessions(
+    monkeypatch, fake_gradescope
+):
+    monkeypatch.setattr(api, "user_sessions", MemorySessionStore())
+    monkeypatch.setattr(api, "live_connections", {})
+    monkeypatch.setattr(api, "single_flight", SingleFlight())
+    monkeypatch.setattr(api, "gradescope_base_url", fake_gradescope.base_url)
+    dataset = fake_gradescope.app.dataset
+    course_id = next(iter(dataset.courses))
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=api.app), base_url="http://test"
+        ) as client:
+            before = parse((await client.get("/api/metrics")).text)
+            response = await client.post(
+                "/api/login",
+                json={"email": dataset.email, "password": dataset.password},
+            )
+            headers = {"session-token": response.json()["session_token"]}
+            for _ in range(2):
+                response = await client.post(
+                    "/api/assignments", params={"course_id": course_id}, headers=headers
+                )
+                assert response.status_code == 200
+            response = await client.get("/api/metrics")
+            await client.post("/api/logout", headers=headers)
+            return before, response
+
+    before, response = asyncio.run(run())
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = parse(response.text)
+
+    def increase(sample):
+        return after[sample] - before.get(sample, 0)
+
+    route = 'route="/api/assignments",method="POST"'
+    assert increase(f'gradescope_api_requests_total{{{route},status="200"}}') == 2
+    assert increase(f"gradescope_api_request_duration_seconds_count{{{route}}}") == 2
+    assert (
+        increase(f'gradescope_api_request_duration_seconds_bucket{{{route},le="+Inf"}}')
+        == 2
+    )
+    upstream = 'endpoint="/courses/{id}",method="GET"'
+    assert (
+        increase(f'gradescope_upstream_requests_total{{{upstream},status="200"}}') == 2
+    )
+    assert (
+        increase(f"gradescope_upstream_request_duration_seconds_count{{{upstream}}}")
+        == 2
+    )
+    assert after["gradescope_api_sessions"] == 1
+    assert after["gradescope_api_live_connections"] == 1
+    assert increase("gradescope_api_live_connection_hits_total") == 2
+    assert after["gradescope_api_threadpool_queue_depth"] == 0
+
+
+def test_unmatched_requests_share_one_route():
+    metrics = Metrics()
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 404, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def run():
+        transport = httpx.ASGITransport(app=MetricsMiddleware(app, metrics))
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            await client.get("/a/1")
+            await client.get("/b/2")
+
+    asyncio.run(run())
+
+    assert (
+        'gradescope_api_requests_total{route="unmatched",method="GET",status="404"} 2'
+        in metrics.collect()
+    )
+
+
+def test_shards_of_every_thread_are_added_up():
+    counter = Counter("requests_total", "Requests.", ("route",))
+    histogram = Histogram("latency_seconds", "Latency.", (), buckets=(0.1, 1))
+
+    def record():
+        for _ in range(1000):
+            counter.inc(("/a",))
+            histogram.observe((), 0.5)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    histogram.observe((), 0.05)
+
+    assert counter.collect()[-1] == 'requests_total{route="/a"} 4000'
+    assert histogram.collect()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 4001',
+        'latency_seconds_bucket{le="+Inf"} 4001',
+        "latency_seconds_sum 2000.05",
+        "latency_seconds_count 4001",
+    ]
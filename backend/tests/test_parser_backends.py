@@ -0,0 +1,157 @@
+import pathlib
+
+import pytest
+
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    SUBMISSION_LINKS_STRAINER,
+    SUBMISSIONS_TABLE_STRAINER,
+    get_assignments_info,
+    get_graders,
+    get_submission_id_for_email,
+    get_submission_ids,
+)
+from gradescopeapi.classes._helpers._course_helpers import (
+    COURSE_MEMBERS_STRAINER,
+    get_all_courses_info,
+    get_course_members,
+)
+from gradescopeapi.classes._helpers._parser_helpers import make_soup
+from gradescopeapi.classes.account import Account
+from gradescopeapi.classes.extensions import _parse_extensions
+
+FIXTURES = pathlib.Path(__file__).parent / "html_fixtures"
+
+# every scraper, applied to the saved page it scrapes
+SCRAPERS = {
+    "courses": ("account.html", get_all_courses_info),
+    "assignments_instructor": ("course_instructor.html", get_assignments_info),
+    "assignments_student": ("course_student.html", get_assignments_info),
+    "members": (
+        "memberships.html",
+        lambda soup: get_course_members(soup, "753413"),
+    ),
+    "submission_ids": ("review_grades.html", get_submission_ids),
+    "submission_id_for_email": (
+        "review_grades.html",
+        lambda soup: get_submission_id_for_email(soup, "grace@example.edu"),
+    ),
+    "graders": ("question_submissions.html", get_graders),
+    "login_token": (
+        "login.html",
+        lambda soup: soup.select_one(
+            'form[action="/login"] input[name="authenticity_token"]'
+        )["value"],
+    ),
+}
+
+# scrapers that only need part of their page, with the strainer for that part
+STRAINERS = {
+    "members": COURSE_MEMBERS_STRAINER,
+    "submission_ids": SUBMISSION_LINKS_STRAINER,
+    "submission_id_for_email": SUBMISSIONS_TABLE_STRAINER,
+}
+
+
+def read_fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture(params=["lxml", "selectolax"])
+def parser_backend(request):
+    pytest.importorskip(request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("scraper", SCRAPERS)
+def test_backend_matches_html_parser(parser_backend, scraper):
+    """Every backend scrapes the same objects as the built-in parser."""
+    fixture, scrape = SCRAPERS[scraper]
+    html = read_fixture(fixture)
+
+    expected = scrape(make_soup(html, "html.parser"))
+    result = scrape(make_soup(html, parser_backend))
+
+    assert expected
+    assert result == expected
+
+
+@pytest.mark.parametrize("backend", ["html.parser", "lxml", "selectolax"])
+@pytest.mark.parametrize("scraper", STRAINERS)
+def test_scoped_parsing_matches_full_page(backend, scraper):
+    """Parsing only the part of the page a scraper declares gives the same results."""
+    if backend != "html.parser":
+        pytest.importorskip(backend)
+    fixture, scrape = SCRAPERS[scraper]
+    html = read_fixture(fixture)
+
+    soup = make_soup(html, backend, parse_only=STRAINERS[scraper])
+
+    assert soup.find("title") is None  # page outside the scraped part is skipped
+    assert scrape(soup) == scrape(make_soup(html, backend))
+
+
+def test_extensions_match_html_parser(parser_backend):
+    html = read_fixture("extensions.html")
+
+    expected = _parse_extensions(html, "html.parser")
+
+    assert len(expected) == 3
+    assert _parse_extensions(html, parser_backend) == expected
+
+
+def test_backend_parses_bytes(parser_backend):
+    """Undecoded response bodies are decoded the same way by every backend."""
+    html = read_fixture("course_instructor.html")
+
+    expected = get_assignments_info(make_soup(html, "html.parser"))
+    result = get_assignments_info(make_soup(html.encode("utf-8"), parser_backend))
+
+    assert result == expected
+    assert result[2].name == "Midterm – café"
+
+
+def test_backend_keeps_attributes_and_text(parser_backend):
+    html = '<p class="a b" data-x="1 &amp; 2"><input disabled>caf&eacute;<!-- c --></p>'
+
+    expected = make_soup(html, "html.parser").p
+    result = make_soup(html, parser_backend).p
+
+    assert result.attrs == expected.attrs
+    assert result.input.attrs == {"disabled": ""}
+    assert result.get_text() == expected.get_text() == "café"
+
+
+def test_selectolax_handles_deep_nesting():
+    pytest.importorskip("selectolax")
+    depth = 5000
+    html = "<div>" * depth + "deep" + "</div>" * depth
+
+    soup = make_soup(html, "selectolax")
+
+    assert soup.get_text() == "deep"
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown parser backend"):
+        make_soup("<p></p>", "html5lib-fast")
+
+
+class FixtureSession:
+    """Serves saved pages by the last segment of the requested path."""
+
+    pages = {"account": "account.html", "memberships": "memberships.html"}
+
+    def get(self, url):
+        page = read_fixture(self.pages[url.rsplit("/", 1)[-1]])
+        return type("Response", (), {"status_code": 200, "text": page})()
+
+
+def test_account_uses_parser_backend(parser_backend):
+    default_account = Account(FixtureSession())
+    account = Account(FixtureSession(), parser_backend=parser_backend)
+
+    assert account.parser_backend == parser_backend
+    assert account.get_courses() == default_account.get_courses()
+    assert account.get_course_users("753413") == default_account.get_course_users(
+        "753413"
+    )
@@ -0,0 +1,115 @@
+import html
+import json
+import pathlib
+
+import bs4
+import pytest
+from bs4 import BeautifulSoup
+
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    get_assignments_info,
+    get_assignments_info_from_page,
+)
+from gradescopeapi.classes._helpers._parser_helpers import get_react_props, make_soup
+from gradescopeapi.classes.extensions import _parse_extensions, _parse_extensions_table
+
+FIXTURES = pathlib.Path(__file__).parent / "html_fixtures"
+
+
+def read_fixture(name: str) -> bytes:
+    return (FIXTURES / name).read_bytes()
+
+
+@pytest.fixture
+def no_parsing(monkeypatch):
+    """Fail the test if the page is parsed into a tree."""
+
+    def parse(*args, **kwargs):
+        raise AssertionError("page was parsed")
+
+    monkeypatch.setattr(bs4, "BeautifulSoup", parse)
+
+
+def test_get_react_props_unescapes_props():
+    props = {"title": 'HW <1> & "2"', "points": 10, "name": "café"}
+    markup = (
+        '<div class="x">'
+        f'<div data-react-props="{html.escape(json.dumps(props))}"'
+        ' data-react-class="Widget"></div>'
+        '<div data-react-class="Other" data-react-props="{}"></div>'
+        "</div>"
+    )
+
+    assert get_react_props(markup, "Widget") == [props]
+    assert get_react_props(markup.encode(), "Widget") == [props]
+    assert get_react_props(markup, "Missing") == []
+
+
+@pytest.mark.parametrize(
+    "markup",
+    [
+        # single quoted props
+        "<div data-react-class=\"Widget\" data-react-props='{}'></div>",
+        # no props
+        '<div data-react-class="Widget"></div>',
+        # props that are not valid JSON
+        '<div data-react-class="Widget" data-react-props="{&quot;a&quot;"></div>',
+    ],
+)
+def test_get_react_props_unexpected_markup(markup):
+    assert get_react_props(markup, "Widget") is None
+
+
+def test_assignments_fast_path_matches_dom(no_parsing):
+    page = read_fixture("course_instructor.html")
+
+    result = get_assignments_info_from_page(page)
+
+    assert len(result) == 3
+    assert result == get_assignments_info(BeautifulSoup(page, "html.parser"))
+
+
+def test_assignments_student_view_falls_back_to_dom():
+    page = read_fixture("course_student.html")
+
+    result = get_assignments_info_from_page(page)
+
+    assert result == get_assignments_info(make_soup(page))
+    assert result[0].assignment_id == "5100001"
+
+
+def test_assignments_unexpected_markup_falls_back_to_dom():
+    # a raw ">" is valid inside an attribute value, but hides the props from the fast path
+    page = read_fixture("course_instructor.html").replace(
+        b'"AssignmentsTable" data-react-props',
+        b'"AssignmentsTable" title="1 > 0" data-react-props',
+    )
+
+    assert get_react_props(page, "AssignmentsTable") is None
+    assert get_assignments_info_from_page(page) == get_assignments_info(make_soup(page))
+
+
+def test_extensions_fast_path_matches_dom(no_parsing):
+    page = read_fixture("extensions.html")
+
+    result = _parse_extensions(page)
+
+    assert list(result) == ["6515875", "6515876", "6515877"]
+    assert result["6515877"].name == 'Grace "Amazing" Hopper'
+
+
+def test_extensions_dom_path_reads_same_props():
+    page = read_fixture("extensions.html")
+
+    assert _parse_extensions_table(page, "html.parser") == get_react_props(
+        page, "EditExtension"
+    )
+
+
+def test_extensions_without_extensions():
+    page = (
+        '<table class="table js-overridesTable"><thead><tr><th>Name</th></tr></thead>'
+        "<tbody></tbody></table>"
+    )
+
+    assert _parse_extensions(page) == {}
@@ -0,0 +1,259 @@
+import asyncio
+import datetime
+import io
+import pathlib
+import threading
+
+import pytest
+
+from gradescopeapi.classes.account import Account
+from gradescopeapi.classes.assignments import update_assignment_date
+from gradescopeapi.classes.extensions import (
+    update_student_extension,
+    update_student_extension_async,
+)
+from gradescopeapi.classes.result_cache import ResultCache, register_result_cache
+from gradescopeapi.classes.upload import upload_assignment, upload_assignment_async
+from tests.conftest import ASSIGNMENT_ID, BASE_URL, COURSE_ID, Response, login
+
+FIXTURES = pathlib.Path(__file__).parent / "html_fixtures"
+
+EDIT_PAGE = b'<form><input name="authenticity_token" value="token"></form>'
+
+
+class CountingSession:
+    """Serves saved pages by path and counts the requests made for each."""
+
+    pages = {
+        "/account": (FIXTURES / "account.html").read_bytes(),
+        f"/courses/{COURSE_ID}": (FIXTURES / "course_instructor.html").read_bytes(),
+        f"/courses/{COURSE_ID}/memberships": (
+            FIXTURES / "memberships.html"
+        ).read_bytes(),
+        f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/edit": EDIT_PAGE,
+    }
+
+    def __init__(self):
+        self.gets = []
+        self.headers = {"X-CSRF-Token": "token"}
+
+    def get(self, url):
+        path = url.removeprefix(BASE_URL)
+        self.gets.append(path)
+        return Response(url, content=self.pages[path])
+
+    def post(self, url, **kwargs):
+        return Response(url)
+
+
+@pytest.fixture
+def session():
+    return CountingSession()
+
+
+@pytest.fixture
+def cache():
+    return ResultCache()
+
+
+def test_results_are_reused_until_they_expire(session, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("time.monotonic", lambda: now)
+    cache = ResultCache(ttl={"get_courses": 10})
+    account = Account(session, BASE_URL, result_cache=cache)
+
+    first = account.get_courses()
+    assert account.get_courses() == first
+    assert session.gets == ["/account"]
+
+    now += 10
+    assert account.get_courses() == first
+    assert session.gets == ["/account", "/account"]
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+def test_results_are_keyed_by_arguments(session, cache):
+    account = Account(session, BASE_URL, result_cache=cache)
+
+    account.get_course_users(COURSE_ID)
+    account.get_course_users(course_id=COURSE_ID)
+    account.get_assignments(COURSE_ID)
+
+    assert session.gets == [
+        f"/courses/{COURSE_ID}/memberships",
+        f"/courses/{COURSE_ID}",
+    ]
+
+
+def test_cached_results_are_not_shared_with_callers(session, cache):
+    account = Account(session, BASE_URL, result_cache=cache)
+
+    members = account.get_course_users(COURSE_ID)
+    members[0].full_name = "changed"
+
+    assert account.get_course_users(COURSE_ID)[0].full_name == "Ada Lovelace"
+
+
+def test_failures_are_raised_and_not_cached(session, cache):
+    account = Account(session, BASE_URL, result_cache=cache)
+    session.get = lambda url: Response(url, status_code=503)
+
+    with pytest.raises(RuntimeError, match="Status code: 503"):
+        account.get_course_users(COURSE_ID)
+    assert len(cache) == 0
+    # a method that found nothing is asked again
+    assert cache.get_or_compute("get_course_users", (COURSE_ID,), lambda: None) is None
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        lambda session: update_assignment_date(
+            session,
+            COURSE_ID,
+            ASSIGNMENT_ID,
+            due_date=datetime.datetime(2030, 1, 1),
+            gradescope_base_url=BASE_URL,
+        ),
+        lambda session: update_student_extension(
+            session,
+            COURSE_ID,
+            ASSIGNMENT_ID,
+            "1",
+            due_date=datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc),
+            gradescope_base_url=BASE_URL,
+        ),
+    ],
+)
+def test_assignment_changes_invalidate_assignments(session, cache, update):
+    account = Account(session, BASE_URL, result_cache=cache)
+    account.get_courses()
+    account.get_assignments(COURSE_ID)
+    account.get_course_users(COURSE_ID)
+
+    update(session)
+    session.gets.clear()
+    account.get_courses()
+    account.get_assignments(COURSE_ID)
+    account.get_course_users(COURSE_ID)
+
+    assert session.gets == [f"/courses/{COURSE_ID}"]
+
+
+def test_uploads_invalidate_the_course(session, cache, tmp_path):
+    submission = tmp_path / "hello.py"
+    submission.write_text("print('hi')")
+    account = Account(session, BASE_URL, result_cache=cache)
+    account.get_courses()
+    account.get_assignments(COURSE_ID)
+    account.get_course_users(COURSE_ID)
+
+    upload_assignment(
+        session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        submission.open("rb"),
+        gradescope_base_url=BASE_URL,
+    )
+    session.gets.clear()
+    account.get_courses()
+    account.get_assignments(COURSE_ID)
+    account.get_course_users(COURSE_ID)
+
+    assert session.gets == [
+        f"/courses/{COURSE_ID}",
+        f"/courses/{COURSE_ID}/memberships",
+    ]
+
+
+def test_results_computed_across_an_invalidation_are_not_kept(session, cache):
+    account = Account(session, BASE_URL, result_cache=cache)
+    computing = threading.Event()
+    invalidated = threading.Event()
+
+    def slow_get(url):
+        response = CountingSession.get(session, url)
+        computing.set()
+        invalidated.wait(timeout=5)
+        return response
+
+    session.get = slow_get
+    reader = threading.Thread(target=account.get_assignments, args=(COURSE_ID,))
+    reader.start()
+    computing.wait(timeout=5)
+    update_assignment_date(
+        session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        due_date=datetime.datetime(2030, 1, 1),
+        gradescope_base_url=BASE_URL,
+    )
+    invalidated.set()
+    reader.join()
+
+    assert len(cache) == 0
+    del session.get
+    session.gets.clear()
+    account.get_assignments(COURSE_ID)
+    account.get_assignments(COURSE_ID)
+    assert session.gets == [f"/courses/{COURSE_ID}"]
+
+
+def test_evicts_least_recently_used(session):
+    cache = ResultCache(max_entries=2)
+    account = Account(session, BASE_URL, result_cache=cache)
+
+    account.get_courses()
+    account.get_assignments(COURSE_ID)
+    account.get_courses()
+    account.get_course_users(COURSE_ID)
+    session.gets.clear()
+    account.get_courses()
+    account.get_assignments(COURSE_ID)
+
+    assert session.gets == [f"/courses/{COURSE_ID}"]
+    assert cache.stats.evictions == 2
+
+
+def test_accounts_without_a_cache_are_unaffected(session):
+    account = Account(session, BASE_URL)
+
+    account.get_courses()
+    account.get_courses()
+
+    assert session.gets == ["/account", "/account"]
+
+
+def test_async_changes_invalidate_the_cache(cache):
+    async def run():
+        async with await login() as connection:
+            register_result_cache(connection.client, cache)
+            cache.get_or_compute(
+                "get_assignments", (COURSE_ID,), list, course_id=COURSE_ID
+            )
+            await update_student_extension_async(
+                connection.client,
+                COURSE_ID,
+                ASSIGNMENT_ID,
+                "1",
+                due_date=datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc),
+                gradescope_base_url=BASE_URL,
+            )
+            assert len(cache) == 0
+
+            cache.get_or_compute(
+                "get_course_users", (COURSE_ID,), list, course_id=COURSE_ID
+            )
+            file = io.BytesIO(b"print('hi')")
+            file.name = "hello.py"
+            await upload_assignment_async(
+                connection.client,
+                COURSE_ID,
+                ASSIGNMENT_ID,
+                file,
+                gradescope_base_url=BASE_URL,
+            )
+            assert len(cache) == 0
+
+    asyncio.run(run())
@@ -0,0 +1,138 @@
+import asyncio
+import base64
+import json
+import zlib
+
+import httpx
+import pytest
+
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.connection import GSConnection
+from tests.conftest import BASE_URL, gradescope_handler, login
+
+
+def logged_in_connection():
+    connection = GSConnection(BASE_URL)
+    connection.session.cookies.set("signed_token", "abc", domain="gradescope.test")
+    connection.session.headers["X-CSRF-Token"] = "csrf-token"
+    connection._logged_in()
+    return connection
+
+
+def test_export_and_import_restore_cookies_and_csrf_token():
+    exported = logged_in_connection().export_session()
+    connection = GSConnection(BASE_URL)
+
+    assert connection.import_session(exported, check=False)
+    assert connection.logged_in
+    assert connection.account is not None
+    assert connection.session.cookies["signed_token"] == "abc"
+    assert connection.session.headers["X-CSRF-Token"] == "csrf-token"
+
+
+def test_encrypted_export_requires_its_key():
+    fernet = pytest.importorskip("cryptography.fernet")
+    key = fernet.Fernet.generate_key()
+    exported = logged_in_connection().export_session(key)
+
+    assert "signed_token" not in exported
+    with pytest.raises(ValueError, match="key is required"):
+        GSConnection(BASE_URL).import_session(exported, check=False)
+    with pytest.raises(ValueError, match="Invalid exported session"):
+        GSConnection(BASE_URL).import_session(
+            exported, fernet.Fernet.generate_key(), check=False
+        )
+    assert GSConnection(BASE_URL).import_session(exported, key, check=False)
+
+
+def test_import_rejects_other_base_urls_and_garbage():
+    exported = logged_in_connection().export_session()
+
+    with pytest.raises(ValueError, match="belongs to"):
+        GSConnection("https://other.test").import_session(exported, check=False)
+    with pytest.raises(ValueError):
+        GSConnection(BASE_URL).import_session("gs1.not-base64!", check=False)
+
+
+def test_export_requires_login():
+    with pytest.raises(RuntimeError):
+        GSConnection(BASE_URL).export_session()
+
+
+def test_async_warm_start_skips_login():
+    requests = []
+
+    def handler(request):
+        requests.append((request.method, request.url.path))
+        return gradescope_handler(request)
+
+    async def run():
+        async with await login() as connection:
+            exported = connection.export_session()
+
+        transport = httpx.MockTransport(handler)
+        async with AsyncGSConnection(BASE_URL, transport=transport) as connection:
+            valid = await connection.import_session(exported)
+            courses = await connection.account.get_courses()
+
+        async with AsyncGSConnection(BASE_URL, transport=transport) as connection:
+            # a session the server no longer accepts
+            expired = await connection.import_session(without_cookies(exported))
+
+        return valid, courses, expired
+
+    valid, courses, expired = asyncio.run(run())
+
+    assert valid
+    assert "753413" in courses["instructor"]
+    assert requests[:2] == [("HEAD", "/account"), ("GET", "/account")]
+    assert not expired
+
+
+def without_cookies(exported):
+    connection = GSConnection(BASE_URL)
+    connection.import_session(exported, check=False)
+    connection.session.cookies.clear()
+    return connection.export_session()
+
+
+def test_import_rejects_states_of_the_wrong_shape():
+    for state in [
+        {"url": BASE_URL},
+        [BASE_URL],
+        {"url": BASE_URL, "csrf": None, "cookies": [["a"]]},
+    ]:
+        data = zlib.compress(json.dumps(state).encode())
+        exported = "gs1." + base64.urlsafe_b64encode(data).decode()
+
+        with pytest.raises(ValueError, match="Invalid exported session"):
+            GSConnection(BASE_URL).import_session(exported, check=False)
+
+
+def test_expired_imports_leave_the_connection_logged_out(fake_gradescope):
+    dataset = fake_gradescope.app.dataset
+    connection = GSConnection(fake_gradescope.base_url)
+    connection.login(dataset.email, dataset.password)
+    exported = connection.export_session()
+    # the session expires on Gradescope
+    fake_gradescope.app._sessions.clear()
+
+    connection = GSConnection(fake_gradescope.base_url)
+    assert not connection.import_session(exported)
+    assert not connection.logged_in
+    assert len(connection.session.cookies) == 0
+    assert "X-CSRF-Token" not in connection.session.headers
+
+    async def run():
+        async with AsyncGSConnection(fake_gradescope.base_url) as connection:
+            imported = await connection.import_session(exported)
+            return (
+                imported,
+                len(connection.client.cookies.jar),
+                dict(connection.client.headers),
+            )
+
+    imported, cookies, headers = asyncio.run(run())
+    assert not imported
+    assert cookies == 0
+    assert "x-csrf-token" not in headers
@@ -0,0 +1,190 @@
+import asyncio
+import functools
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from gradescopeapi.api import api
+from gradescopeapi.api.session_store import (
+    MemorySessionStore,
+    SessionState,
+    SQLiteSessionStore,
+)
+from gradescopeapi.classes import async_connection
+from tests.conftest import BASE_URL, PASSWORD, gradescope_handler, login
+
+EMAIL = "student@example.com"
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Send the requests of connections on the shared pool to the fake Gradescope."""
+    transport = httpx.MockTransport(gradescope_handler)
+    monkeypatch.setattr(async_connection, "get_shared_transport", lambda: transport)
+    monkeypatch.setattr(api, "gradescope_base_url", BASE_URL)
+    return transport
+
+
+@pytest.mark.parametrize(
+    "make_store",
+    [MemorySessionStore, lambda tmp_path: SQLiteSessionStore(str(tmp_path / "s.db"))],
+)
+def test_state_rebuilds_a_logged_in_connection(make_store, tmp_path):
+    store = make_store() if make_store is MemorySessionStore else make_store(tmp_path)
+
+    async def run():
+        async with await login() as connection:
+            store.set("token", SessionState.from_connection(connection, EMAIL))
+
+        state = store.get("token")
+        async with state.to_connection(httpx.MockTransport(gradescope_handler)) as copy:
+            return state, await copy.account.get_courses()
+
+    state, courses = asyncio.run(run())
+
+    assert state.email == EMAIL
+    assert state.gradescope_base_url == BASE_URL
+    assert state.csrf_token == "csrf-token"
+    assert "753413" in courses["instructor"]
+
+
+def test_sqlite_store_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    state = SessionState(EMAIL, BASE_URL, [{"name": "signed_token", "value": "abc"}])
+
+    SQLiteSessionStore(path).set("token", state)
+    other = SQLiteSessionStore(path)
+
+    assert other.get("token") == state
+    assert [token for token, _ in other.items()] == ["token"]
+    other.delete("token")
+    assert SQLiteSessionStore(path).get("token") is None
+
+
+def state(last_active):
+    return SessionState(EMAIL, BASE_URL, last_active=last_active)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionStore
+    return functools.partial(SQLiteSessionStore, str(tmp_path / "sessions.sqlite3"))
+
+
+def test_store_logs_out_least_recently_active_beyond_max_sessions(make_store):
+    store = make_store(max_sessions=2)
+    now = datetime.now()
+
+    assert store.set("a", state(now)) == []
+    store.set("b", state(now + timedelta(seconds=1)))
+    store.set("a", state(now + timedelta(seconds=2)))
+
+    assert store.set("c", state(now + timedelta(seconds=3))) == ["b"]
+    assert store.get("b") is None
+    assert len(store) == 2
+    assert store.stats.evicted == 1
+
+
+def test_store_deletes_inactive_sessions(make_store):
+    store = make_store()
+    now = datetime.now()
+    # inactive for more than a day, which timedelta.seconds alone would miss
+    store.set("old", state(now - timedelta(days=1, seconds=10)))
+    store.set("recent", state(now - timedelta(minutes=5)))
+
+    assert store.delete_inactive(now - timedelta(minutes=30)) == ["old"]
+    assert [token for token, _ in store.items()] == ["recent"]
+    assert store.stats.expired == 1
+
+
+def test_store_deletes_inactive_sessions_in_any_order(make_store):
+    store = make_store()
+    now = datetime.now()
+    store.set("a", state(now - timedelta(hours=1)))
+    store.set("b", state(now))
+    # a request that changed the cookies of "a" writes them back with its last_active
+    store.set("a", state(now - timedelta(hours=1)))
+    store.set("c", state(now - timedelta(hours=2)))
+
+    assert sorted(store.delete_inactive(now - timedelta(minutes=30))) == ["a", "c"]
+    assert [token for token, _ in store.items()] == ["b"]
+
+
+@pytest.fixture
+def workers(monkeypatch, tmp_path, transport):
+    """Switch between two API workers that share a SQLite session store."""
+    path = str(tmp_path / "sessions.sqlite3")
+
+    def switch_worker():
+        monkeypatch.setattr(api, "user_sessions", SQLiteSessionStore(path))
+        monkeypatch.setattr(api, "live_connections", {})
+
+    switch_worker()
+    return switch_worker
+
+
+def test_api_sessions_work_in_any_worker(workers):
+    async def run():
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=api.app), base_url="http://test"
+        )
+        async with client:
+            response = await client.post(
+                "/api/login", json={"email": EMAIL, "password": PASSWORD}
+            )
+            headers = {"session-token": response.json()["session_token"]}
+
+            workers()
+            courses = await client.post("/api/courses", headers=headers)
+
+            workers()
+            await client.post("/api/logout", headers=headers)
+            logged_out = await client.post("/api/courses", headers=headers)
+            return courses, logged_out
+
+    courses, logged_out = asyncio.run(run())
+
+    assert courses.status_code == 200
+    assert "753413" in courses.json()["instructor"]
+    assert logged_out.status_code == 401
+    assert len(api.user_sessions) == 0
+
+
+def test_api_writes_last_active_at_most_once_per_resolution(monkeypatch, transport):
+    store = MemorySessionStore()
+    monkeypatch.setattr(api, "user_sessions", store)
+    monkeypatch.setattr(api, "live_connections", {})
+    writes = []
+    set_session = store.set
+    monkeypatch.setattr(
+        store,
+        "set",
+        lambda token, state: writes.append(token) or set_session(token, state),
+    )
+
+    async def run():
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=api.app), base_url="http://test"
+        )
+        async with client:
+            response = await client.post(
+                "/api/login", json={"email": EMAIL, "password": PASSWORD}
+            )
+            token = response.json()["session_token"]
+            headers = {"session-token": token}
+            for _ in range(3):
+                await client.post("/api/courses", headers=headers)
+            written = len(writes)
+
+            store.get(token).last_active -= api.LAST_ACTIVE_RESOLUTION
+            await client.post("/api/courses", headers=headers)
+            return token, written
+
+    token, written = asyncio.run(run())
+
+    # only the login wrote the session, then the request after the resolution
+    assert written == 1
+    assert writes == [token, token]
+    assert datetime.now() - store.get(token).last_active < api.LAST_ACTIVE_RESOLUTION
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from gradescopeapi.api import api
+from gradescopeapi.api.session_store import MemorySessionStore, SessionState
+from gradescopeapi.classes._helpers._concurrency_helpers import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    single_flight = SingleFlight()
+    started = threading.Barrier(8)
+    calls = []
+
+    def read():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    def request():
+        started.wait()
+        return single_flight.do("key", read)
+
+    threads = [
+        threading.Thread(target=lambda: results.append(request())) for _ in range(8)
+    ]
+    results = []
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert (single_flight.calls, single_flight.shared) == (1, 7)
+
+
+def test_calls_are_not_kept_once_done():
+    single_flight = SingleFlight()
+
+    assert single_flight.do("key", lambda: 1) == 1
+    assert single_flight.do("key", lambda: 2) == 2
+    assert single_flight.do("other", lambda: 3) == 3
+    assert single_flight.calls == 3
+
+
+def test_concurrent_coroutines_share_one_call_and_its_errors():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def read():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream failed")
+
+    async def run():
+        return await asyncio.gather(
+            *(single_flight.do_async("key", read) for _ in range(5)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    single_flight = SingleFlight()
+
+    async def read():
+        await asyncio.sleep(0.05)
+        return "courses"
+
+    async def run():
+        first = asyncio.ensure_future(single_flight.do_async("key", read))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(single_flight.do_async("key", read))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(run()) == ("courses", True)
+
+
+class SlowAccount:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_assignments(self, course_id):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return []
+
+
+class FakeConnection:
+    def __init__(self, account):
+        self.account = account
+        self.client = httpx.AsyncClient()
+        self.gradescope_base_url = "https://gradescope.test"
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    monkeypatch.setattr(api, "user_sessions", MemorySessionStore())
+    monkeypatch.setattr(api, "live_connections", {})
+    monkeypatch.setattr(api, "single_flight", SingleFlight())
+    return api.user_sessions
+
+
+def test_identical_api_reads_are_coalesced(sessions):
+    account = SlowAccount()
+    for token in ["a", "b"]:
+        state = SessionState("ta@example.com", "https://gradescope.test")
+        sessions.set(token, state)
+        api.live_connections[token] = (FakeConnection(account), state)
+
+    async def run():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+
+            def post(token, course_id):
+                return client.post(
+                    "/api/assignments",
+                    params={"course_id": course_id},
+                    headers={"session-token": token},
+                )
+
+            return await asyncio.gather(
+                post("a", "1"), post("b", "1"), post("a", "1"), post("a", "2")
+            )
+
+    responses = asyncio.run(run())
+
+    assert [response.status_code for response in responses] == [200] * 4
+    # the same user asking for course 1 three times, then course 2
+    assert account.calls == 2
@@ -0,0 +1,171 @@
+import asyncio
+import mmap
+import tracemalloc
+
+import httpx
+import pytest
+
+from gradescopeapi.api import api
+from gradescopeapi.api.session_store import MemorySessionStore
+from gradescopeapi.classes import async_connection
+from gradescopeapi.classes.upload import upload_assignment, upload_assignment_async
+from tests.conftest import (
+    ASSIGNMENT_ID,
+    BASE_URL,
+    COURSE_ID,
+    PASSWORD,
+    Response,
+    TokenSession,
+    gradescope_handler,
+    login,
+)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StreamingSession(TokenSession):
+    """Reads the multipart body in chunks the way a socket would, keeping only its tail."""
+
+    def post(self, url, data=None, headers=None, json=None):
+        self.requests.append("POST")
+        self.sent = 0
+        tail = b""
+        while chunk := data.read(CHUNK_SIZE):
+            self.sent += len(chunk)
+            tail = chunk
+        self.bodies.append(tail)
+        return Response(f"{url}/123")
+
+
+def upload(session, *files, **kwargs):
+    return upload_assignment(
+        session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        *files,
+        gradescope_base_url=BASE_URL,
+        **kwargs,
+    )
+
+
+def test_path_binary_text_and_mmap_files_are_sent(tmp_path):
+    paths = []
+    for name in ["a.py", "b.py", "c.py", "d.py"]:
+        paths.append(tmp_path / name)
+        paths[-1].write_bytes(f"# {name}\n".encode())
+    session = TokenSession(cached_token="fresh")
+
+    with (
+        paths[1].open("rb") as binary,
+        paths[2].open() as text,
+        paths[3].open("rb") as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        upload(session, str(paths[0]), binary, text, ("d.py", mapped))
+
+    for name in ["a.py", "b.py", "c.py", "d.py"]:
+        assert f'filename="{name}"'.encode() in session.bodies[0]
+        assert f"# {name}\n".encode() in session.bodies[0]
+
+
+def test_progress_counts_bytes_sent_and_restarts_on_retry(tmp_path):
+    submission = tmp_path / "hello.py"
+    submission.write_bytes(b"x" * 1000)
+    session = TokenSession(cached_token="stale")
+    progress = []
+
+    with submission.open("rb") as file:
+        file.seek(100)
+        upload(session, file, progress=lambda *args: progress.append(args))
+
+    # the file is sent again from where it was after the token is rejected
+    assert session.requests == ["POST", "GET", "POST"]
+    assert progress == [(900, 900), (900, 900)]
+    assert all(b"x" * 900 + b"\r\n" in body for body in session.bodies)
+
+
+def test_large_files_are_streamed_in_constant_memory(tmp_path):
+    submission = tmp_path / "large.bin"
+    size = 32 * 1024 * 1024
+    with submission.open("wb") as file:
+        file.truncate(size)
+    session = StreamingSession(cached_token="fresh")
+    progress = []
+
+    tracemalloc.start()
+    try:
+        upload(session, submission, progress=lambda *args: progress.append(args))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert session.sent > size
+    assert progress[-1] == (size, size)
+    assert peak < size // 8
+
+
+def test_async_upload_reports_progress(tmp_path):
+    submission = tmp_path / "hello.py"
+    submission.write_bytes(b"print('hello')")
+    progress = []
+
+    async def run():
+        async with await login() as connection:
+            return await upload_assignment_async(
+                connection.client,
+                COURSE_ID,
+                ASSIGNMENT_ID,
+                submission,
+                gradescope_base_url=BASE_URL,
+                progress=lambda *args: progress.append(args),
+            )
+
+    assert asyncio.run(run()).endswith("/submissions/123")
+    assert progress[-1] == (14, 14)
+
+
+@pytest.fixture
+def gradescope_uploads(monkeypatch):
+    """Log API users in to the fake Gradescope, keeping the bodies of the uploads it receives."""
+    uploads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/submissions"):
+            uploads.append(request.read())
+        return gradescope_handler(request)
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(async_connection, "get_shared_transport", lambda: transport)
+    monkeypatch.setattr(api, "gradescope_base_url", BASE_URL)
+    monkeypatch.setattr(api, "user_sessions", MemorySessionStore())
+    monkeypatch.setattr(api, "live_connections", {})
+    return uploads
+
+
+def test_api_upload_pipes_multipart_files(gradescope_uploads):
+    async def run():
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=api.app), base_url="http://test"
+        )
+        async with client:
+            response = await client.post(
+                "/api/login",
+                json={"email": "student@example.com", "password": PASSWORD},
+            )
+            return await client.post(
+                "/api/assignments/upload",
+                params={"course_id": COURSE_ID, "assignment_id": ASSIGNMENT_ID},
+                files=[
+                    ("files", ("a.py", b"print('a')")),
+                    ("files", ("b.bin", bytes(range(256)))),
+                ],
+                headers={"session-token": response.json()["session_token"]},
+            )
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 200
+    assert response.json()["submission_link"].endswith("/submissions/123")
+    assert b'filename="a.py"' in gradescope_uploads[0]
+    assert b"print('a')" in gradescope_uploads[0]
+    assert bytes(range(256)) in gradescope_uploads[0]
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from gradescopeapi.classes._helpers._concurrency_helpers import (
+    TokenBucket,
+    run_concurrently,
+)
+from gradescopeapi.classes.account import Account
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from tests.conftest import Response
+
+BASE_URL = "https://gradescope.test"
+COURSE_ID = "753413"
+ASSIGNMENT_ID = "4330410"
+SUBMISSION_IDS = [str(100 + i) for i in range(20)]
+
+
+class FakeSubmissionSession:
+    """Serves a review_grades page and submission json without touching the network."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        if url.endswith("/review_grades"):
+            rows = "".join(
+                f'<tr><td class="table--primaryLink"><a href="/courses/{COURSE_ID}'
+                f'/assignments/{ASSIGNMENT_ID}/submissions/{submission_id}">'
+                f"Student {submission_id}</a></td></tr>"
+                for submission_id in SUBMISSION_IDS
+            )
+            return Response(url, content=f"<table>{rows}</table>".encode())
+
+        submission_id = url.split("/submissions/")[1].split(".json")[0]
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        body = {"text_files": [{"file": {"url": f"https://aws.test/{submission_id}"}}]}
+        return Response(url, content=json.dumps(body).encode())
+
+
+def test_get_assignment_submissions_concurrent():
+    """Submissions are fetched in parallel and returned in page order."""
+    session = FakeSubmissionSession()
+    account = Account(session, BASE_URL)
+
+    submissions = account.get_assignment_submissions(
+        COURSE_ID, ASSIGNMENT_ID, max_workers=5, requests_per_second=None
+    )
+
+    assert list(submissions) == SUBMISSION_IDS
+    assert submissions["100"] == ["https://aws.test/100"]
+    assert 1 < session.max_in_flight <= 5
+
+
+def test_iter_assignment_submissions_streams_all():
+    """Streaming mode yields every submission exactly once."""
+    account = Account(FakeSubmissionSession(delay=0), BASE_URL)
+
+    streamed = dict(
+        account.iter_assignment_submissions(
+            COURSE_ID, ASSIGNMENT_ID, requests_per_second=None
+        )
+    )
+
+    assert sorted(streamed) == sorted(SUBMISSION_IDS)
+
+
+def test_async_submission_files_that_fail_raise(fake_gradescope, monkeypatch):
+    """A submission whose files can't be read raises instead of returning nothing."""
+    dataset = fake_gradescope.app.dataset
+    course = next(iter(dataset.courses.values()))
+    assignment = next(iter(course.assignments.values()))
+    submission_ids = [
+        next(iter(assignment.submissions.values())).submission_id,
+        "404404",
+    ]
+
+    async def run():
+        async with AsyncGSConnection(fake_gradescope.base_url) as connection:
+            await connection.login(dataset.email, dataset.password)
+
+            async def get_submission_ids(course_id, assignment_id):
+                return submission_ids
+
+            monkeypatch.setattr(
+                connection.account, "_get_submission_ids", get_submission_ids
+            )
+            return await connection.account.get_assignment_submissions(
+                course.course_id, assignment.assignment_id
+            )
+
+    with pytest.raises(RuntimeError, match="Status code: 404"):
+        asyncio.run(run())
+
+
+def test_token_bucket_spaces_out_requests():
+    """An empty bucket makes each caller wait one more refill interval."""
+    bucket = TokenBucket(rate=10, burst=2)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_run_concurrently_propagates_errors():
+    """A failing call is re-raised to the consumer."""
+
+    def fail_on_three(item):
+        if item == 3:
+            raise RuntimeError("boom")
+        return item
+
+    with pytest.raises(RuntimeError, match="boom"):
+        list(run_concurrently(fail_on_three, range(10), max_workers=2))
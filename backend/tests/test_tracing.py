@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.extensions import get_extensions
+from gradescopeapi.classes.tracing import (
+    InMemoryTracer,
+    Tracer,
+    span,
+    url_template,
+)
+
+
+def spans_of(tracer: InMemoryTracer, kind: str, name: str | None = None):
+    return [
+        span
+        for span in tracer.spans
+        if span.kind == kind and (name is None or span.name == name)
+    ]
+
+
+def connect(fake_gradescope, tracer: Tracer) -> GSConnection:
+    dataset = fake_gradescope.app.dataset
+    connection = GSConnection(fake_gradescope.base_url, tracer=tracer)
+    connection.login(dataset.email, dataset.password)
+    return connection
+
+
+def test_call_is_split_into_request_parse_and_build_spans(fake_gradescope):
+    tracer = InMemoryTracer()
+    connection = connect(fake_gradescope, tracer)
+    course_id = next(iter(fake_gradescope.app.dataset.courses))
+    tracer.clear()
+
+    assignments = connection.account.get_assignments(course_id)
+
+    (call,) = spans_of(tracer, "call")
+    (request,) = spans_of(tracer, "http")
+    (build,) = spans_of(tracer, "build")
+    assert call.name == "Account.get_assignments"
+    assert request.name == "GET /courses/{id}"
+    assert request.attributes["status"] == 200
+    assert request.attributes["bytes"] > 0
+    assert spans_of(tracer, "parse", "json")[0].attributes["count"] == 1
+    assert (build.name, build.attributes["count"]) == ("Assignment", len(assignments))
+    dates = sum(
+        date is not None
+        for assignment in assignments
+        for date in (
+            assignment.release_date,
+            assignment.due_date,
+            assignment.late_due_date,
+        )
+    )
+    assert len(spans_of(tracer, "parse", "date")) == dates
+    for inner in tracer.spans:
+        if inner is not call:
+            assert call.start <= inner.start
+            assert inner.start + inner.duration <= call.start + call.duration
+
+
+def test_html_pages_are_traced_with_their_parser(fake_gradescope):
+    tracer = InMemoryTracer()
+    connection = connect(fake_gradescope, tracer)
+    course_id = next(iter(fake_gradescope.app.dataset.courses))
+    tracer.clear()
+
+    members = connection.account.get_course_users(course_id)
+
+    (parse,) = spans_of(tracer, "parse", "html")
+    assert parse.attributes["backend"] == "html.parser"
+    assert parse.attributes["strained"]
+    assert spans_of(tracer, "build", "Member")[0].attributes["count"] == len(members)
+    assert tracer.totals()["http", "GET /courses/{id}/memberships"][0] == 1
+
+
+def test_free_functions_are_traced_while_the_tracer_is_active(fake_gradescope):
+    tracer = InMemoryTracer()
+    connection = connect(fake_gradescope, tracer)
+    dataset = fake_gradescope.app.dataset
+    course = next(iter(dataset.courses.values()))
+    assignment_id = next(iter(course.assignments))
+
+    def extensions():
+        return get_extensions(
+            connection.session,
+            course.course_id,
+            assignment_id,
+            gradescope_base_url=fake_gradescope.base_url,
+        )
+
+    tracer.clear()
+    extensions()
+    assert spans_of(tracer, "http")
+    assert not spans_of(tracer, "build")
+
+    with tracer.activate():
+        result = extensions()
+    assert spans_of(tracer, "build", "Extension")[0].attributes["count"] == len(result)
+
+
+def test_async_connection_is_traced(fake_gradescope):
+    tracer = InMemoryTracer()
+    dataset = fake_gradescope.app.dataset
+
+    async def run():
+        async with AsyncGSConnection(
+            fake_gradescope.base_url, tracer=tracer
+        ) as connection:
+            await connection.login(dataset.email, dataset.password)
+            tracer.clear()
+            return await connection.account.get_courses()
+
+    courses = asyncio.run(run())
+
+    assert [span.name for span in spans_of(tracer, "call")] == ["Account.get_courses"]
+    assert [span.name for span in spans_of(tracer, "http")] == ["GET /account"]
+    (build,) = spans_of(tracer, "build", "Course")
+    assert build.attributes["count"] == len(courses["instructor"])
+
+
+def test_hook_receives_failed_spans():
+    received = []
+    tracer = Tracer(on_span=received.append)
+
+    with pytest.raises(ValueError), tracer.activate():
+        with span("parse", "html", size=3):
+            raise ValueError("bad page")
+
+    (failed,) = received
+    assert failed.attributes == {"size": 3, "error": "ValueError"}
+    assert failed.duration >= 0
+
+
+def test_spans_are_not_recorded_without_a_tracer():
+    with span("parse", "html") as inactive:
+        inactive.set(count=1)
+
+    assert span("build", "Member") is span("parse", "date")
+
+
+def test_url_template_replaces_ids():
+    assert (
+        url_template(
+            "https://gs.test/courses/12/assignments/34/submissions/56.json?a=1"
+        )
+        == "/courses/{id}/assignments/{id}/submissions/{id}.json"
+    )
+    assert url_template("https://gs.test") == "/"
@@ -0,0 +1,178 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.transport_policy import (
+    CircuitOpenError,
+    TransportPolicy,
+    bulk_rate_limiter,
+)
+
+BASE_URL = "https://gradescope.test"
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Answers each request with the next status code, the last one repeating.
+
+    A status code of None raises a connection error instead.
+    """
+
+    def __init__(self, *status_codes, headers=None):
+        super().__init__()
+        self.status_codes = list(status_codes)
+        self.headers = headers or {}
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append(request.method)
+        status_code = self.status_codes[min(len(self.sent), len(self.status_codes)) - 1]
+        if status_code is None:
+            raise requests.ConnectionError("connection reset", request=request)
+        response = requests.Response()
+        response.status_code = status_code
+        response.raw = io.BytesIO()
+        response.headers.update(self.headers)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def connect(policy, adapter):
+    connection = GSConnection(BASE_URL, transport_policy=policy)
+    # keep the policy, replace the network under it
+    connection.session.adapters["https://"].adapter = adapter
+    return connection
+
+
+def test_unprocessed_requests_are_retried():
+    policy = TransportPolicy(backoff=0)
+    adapter = ScriptedAdapter(503, 429, 200, headers={"Retry-After": "0"})
+    connection = connect(policy, adapter)
+
+    response = connection.session.post(f"{BASE_URL}/courses", data={"a": "b"})
+
+    assert response.status_code == 200
+    assert adapter.sent == ["POST"] * 3
+    assert (policy.stats.requests, policy.stats.retries) == (3, 2)
+
+
+def test_failed_posts_and_streams_are_not_sent_twice():
+    policy = TransportPolicy(backoff=0)
+    adapter = ScriptedAdapter(502)
+    connection = connect(policy, adapter)
+
+    assert connection.session.post(f"{BASE_URL}/courses").status_code == 502
+    assert connection.session.get(f"{BASE_URL}/courses").status_code == 502
+    assert adapter.sent == ["POST", "GET", "GET", "GET", "GET"]
+
+    adapter.sent.clear()
+    adapter.status_codes = [503]
+    response = connection.session.put(f"{BASE_URL}/courses", data=iter([b"a"]))
+    assert response.status_code == 503
+    assert adapter.sent == ["PUT"]
+
+
+def test_long_retry_after_is_returned():
+    policy = TransportPolicy(backoff=0, max_backoff=1)
+    adapter = ScriptedAdapter(429, headers={"Retry-After": "120"})
+
+    response = connect(policy, adapter).session.get(f"{BASE_URL}/courses")
+
+    assert response.status_code == 429
+    assert adapter.sent == ["GET"]
+
+
+def test_circuit_opens_and_probes():
+    policy = TransportPolicy(retries=0, failure_threshold=2, reset_timeout=60)
+    adapter = ScriptedAdapter(None, 500, 200)
+    connection = connect(policy, adapter)
+
+    with pytest.raises(requests.ConnectionError):
+        connection.session.get(f"{BASE_URL}/courses")
+    connection.session.get(f"{BASE_URL}/courses")
+    with pytest.raises(CircuitOpenError):
+        connection.session.get(f"{BASE_URL}/courses")
+    assert policy.stats.rejected == 1
+    assert len(adapter.sent) == 2
+
+    policy.reset_timeout = 0
+    assert connection.session.get(f"{BASE_URL}/courses").status_code == 200
+    # the probe succeeded and closed the circuit
+    policy.reset_timeout = 60
+    assert connection.session.get(f"{BASE_URL}/courses").status_code == 200
+
+
+def test_requests_are_rate_limited_per_host():
+    policy = TransportPolicy(requests_per_second=50)
+    connection = connect(policy, ScriptedAdapter(200))
+
+    for _ in range(3):
+        connection.session.get(f"{BASE_URL}/courses")
+
+    assert policy.stats.throttled == 2
+
+
+def test_bulk_helpers_are_rate_limited_once():
+    async def clients():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200))
+        async with (
+            AsyncGSConnection(
+                BASE_URL, transport=transport, transport_policy=limited
+            ) as a,
+            AsyncGSConnection(
+                BASE_URL, transport=transport, transport_policy=unlimited
+            ) as b,
+        ):
+            return a.client, b.client
+
+    limited = TransportPolicy(requests_per_second=5)
+    unlimited = TransportPolicy()
+    limited_client, unlimited_client = asyncio.run(clients())
+
+    # the policy of the connection limits the rate, the bulk helper doesn't add a second limit
+    for session in (
+        GSConnection(BASE_URL, transport_policy=limited).session,
+        limited_client,
+    ):
+        assert bulk_rate_limiter(session, BASE_URL) is None
+
+    for session in (
+        requests.Session(),
+        GSConnection(BASE_URL, transport_policy=unlimited).session,
+        unlimited_client,
+    ):
+        assert bulk_rate_limiter(session, BASE_URL).rate == 10
+        assert bulk_rate_limiter(session, BASE_URL, requests_per_second=None) is None
+
+
+def test_async_connection_errors_are_retried():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.method)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200)
+
+    async def run():
+        transport = httpx.MockTransport(handler)
+        async with AsyncGSConnection(
+            BASE_URL, transport=transport, transport_policy=policy
+        ) as connection:
+            return await connection.client.post(f"{BASE_URL}/courses", data={"a": 1})
+
+    policy = TransportPolicy(backoff=0)
+    response = asyncio.run(run())
+
+    assert response.status_code == 200
+    assert attempts == ["POST", "POST"]
+    assert policy.stats.retries == 1